@@ -17,15 +17,35 @@
 #    along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 ##################################################################################################
+import bz2
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import io
+import lzma
+import mmap
 import pkgutil
 import re
+import tarfile
+import threading
+import time
+import zipfile
 
 from abc import ABCMeta, abstractmethod, abstractproperty
-from os.path import basename, dirname, join, abspath, isfile, isdir
-from os import listdir
+from os.path import basename, dirname, join, abspath, isfile, isdir, getsize, normcase
+from os import listdir, scandir, stat, cpu_count, SEEK_END
+from fnmatch import fnmatch
 from collections import deque
 from copy import copy
+from contextlib import contextmanager
+from importlib import metadata
+from types import ModuleType
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
+
+from rdplot.SimulationDataItemStatistics import ParseStatistics, recorded_parse, timed_parse_phase
 
 #
 # Functions
@@ -38,6 +58,197 @@ def is_class(cls):
     return hasattr(cls, '__bases__')
 
 
+def get_compression_suffix(path):
+    """Return the suffix of the compressed file at *path*, eg. '.gz', or an
+    empty string, if the file is not compressed. See
+    :data: `COMPRESSED_FILE_OPENERS`.
+    """
+    for suffix in COMPRESSED_FILE_OPENERS:
+        if path.endswith(suffix):
+            return suffix
+    return ''
+
+
+def strip_compression_suffix(path):
+    """Return *path* without the suffix of a compressed file, eg.
+    '*_enc.log* for '*_enc.log.gz*'. The names of compressed files are
+    matched by the parsers like the names of uncompressed ones.
+    """
+    suffix = get_compression_suffix(path)
+    return path[:-len(suffix)] if suffix else path
+
+
+def open_file(path, mode='rb'):
+    """Open the file at *path*. Compressed files are decompressed on the fly
+    while they are read, thus, they are never unpacked to disk. Files in
+    archives, see :func: `split_archive_path`, are read from the archive.
+
+    :param path: :class: `str` path to file
+    :param mode: :class: `str` mode, either 'rb' or 'rt'
+    """
+    archive_path_and_member = split_archive_path(path)
+    if archive_path_and_member is not None:
+        return _open_contents(path, read_archive_member(*archive_path_and_member), mode)
+
+    suffix = get_compression_suffix(path)
+    if suffix:
+        return COMPRESSED_FILE_OPENERS[suffix](path, mode)
+    return open(path, mode)
+
+
+def walk_files(directory_path, include=None, exclude=None, max_depth=None):
+    """Yield the paths of the files in the directory at *directory_path* and
+    its sub directories. The files of a directory are yielded in the order of
+    their names, before the files of its sub directories. Sub directories,
+    which can not be read, and symbolic links to directories are skipped.
+
+    :param directory_path: :class: `str` path of directory
+    :param include: :class: `list` of glob patterns, eg. ``['*_enc.log']``.
+        Only files with a name matching one of the patterns are yielded.
+        Defaults to all files
+    :param exclude: :class: `list` of glob patterns. Files and directories
+        with a name matching one of the patterns are skipped
+    :param max_depth: :class: `int` depth of the sub directories to walk,
+        eg. 0 only yields the files in *directory_path*. Defaults to all sub
+        directories
+    """
+    directories = deque([(directory_path, 0)])
+    while directories:
+        (current_path, depth) = directories.popleft()
+        try:
+            (file_paths, sub_directory_paths) = _list_directory(current_path, depth, include, exclude, max_depth)
+        except OSError:
+            if current_path == directory_path:
+                raise
+            continue
+
+        yield from file_paths
+        # Walk the sub directories depth first, in the order of their names
+        directories.extendleft(reversed([(path, depth + 1) for path in sub_directory_paths]))
+
+
+def _list_directory(directory_path, depth, include=None, exclude=None, max_depth=None):
+    """Return the paths of the files and of the sub directories in the
+    directory at *directory_path*, at *depth* below the walked directory,
+    sorted by their names. See :func: `walk_files` for the other parameters.
+    """
+    def matches(name, patterns):
+        return any(fnmatch(name, pattern) for pattern in patterns)
+
+    with scandir(directory_path) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+
+    file_paths = []
+    sub_directory_paths = []
+    for entry in entries:
+        if exclude and matches(entry.name, exclude):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            if max_depth is None or depth < max_depth:
+                sub_directory_paths.append(entry.path)
+        elif not include or matches(entry.name, include):
+            file_paths.append(entry.path)
+    return file_paths, sub_directory_paths
+
+
+def is_archive(path):
+    """Check, if the file at *path* is an archive of simulation data, which
+    is parsed by :func: `SimulationDataItemFactory.create_item_list_from_archive`.
+    """
+    return path.endswith(ARCHIVE_SUFFIXES) and isfile(path)
+
+
+def join_archive_path(archive_path, member):
+    """Return the path of the file *member* in the archive at *archive_path*,
+    eg. '*/results.tar!HM-16/a_enc.log*'. The path is used as path of the
+    simulation data items parsed from the file.
+    """
+    return archive_path + ARCHIVE_MEMBER_SEPARATOR + member
+
+
+def split_archive_path(path):
+    """Split the *path* of a file in an archive into the path of the archive
+    and the name of the file in the archive, see :func: `join_archive_path`.
+
+    :rtype: :class: `tuple` of two :class: `str` or ``None``, if *path* does
+        not refer to a file in an archive
+    """
+    position = path.find(ARCHIVE_MEMBER_SEPARATOR)
+    while position >= 0:
+        archive_path = path[:position]
+        if is_archive(archive_path):
+            return archive_path, path[position + 1:]
+        position = path.find(ARCHIVE_MEMBER_SEPARATOR, position + 1)
+    return None
+
+
+def iter_archive_members(archive_path):
+    """Yield the path and the contents of all files in the archive at
+    *archive_path*. Tar archives are read in one sequential pass, without
+    seeking, and without extracting the files to disk. Compressed files in
+    the archive are decompressed.
+
+    :rtype: generator of pairs of :class: `str` path, see
+        :func: `join_archive_path`, and :class: `bytes` contents
+    """
+    if archive_path.endswith('.zip'):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    path = join_archive_path(archive_path, info.filename)
+                    yield path, _decompress_contents(path, archive.read(info))
+        return
+
+    # The stream mode 'r|*' reads the members in the order of the archive,
+    # and detects compressed archives
+    with tarfile.open(archive_path, 'r|*') as archive:
+        for member in archive:
+            if member.isfile():
+                path = join_archive_path(archive_path, member.name)
+                yield path, _decompress_contents(path, archive.extractfile(member).read())
+
+
+def read_archive_member(archive_path, member):
+    """Return the contents of the file *member* in the archive at
+    *archive_path*. Compressed files are decompressed. Note, that compressed
+    tar archives have to be decompressed up to the member.
+
+    :rtype: :class: `bytes`
+    """
+    path = join_archive_path(archive_path, member)
+    if archive_path.endswith('.zip'):
+        with zipfile.ZipFile(archive_path) as archive:
+            return _decompress_contents(path, archive.read(member))
+
+    with tarfile.open(archive_path, 'r|*') as archive:
+        for tar_member in archive:
+            if tar_member.name == member and tar_member.isfile():
+                return _decompress_contents(path, archive.extractfile(tar_member).read())
+    raise FileNotFoundError("No file '{}' in archive '{}'".format(member, archive_path))
+
+
+def _decompress_contents(path, contents):
+    suffix = get_compression_suffix(path)
+    if suffix:
+        return COMPRESSED_CONTENTS_DECOMPRESSORS[suffix](contents)
+    return contents
+
+
+def translate_newlines(text):
+    """Translate the line breaks '\r\n' and '\r' of *text* to '\n', like
+    files opened in text mode with universal newlines do."""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _open_contents(path, contents, mode='rb'):
+    """Open the *contents* of a file, which is already in memory, like
+    :func: `open_file` opens the file."""
+    contents_file = io.BytesIO(contents)
+    if mode == 'rt':
+        return io.TextIOWrapper(contents_file)
+    return contents_file
+
+
 def dict_tree_from_sim_data_items(sim_data_item_collection):
     """Combine the *data* of different sim data items to a tree of
     :class: `dicts`, which is then used to display the data. To understand, why
@@ -52,7 +263,22 @@ def dict_tree_from_sim_data_items(sim_data_item_collection):
 
     dict_tree = {}
 
+    # Classes may join the data of all their items at once, see
+    # :func: `AbstractSimulationDataItem.aggregate_data`. The joined tree is
+    # merged at the position of the first item of the class.
+    sim_data_item_collection = list(sim_data_item_collection)
+    items_by_class = {}
+    for sim_data_item in sim_data_item_collection:
+        items_by_class.setdefault(sim_data_item.__class__, []).append(sim_data_item)
+    aggregated_dict_trees = {cls: cls.aggregate_data(items) for (cls, items) in items_by_class.items()}
+
     for sim_data_item in sim_data_item_collection:
+        aggregated_dict_tree = aggregated_dict_trees[sim_data_item.__class__]
+        if aggregated_dict_tree is not None:
+            if sim_data_item is items_by_class[sim_data_item.__class__][0]:
+                dict_tree = merge_dict_trees(dict_tree, aggregated_dict_tree)
+            continue
+
         for (identifiers, sim_data_item_dict_tree) in sim_data_item.data:
 
             # Process all items of the *encoder_log*'s dictionary tree ie.
@@ -88,6 +314,26 @@ def dict_tree_from_sim_data_items(sim_data_item_collection):
     return dict_tree
 
 
+def merge_dict_trees(dict_tree, other_dict_tree):
+    """Merge the tree of :class: `dict`s with :class: `list`s of
+    :class: `PlotData` objects as leafs *other_dict_tree* into *dict_tree*.
+    Sub trees, which are not part of *dict_tree*, are taken over as a whole.
+    The objects of existing leafs are added one by one, see
+    :func: `append_value_to_dict_tree_at_path`.
+
+    :rtype: Altered tree of nested :class: `dict`s
+    """
+    for (key, other_item) in other_dict_tree.items():
+        if key not in dict_tree:
+            dict_tree[key] = other_item
+        elif isinstance(other_item, dict):
+            merge_dict_trees(dict_tree[key], other_item)
+        else:
+            for plot_data in other_item:
+                append_value_to_dict_tree_at_path(dict_tree, plot_data.path, plot_data)
+    return dict_tree
+
+
 def append_value_to_dict_tree_at_path(dict_tree, path, plot_data):
     """Add a *plot_data* object to a *dict_tree* at a certain *path*.
 
@@ -134,6 +380,162 @@ def append_value_to_dict_tree_at_path(dict_tree, path, plot_data):
     plot_data_list.append(plot_data)
     return dict_tree
 
+
+def get_simulation_data_item_classes():
+    """Return the registered sub classes of
+    :class: `AbstractSimulationDataItem`. The registry is populated once per
+    process, and shared by all factories and threads, see
+    :func: `SimulationDataItemFactory.from_registry`. It contains the classes
+    of the modules of the package :data: `SIMULATION_DATA_ITEM_CLASSES_PACKAGE`,
+    the classes provided by other installed packages by the entry point group
+    :data: `SIMULATION_DATA_ITEM_CLASSES_ENTRY_POINT_GROUP`, and the classes
+    added by :func: `register_simulation_data_item_class`.
+
+    An entry point either refers to a class or to a module, whose sub classes
+    of :class: `AbstractSimulationDataItem` are registered, eg. in setup.py::
+
+        entry_points={
+            'rdplot.simulation_data_item_classes': [
+                'mylogs=mypackage.MyLogs',
+            ],
+        },
+
+    :rtype: :class: `frozenset` of sub classes of
+        :class: `AbstractSimulationDataItem`
+    """
+    global _registered_classes
+    with _registry_lock:
+        if _registered_classes is None:
+            classes = set()
+            package = importlib.import_module(SIMULATION_DATA_ITEM_CLASSES_PACKAGE)
+            for directory_path in package.__path__:
+                classes.update(_get_classes_from_directory(directory_path))
+            classes.update(_get_classes_from_entry_points())
+            _registered_classes = classes
+        return frozenset(_registered_classes)
+
+
+def register_simulation_data_item_class(cls):
+    """Add the sub class *cls* of :class: `AbstractSimulationDataItem` to the
+    registry, see :func: `get_simulation_data_item_classes`. Factories,
+    which are already created, are not changed.
+    """
+    if not (isinstance(cls, type) and issubclass(cls, AbstractSimulationDataItem)):
+        raise IsNotAnAbstractSimulationDataItemSubClassError((
+            "Can not register class '{}', as it is not a sub class of "
+            "AbstractSimulationDataItem"
+        ).format(cls))
+
+    get_simulation_data_item_classes()
+    with _registry_lock:
+        _registered_classes.add(cls)
+
+
+def _get_classes_from_module(module):
+    """Return all sub classes of :class: `AbstractSimulationDataItem` found in
+    *module*, including imported ones.
+    """
+    return {module_item for module_item in module.__dict__.values()
+            if isinstance(module_item, type) and issubclass(module_item, AbstractSimulationDataItem)}
+
+
+def _get_classes_from_directory(directory_path):
+    """Return all sub classes of :class: `AbstractSimulationDataItem` found in
+    the python modules in the directory at *directory_path*. Packages are
+    NOT parsed. The modules are only imported once per process.
+
+    The modules of the package :data: `SIMULATION_DATA_ITEM_CLASSES_PACKAGE`
+    are imported by their name, and thus, are the same modules imported by
+    other code.
+    """
+    with _registry_lock:
+        key = normcase(abspath(directory_path))
+        classes = _directory_classes.get(key)
+        if classes is not None:
+            return classes
+
+        package = importlib.import_module(SIMULATION_DATA_ITEM_CLASSES_PACKAGE)
+        is_package_directory = key in (normcase(abspath(path)) for path in package.__path__)
+
+        classes = set()
+        for module_info in pkgutil.iter_modules([directory_path]):
+            if module_info.ispkg:
+                continue
+            if is_package_directory:
+                module = importlib.import_module(SIMULATION_DATA_ITEM_CLASSES_PACKAGE + '.' + module_info.name)
+            else:
+                spec = module_info.module_finder.find_spec(module_info.name)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            classes.update(_get_classes_from_module(module))
+
+        _directory_classes[key] = classes
+        return classes
+
+
+def _get_classes_from_entry_points():
+    """Return the sub classes of :class: `AbstractSimulationDataItem` provided
+    by the entry points of the group
+    :data: `SIMULATION_DATA_ITEM_CLASSES_ENTRY_POINT_GROUP`. Entry points,
+    which can not be loaded, are skipped.
+    """
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        entry_points = entry_points.select(group=SIMULATION_DATA_ITEM_CLASSES_ENTRY_POINT_GROUP)
+    else:
+        entry_points = entry_points.get(SIMULATION_DATA_ITEM_CLASSES_ENTRY_POINT_GROUP, ())
+
+    classes = set()
+    for entry_point in entry_points:
+        try:
+            entry_point_item = entry_point.load()
+        except Exception as error:
+            print((
+                "Could not load simulation data item classes from entry point "
+                "'{}' due to {}"
+            ).format(entry_point.name, error))
+            continue
+
+        if isinstance(entry_point_item, ModuleType):
+            classes.update(_get_classes_from_module(entry_point_item))
+        elif isinstance(entry_point_item, type) and issubclass(entry_point_item, AbstractSimulationDataItem):
+            classes.add(entry_point_item)
+        else:
+            print((
+                "Entry point '{}' does neither refer to a module nor to a sub "
+                "class of AbstractSimulationDataItem"
+            ).format(entry_point.name))
+    return classes
+
+
+# Factory used by the worker processes of a parallel directory parse. It is
+# created once per worker process by :func: `_init_parser_process`.
+_process_factory = None
+
+
+def _init_parser_process(classes, cache):
+    """Initializer for the worker processes of a parallel parse. Creates a
+    :class: `SimulationDataItemFactory` with the sub classes *classes* and
+    the parse cache *cache*, so that they only have to be transferred once
+    per worker process.
+    """
+    global _process_factory
+    _process_factory = SimulationDataItemFactory(classes, cache)
+
+
+def _create_item_list_in_process(file_path):
+    """Parse the file at *file_path* in a worker process. Files, which can
+    not be parsed, result in an empty list, like in a sequential parse. The
+    :class: `ParseRecord` of the file is returned with the items, to be
+    added to the statistics of the calling process.
+    """
+    _process_factory.statistics.clear()
+    try:
+        items = _process_factory.create_item_from_file(file_path)
+    except SimulationDataItemError:
+        items = []
+    return items, list(_process_factory.statistics.records)
+
 # -------------------------------------------------------------------------------
 
 #
@@ -165,6 +567,119 @@ class PlotData:
         self.path = path
         self.label = label
 
+    def get_sorted_values(self):
+        """Return the x and y values as two sequences of floats, sorted by
+        the x values.
+
+        :rtype: :class: `tuple` of two sequences of floats
+        """
+        if isinstance(self.values, TemporalSeries):
+            return self.values.get_sorted_arrays()
+
+        # Convert list of pairs of strings to two sorted lists of floats
+        values = ((float(x), float(y)) for (x, y) in self.values)
+        sorted_value_pairs = sorted(values, key=lambda pair: pair[0])
+        [xs, ys] = list(zip(*sorted_value_pairs))
+        return xs, ys
+
+
+class TemporalSeries:
+    """Numeric series of the values of one metric over the frames of a
+    simulation. The frame indices and the values are stored as contiguous
+    typed NumPy arrays, which are converted once, when the series is created.
+
+    For compatibility with code, which expects a list of pairs, the series
+    is a sequence of *(frame, value)* tuples.
+
+    :param frames: Iterable of frame indices
+    :param values: Iterable of values, may be strings of numbers
+    """
+
+    FRAME_DTYPE = np.int32
+    VALUE_DTYPE = np.float64
+
+    def __init__(self, frames, values):
+        self.frames = np.asarray(frames, dtype=self.FRAME_DTYPE)
+        self.values = np.asarray(values, dtype=self.VALUE_DTYPE)
+        if self.frames.shape != self.values.shape:
+            raise ValueError("Frames and values of a temporal series differ in length")
+
+        # Whether the frame indices are known to be ascending
+        self._is_sorted = None
+
+    @classmethod
+    def from_values(cls, values):
+        """Create a series of *values*, which belong to the frames 0, 1, ...
+
+        :param values: Iterable of values, may be strings of numbers
+        """
+        values = np.asarray(values, dtype=cls.VALUE_DTYPE)
+        return cls(np.arange(len(values), dtype=cls.FRAME_DTYPE), values)
+
+    def get_sorted_arrays(self):
+        """Return the frame indices and the values as arrays of floats,
+        sorted by the frame indices.
+        """
+        if self._is_sorted is None:
+            self._is_sorted = bool(np.all(self.frames[1:] >= self.frames[:-1]))
+        if self._is_sorted:
+            return self.frames.astype(self.VALUE_DTYPE), self.values
+        order = np.argsort(self.frames, kind='stable')
+        return self.frames[order].astype(self.VALUE_DTYPE), self.values[order]
+
+    def extend(self, pairs):
+        """Append the *(frame, value)* pairs of *pairs*, which is either
+        another series or an iterable of pairs."""
+        if not isinstance(pairs, TemporalSeries):
+            pairs = list(pairs)
+            pairs = TemporalSeries([frame for (frame, _) in pairs], [value for (_, value) in pairs])
+        self.frames = np.concatenate((self.frames, pairs.frames))
+        self.values = np.concatenate((self.values, pairs.values))
+        self._is_sorted = None
+
+    def tolist(self):
+        """Return the series as list of *(frame, value)* tuples."""
+        return list(zip(self.frames.tolist(), self.values.tolist()))
+
+    # Magic Methods
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __iter__(self):
+        return zip(self.frames.tolist(), self.values.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TemporalSeries(self.frames[index], self.values[index])
+        return (self.frames[index].item(), float(self.values[index]))
+
+    def __eq__(self, other):
+        if isinstance(other, TemporalSeries):
+            return (np.array_equal(self.frames, other.frames)
+                    and np.array_equal(self.values, other.values, equal_nan=True))
+        if isinstance(other, (list, tuple)):
+            return self.tolist() == [(self.FRAME_DTYPE(frame).item(), float(value)) for (frame, value) in other]
+        return NotImplemented
+
+    def __copy__(self):
+        # The arrays are never changed in place, thus they can be shared
+        series = TemporalSeries(self.frames, self.values)
+        series._is_sorted = self._is_sorted
+        return series
+
+    # Pickled, and written to .rd files by jsonpickle, as plain lists
+    def __getstate__(self):
+        return {'frames': self.frames.tolist(), 'values': self.values.tolist()}
+
+    def __setstate__(self, state):
+        self.frames = np.asarray(state['frames'], dtype=self.FRAME_DTYPE)
+        self.values = np.asarray(state['values'], dtype=self.VALUE_DTYPE)
+        self._is_sorted = None
+
+    def __repr__(self):
+        return "TemporalSeries({})".format(self.tolist())
+
 
 class SimulationDataItemError(Exception):
     pass
@@ -173,6 +688,628 @@ class IsNotAnAbstractSimulationDataItemSubClassError(SimulationDataItemError):
     pass
 
 
+# Openers of compressed files by the suffix of their names. Compressed files are
+# decompressed transparently by :func: `open_file`.
+COMPRESSED_FILE_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+COMPRESSED_CONTENTS_DECOMPRESSORS = {'.gz': gzip.decompress, '.bz2': bz2.decompress, '.xz': lzma.decompress}
+
+# Archives, see :func: `iter_archive_members`, and the separator of the path of
+# an archive and the name of a file in the archive, see :func: `join_archive_path`
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz', '.zip')
+ARCHIVE_MEMBER_SEPARATOR = '!'
+
+# Package of the simulation data item classes shipped with RDPlot, and the
+# entry point group by which other packages provide classes, see
+# :func: `get_simulation_data_item_classes`
+SIMULATION_DATA_ITEM_CLASSES_PACKAGE = 'rdplot.SimulationDataItemClasses'
+SIMULATION_DATA_ITEM_CLASSES_ENTRY_POINT_GROUP = 'rdplot.simulation_data_item_classes'
+
+# Minimal time in seconds between the lists of items yielded while parsing a
+# directory tree, see :func: `SimulationDataItemFactory.iter_item_lists_from_directory`
+ITEM_LIST_INTERVAL = 0.25
+
+# Time in seconds between two polls of watched directories, see
+# :class: `DirectoryWatcher`. Files, which have changed within
+# *WATCH_HOT_TIME* seconds, are checked by every poll, the others only every
+# *WATCH_FULL_SCAN_INTERVAL* seconds.
+WATCH_INTERVAL = 2.0
+WATCH_HOT_TIME = 300.0
+WATCH_FULL_SCAN_INTERVAL = 60.0
+
+# Registry of the simulation data item classes, and the classes found in
+# directories, which are populated once per process
+_registered_classes = None
+_directory_classes = {}
+_registry_lock = threading.RLock()
+
+# Errors raised by reading corrupted compressed files, besides OSError
+_DECOMPRESSION_ERRORS = (EOFError, lzma.LZMAError)
+
+# The tail of a compressed file can only be reached by decompressing the whole
+# file. Thus, tail windows of compressed files are read with at least this size,
+# so that further windows can be served from them.
+COMPRESSED_TAIL_SIZE = 1024 * 1024
+
+# Size of the blocks, in which streams of compressed files are scanned by
+# :func: `FileContentProvider.scan`. Matches ending in the last
+# *SCAN_OVERLAP_SIZE* bytes of a block are scanned again with the next block,
+# as they might continue there.
+SCAN_BLOCK_SIZE = 4 * 1024 * 1024
+SCAN_OVERLAP_SIZE = 64 * 1024
+
+# Size of the part of a memory mapped file, after which the pages scanned by
+# :func: `FileContentProvider.scan` are released
+SCAN_RELEASE_SIZE = 16 * 1024 * 1024
+_CAN_RELEASE_MAPPED_PAGES = hasattr(mmap.mmap, 'madvise') and hasattr(mmap, 'MADV_DONTNEED')
+
+# Lines of a text including their line breaks, which are '\r\n', '\r' or '\n'
+_LINE_PATTERN = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+
+
+class FileContentProvider:
+    """Provides the contents of files to the parsers. Each file is only read
+    once, and its text is kept for the lifetime of the provider. Thus, the
+    *can_parse_file* probes of all classes and the *_parse_* methods of the
+    chosen class share one read of the file.
+
+    Besides the whole text, bounded windows at the head and the tail of a file
+    can be requested, see :func: `read_head` and :func: `read_tail`. They are
+    used to sniff files, without reading large files completely. Windows
+    delimited by a pattern are read by :func: `read_head_until` and
+    :func: `read_tail_until`. Like the whole text, windows and ranges are
+    returned with the line breaks '\r\n' and '\r' translated to '\n',
+    while their sizes and offsets refer to the bytes of the file. Large parts of files, like the lines of the
+    frames of a log, are scanned with :func: `scan` in the memory mapped file.
+
+    Errors raised while reading a file are cached as well, and raised again
+    on every request of the file.
+
+    The bytes read from files are counted in *bytes_read*. For whole texts,
+    the decoded characters are counted.
+    """
+
+    def __init__(self):
+        self.bytes_read = 0
+        self._texts = {}
+        self._heads = {}
+        self._tails = {}
+        # Sizes of the decompressed contents of compressed files
+        self._sizes = {}
+        # Contents of files in archives, see :func: `add_contents`
+        self._contents = {}
+        # Results of parse functions, see :func: `parse`
+        self._parsed = {}
+
+    def add_contents(self, path, contents):
+        """Provide the *contents* of the file at *path*, which are already in
+        memory, eg. as they have been read from an archive. All requests of
+        the file are served from the contents.
+
+        :param path: :class: `str` path to file
+        :param contents: :class: `bytes` contents of the file
+        """
+        self._contents[abspath(path)] = contents
+
+    def _open(self, path, mode='rb'):
+        path = abspath(path)
+        if path in self._contents:
+            return _open_contents(path, self._contents[path], mode)
+        return open_file(path, mode)
+
+    def read_text(self, path):
+        """Return the text of the file at *path*. The file is only read on
+        the first request.
+
+        :param path: :class: `str` path to file
+
+        :rtype: :class: `str`
+        """
+        path = abspath(path)
+        if path not in self._texts:
+            try:
+                with self._open(path, 'rt') as simulation_data_item_file:
+                    self._texts[path] = simulation_data_item_file.read()
+                self.bytes_read += len(self._texts[path])
+            except (OSError, UnicodeDecodeError) as error:
+                self._texts[path] = error
+            except _DECOMPRESSION_ERRORS as error:
+                self._texts[path] = OSError("Could not decompress '{}': {}".format(path, error))
+
+        return self._get_cached(self._texts, path)
+
+    def read_head(self, path, size):
+        """Return the text of the first *size* bytes of the file at *path*.
+        If the whole text or a larger head of the file has already been read,
+        the window is taken from it.
+
+        :param path: :class: `str` path to file
+        :param size: :class: `int` size of the window in bytes
+
+        :rtype: :class: `str`
+        """
+        return self._read_window(self._heads, path, size, from_tail=False)
+
+    def read_tail(self, path, size):
+        """Return the text of the last *size* bytes of the file at *path*. See
+        :func: `read_head`.
+
+        :param path: :class: `str` path to file
+        :param size: :class: `int` size of the window in bytes
+
+        :rtype: :class: `str`
+        """
+        return self._read_window(self._tails, path, size, from_tail=True)
+
+    def read_head_until(self, path, pattern, block_size=64 * 1024, with_size=False):
+        """Return the head of the file at *path* up to the first line
+        matching the regex *pattern*. The matching line is not part of the
+        head. The file is read in growing blocks, starting with *block_size*
+        bytes, until a line matches. If no line matches, the whole text is
+        returned. Like the windows, the head is returned with translated
+        line breaks.
+
+        :param path: :class: `str` path to file
+        :param pattern: :class: `str` regex pattern, multiline mode is set
+        :param block_size: :class: `int` size of the first block in bytes
+        :param with_size: :class: `bool` whether to return the size of the
+            head in the file, too
+
+        :rtype: :class: `str`, or :class: `tuple` of :class: `str` and the
+            :class: `int` size of the head in bytes, if *with_size* is set
+        """
+        (text, size) = self._read_window_until(self._heads, path, pattern, block_size, from_tail=False)
+        return (text, size) if with_size else text
+
+    def read_tail_until(self, path, pattern, block_size=64 * 1024, with_size=False):
+        """Return the tail of the file at *path* starting with the last line
+        matching the regex *pattern*. The file is read backwards in growing
+        blocks. See :func: `read_head_until`.
+
+        :param path: :class: `str` path to file
+        :param pattern: :class: `str` regex pattern, multiline mode is set
+        :param block_size: :class: `int` size of the first block in bytes
+        :param with_size: :class: `bool` whether to return the size of the
+            tail in the file, too
+
+        :rtype: :class: `str`, or :class: `tuple` of :class: `str` and the
+            :class: `int` size of the tail in bytes, if *with_size* is set
+        """
+        (text, size) = self._read_window_until(self._tails, path, pattern, block_size, from_tail=True)
+        return (text, size) if with_size else text
+
+    def _read_window_until(self, windows, path, pattern, block_size, from_tail):
+        """Return the text of the head or the tail delimited by *pattern*,
+        see :func: `read_head_until`, and its size in bytes. The pattern is
+        matched in the text with translated line breaks, the size is counted
+        in the raw windows of the file.
+        """
+        path = abspath(path)
+        pattern = re.compile(pattern, re.M)
+        size = block_size
+        while True:
+            raw_text = self._read_raw_window(windows, path, size, from_tail)
+            is_whole_text = size >= self.get_size(path)
+
+            raw_lines = _LINE_PATTERN.findall(raw_text)
+            if from_tail and not is_whole_text:
+                # The first line of a window may be cut, thus, it is skipped
+                raw_lines = raw_lines[1:]
+            lines = [translate_newlines(line) for line in raw_lines]
+            text = ''.join(lines)
+
+            if from_tail:
+                match = None
+                for match in pattern.finditer(text):
+                    pass
+            else:
+                match = pattern.search(text)
+            if match is not None:
+                # Index of the line of the match
+                line_index = text.count('\n', 0, match.start())
+                (lines, raw_lines) = ((lines[line_index:], raw_lines[line_index:]) if from_tail
+                                      else (lines[:line_index], raw_lines[:line_index]))
+                return ''.join(lines), len(''.join(raw_lines).encode(errors='surrogateescape'))
+
+            if is_whole_text:
+                return text, len(raw_text.encode(errors='surrogateescape'))
+            size *= 2
+
+    def _read_window(self, windows, path, size, from_tail):
+        path = abspath(path)
+        if path in self._texts:
+            text = self._get_cached(self._texts, path)
+            return text[-size:] if from_tail else text[:size]
+        return translate_newlines(self._read_raw_window(windows, path, size, from_tail))
+
+    def _read_raw_window(self, windows, path, size, from_tail):
+        """Return the text of the window of *size* bytes at the head or the
+        tail of the file at *path*, with the line breaks of the file. Windows
+        are cached in *windows*, larger windows serve smaller ones.
+        """
+        if path in windows:
+            (window_size, text) = self._get_cached(windows, path)
+            if window_size >= size:
+                return text[-size:] if from_tail else text[:size]
+
+        try:
+            if from_tail and get_compression_suffix(path):
+                size = max(size, COMPRESSED_TAIL_SIZE)
+                data = self._read_compressed_tail(path, size)
+            else:
+                with self._open(path) as simulation_data_item_file:
+                    if from_tail:
+                        simulation_data_item_file.seek(0, SEEK_END)
+                        simulation_data_item_file.seek(max(0, simulation_data_item_file.tell() - size))
+                    data = simulation_data_item_file.read(size)
+                self.bytes_read += len(data)
+            # Windows may cut a multi byte character, thus, decoding errors
+            # are escaped. They do not matter for sniffing, and the text
+            # can be encoded to the original bytes again
+            windows[path] = (size, data.decode(errors='surrogateescape'))
+        except OSError as error:
+            windows[path] = error
+        except _DECOMPRESSION_ERRORS as error:
+            windows[path] = OSError("Could not decompress '{}': {}".format(path, error))
+
+        return self._get_cached(windows, path)[1]
+
+    def _read_compressed_tail(self, path, size):
+        """Return the last *size* bytes of the compressed file at *path*. The
+        whole file is decompressed as a stream, keeping only the tail. The
+        size of the decompressed contents is recorded on the way.
+        """
+        tail = b''
+        file_size = 0
+        with self._open(path) as simulation_data_item_file:
+            for block in iter(lambda: simulation_data_item_file.read(SCAN_BLOCK_SIZE), b''):
+                file_size += len(block)
+                tail = (tail + block)[-size:]
+        self._sizes[path] = file_size
+        self.bytes_read += file_size
+        return tail
+
+    def get_size(self, path):
+        """Return the size of the file at *path* in bytes. For compressed
+        files, the size of the decompressed contents is returned, which is
+        determined by decompressing the file, if it is not known yet.
+
+        :param path: :class: `str` path to file
+
+        :rtype: :class: `int`
+        """
+        path = abspath(path)
+        if path in self._contents:
+            return len(self._contents[path])
+        if not get_compression_suffix(path) and split_archive_path(path) is None:
+            return getsize(path)
+
+        if path not in self._sizes:
+            file_size = 0
+            with self._open(path) as simulation_data_item_file:
+                for block in iter(lambda: simulation_data_item_file.read(SCAN_BLOCK_SIZE), b''):
+                    file_size += len(block)
+            self._sizes[path] = file_size
+            self.bytes_read += file_size
+        return self._sizes[path]
+
+    def parse(self, path, parse_file):
+        """Return the result of the function *parse_file* applied to the
+        binary file object of the file at *path*. The result is cached per
+        file and function, thus, the probes of all classes and the
+        constructor of the chosen class share one parse of the file. Errors
+        raised by *parse_file* are cached and raised again, like errors
+        raised while reading files.
+
+        :param path: :class: `str` path to file
+        :param parse_file: function parsing a binary file object
+
+        :rtype: result of *parse_file*
+        """
+        key = (abspath(path), parse_file)
+        if key not in self._parsed:
+            try:
+                with self._open(path) as simulation_data_item_file:
+                    self._parsed[key] = parse_file(simulation_data_item_file)
+                    self.bytes_read += simulation_data_item_file.tell()
+            except _DECOMPRESSION_ERRORS as error:
+                self._parsed[key] = OSError("Could not decompress '{}': {}".format(path, error))
+            except Exception as error:
+                self._parsed[key] = error
+
+        return self._get_cached(self._parsed, key)
+
+    def read_range(self, path, start, end=None):
+        """Return the text of the bytes from *start* to *end* of the file at
+        *path*, with translated line breaks. The range is not cached, it is
+        used to read parts of files, which have been located by previous
+        reads.
+
+        :param path: :class: `str` path to file
+        :param start: :class: `int` offset of the first byte
+        :param end: :class: `int` offset after the last byte, ``None`` reads
+            to the end of the file
+
+        :rtype: :class: `str`
+        """
+        return translate_newlines(self._read_raw_range(path, start, end))
+
+    def read_lines(self, path, start, end=None):
+        """Return the complete lines in the bytes from *start* to *end* of
+        the file at *path*, without their line breaks, and the size of these
+        lines in bytes. An incomplete last line is not returned, thus, the
+        next range of a growing file starts at *start* plus the size. A last
+        line ending in '\r' is incomplete as well, as '\n' may follow.
+
+        :param path: :class: `str` path to file
+        :param start: :class: `int` offset of the first byte
+        :param end: :class: `int` offset after the last byte, ``None`` reads
+            to the end of the file
+
+        :rtype: :class: `tuple` of :class: `list` of :class: `str` and
+            :class: `int`
+        """
+        raw_lines = _LINE_PATTERN.findall(self._read_raw_range(path, start, end))
+        if raw_lines and (raw_lines[-1].endswith('\r') or not raw_lines[-1].endswith(('\r', '\n'))):
+            raw_lines.pop()
+        size = len(''.join(raw_lines).encode(errors='surrogateescape'))
+        return [line.rstrip('\r\n') for line in raw_lines], size
+
+    def _read_raw_range(self, path, start, end):
+        with self._open(path) as simulation_data_item_file:
+            # Compressed files are decompressed up to *start*
+            simulation_data_item_file.seek(start)
+            size = -1 if end is None else end - start
+            data = simulation_data_item_file.read(size)
+        self.bytes_read += len(data)
+        return data.decode(errors='surrogateescape')
+
+    def scan(self, path, pattern, start=0, end=None):
+        """Yield the matches of the compiled :class: `bytes` regex *pattern*
+        in the bytes from *start* to *end* of the file at *path*. The file is
+        memory mapped and scanned in place, thus, it is neither read into
+        memory as a whole nor decoded. Only the matched groups are decoded.
+        Compressed files, which can not be mapped, are decompressed as a
+        stream, and scanned in blocks. Like ranges, the matches are not
+        cached.
+
+        :param path: :class: `str` path to file
+        :param pattern: compiled :class: `bytes` regex pattern
+        :param start: :class: `int` offset of the first byte
+        :param end: :class: `int` offset after the last byte, ``None`` scans
+            to the end of the file
+
+        :rtype: generator of :class: `tuple`s of the groups of the matches as
+            :class: `str`, or of the whole matches, if *pattern* has no groups
+        """
+        contents = self._contents.get(abspath(path))
+        if contents is not None:
+            end = len(contents) if end is None else min(end, len(contents))
+            for match in pattern.finditer(contents, start, end):
+                yield self._decode_match(match)
+            self.bytes_read += max(0, end - start)
+            return
+
+        if get_compression_suffix(path) or split_archive_path(path) is not None:
+            with self._open(path) as simulation_data_item_file:
+                yield from self._scan_stream(simulation_data_item_file, pattern, start, end)
+            return
+
+        with open(path, 'rb') as simulation_data_item_file:
+            try:
+                file_map = mmap.mmap(simulation_data_item_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can not be mapped
+                return
+
+            matches = match = None
+            # Offset up to which the pages of the map have been released
+            released = 0
+            end = len(file_map) if end is None else min(end, len(file_map))
+            try:
+                matches = pattern.finditer(file_map, start, end)
+                for match in matches:
+                    yield self._decode_match(match)
+
+                    # The scanned pages are mapped into the memory of the
+                    # process. Release them, so that the memory does not grow
+                    # with the size of the file.
+                    if _CAN_RELEASE_MAPPED_PAGES and match.start() - released >= SCAN_RELEASE_SIZE:
+                        offset = match.start() - match.start() % mmap.PAGESIZE
+                        file_map.madvise(mmap.MADV_DONTNEED, released, offset - released)
+                        released = offset
+                self.bytes_read += max(0, end - start)
+            finally:
+                # The map can only be closed, if no matches refer to it anymore
+                del matches, match
+                file_map.close()
+
+    def _scan_stream(self, stream, pattern, start, end):
+        """Scan the binary *stream* from *start* to *end* for *pattern*, see
+        :func: `scan`. The stream is read in blocks, and only a block and the
+        end of the previous one are kept in memory.
+        """
+        stream.seek(start)
+        remaining = None if end is None else end - start
+        buffer = b''
+        # Position in the buffer, from which on the buffer has not been scanned
+        position = 0
+        while True:
+            block_size = SCAN_BLOCK_SIZE if remaining is None else min(SCAN_BLOCK_SIZE, remaining)
+            block = stream.read(block_size) if block_size > 0 else b''
+            self.bytes_read += len(block)
+            if remaining is not None:
+                remaining -= len(block)
+            buffer += block
+            is_last_block = not block or remaining == 0
+
+            # Matches ending in the overlap at the end of the buffer are
+            # scanned again with the next block
+            limit = len(buffer) if is_last_block else buffer.rfind(
+                b'\n', 0, max(0, len(buffer) - SCAN_OVERLAP_SIZE)) + 1
+            rescan_position = None
+            for match in pattern.finditer(buffer, position):
+                if match.end() > limit:
+                    rescan_position = match.start()
+                    break
+                yield self._decode_match(match)
+                position = match.end()
+
+            if is_last_block:
+                return
+
+            # Keep the buffer from the start of the line, at which the scan
+            # continues, so that '^' is matched as in the whole file
+            if rescan_position is None:
+                rescan_position = max(position, limit)
+            line_start = buffer.rfind(b'\n', 0, rescan_position) + 1
+            buffer = buffer[line_start:]
+            position = rescan_position - line_start
+
+    @staticmethod
+    def _decode_match(match):
+        if match.re.groups == 0:
+            return match.group().decode(errors='surrogateescape')
+        return tuple(group if group is None else group.decode(errors='surrogateescape')
+                     for group in match.groups())
+
+    @staticmethod
+    def _get_cached(cache, path):
+        value = cache[path]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+# The provider, which is currently active in a thread. Parsers run in worker
+# threads of the GUI, thus, every thread has its own provider.
+_file_content_provider = threading.local()
+
+
+@contextmanager
+def shared_file_contents():
+    """Context manager activating a :class: `FileContentProvider` for the
+    current thread. All reads of the sim data item classes within the context
+    are served by the provider. Nested contexts share the outer provider.
+    """
+    provider = getattr(_file_content_provider, 'provider', None)
+    if provider is not None:
+        yield provider
+        return
+
+    _file_content_provider.provider = FileContentProvider()
+    try:
+        yield _file_content_provider.provider
+    finally:
+        _file_content_provider.provider = None
+
+
+def _get_file_content_provider():
+    """Return the :class: `FileContentProvider` active in the current thread.
+    If no provider is active, a new one is returned, which reads the files
+    without sharing their contents.
+    """
+    provider = getattr(_file_content_provider, 'provider', None)
+    if provider is None:
+        return FileContentProvider()
+    return provider
+
+
+# Size of the blocks at the head and the tail of a file, which are hashed to
+# find candidates for duplicate files, see :class: `DuplicateFileIndex`
+DUPLICATE_BLOCK_SIZE = 64 * 1024
+
+
+class DuplicateFileIndex:
+    """Index of files, which detects duplicates of files added before. Files
+    are duplicates, if they are the same file, ie. symbolic or hard links,
+    which is detected by their device and inode, or if they have the same
+    contents.
+
+    The contents are only compared for files of equal size. Then, a
+    fingerprint of the blocks at the head and the tail of the files is
+    compared first, and the hash of the whole contents only, if the
+    fingerprints are equal.
+
+    :param block_size: :class: `int` size of the blocks of the fingerprint
+    """
+
+    def __init__(self, block_size=None):
+        self._block_size = DUPLICATE_BLOCK_SIZE if block_size is None else block_size
+        self._paths_by_identity = {}
+        self._paths_by_size = {}
+        self._fingerprints = {}
+        self._hashes = {}
+
+    def get_original_path(self, path):
+        """Return the path of the file added before, which is a duplicate of
+        the file at *path*. If there is none, the file at *path* is added,
+        and ``None`` is returned. Files, which can not be read, are never
+        duplicates.
+
+        :param path: :class: `str` path of file
+
+        :rtype: :class: `str` path of the original file or ``None``
+        """
+        try:
+            file_stat = stat(path)
+            # Files without an inode number, eg. on some file systems on
+            # Windows, are only compared by their contents
+            identity = (file_stat.st_dev, file_stat.st_ino) if file_stat.st_ino else None
+            original_path = self._paths_by_identity.get(identity)
+            if original_path is not None:
+                return original_path
+
+            paths = self._paths_by_size.setdefault(file_stat.st_size, [])
+            original_path = next((original_path for original_path in paths
+                                  if self._have_equal_contents(original_path, path)), None)
+        except OSError:
+            return None
+
+        if original_path is None:
+            paths.append(path)
+        if identity is not None:
+            self._paths_by_identity[identity] = original_path or path
+        return original_path
+
+    def _have_equal_contents(self, first_path, second_path):
+        return (self._get_digest(self._fingerprints, first_path, self._read_fingerprint_blocks)
+                == self._get_digest(self._fingerprints, second_path, self._read_fingerprint_blocks)
+                and self._get_digest(self._hashes, first_path, self._read_blocks)
+                == self._get_digest(self._hashes, second_path, self._read_blocks))
+
+    @staticmethod
+    def _get_digest(digests, path, read_blocks):
+        digest = digests.get(path)
+        if digest is None:
+            file_hash = hashlib.blake2b()
+            with open(path, 'rb') as file:
+                for block in read_blocks(file):
+                    file_hash.update(block)
+            digest = digests[path] = file_hash.digest()
+        return digest
+
+    def _read_fingerprint_blocks(self, file):
+        yield file.read(self._block_size)
+        file.seek(max(file.tell(), file.seek(0, SEEK_END) - self._block_size))
+        yield file.read()
+
+    @staticmethod
+    def _read_blocks(file):
+        return iter(lambda: file.read(SCAN_BLOCK_SIZE), b'')
+
+
+class _DuplicatedItems:
+    """The simulation data *items* of an original file, and the positions in
+    the tree of the items of the file and its duplicates, see
+    :func: `SimulationDataItemFactory._copy_items_of_duplicate`.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.positions = {tuple(item.tree_identifier_list) for item in items}
+
+
 class AbstractSimulationDataItem(metaclass=ABCMeta):
     """Abstract base class for simulation data item classes. The abstract
     method :func: `can_parse_file` and the properties *data*, and
@@ -186,6 +1323,42 @@ class AbstractSimulationDataItem(metaclass=ABCMeta):
     # Order value, used to determine order in which parser are tried.
     parse_order = 100 # large default value. it subclass does not lower it, it will be tried last
 
+    # Version of the data parsed by the class. Has to be increased, if the
+    # parser changes the parsed data, to invalidate items cached by older
+    # versions, see :class: `SimulationDataItemCache`.
+    parser_version = 1
+
+    # Sniffing of files, see :func: `_sniff_file`. Sub classes declare the
+    # suffixes of the file names they can parse, which are also used by the
+    # :class: `SimulationDataItemFactory` to dispatch files to the classes. No
+    # suffixes means, that the class may parse any file. A regex pattern identifying
+    # the class in the head of the file, and regex patterns, which all have to
+    # be found in the tail of the file, eg. to check if a simulation has
+    # finished. Only these bounded windows of the file are read.
+    sniff_file_name_suffixes = ()
+    sniff_head_pattern = None
+    sniff_head_size = 16 * 1024
+    sniff_tail_patterns = ()
+    sniff_tail_size = 4 * 1024
+    # Classes of a dispatch group are not probed one by one by the
+    # :class: `SimulationDataItemFactory`. Instead, a key, eg. the codec
+    # written to the file, is sniffed once, see :func: `sniff_dispatch_key`,
+    # and looked up in a table of the factory mapping keys to the first class
+    # of the group accepting them, see :func: `accepts_dispatch_key`.
+    sniff_dispatch_group = None
+
+    # Parse methods, which are timed as phases of the parse of a file, if
+    # they are defined by a sub class, see :func: `timed_parse_phase`
+    timed_parse_methods = ('_parse_path', '_parse_log', '_parse_encoder_config', '_parse_summary_data',
+                           '_parse_temporal_data', '_parse_analyser_data')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls.timed_parse_methods:
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, 'is_timed_parse_phase', False):
+                setattr(cls, name, timed_parse_phase(method))
+
     # Constructor
 
     def __init__(self, path):
@@ -264,6 +1437,101 @@ class AbstractSimulationDataItem(metaclass=ABCMeta):
         pass
 
 
+    def copy_for_path(self, path):
+        """Return a copy of the item for the file at *path*, which is a
+        duplicate of the file of the item, see :class: `DuplicateFileIndex`.
+        The parsed data is shared with the copy. Sub classes have to update
+        the identifiers derived from the path.
+
+        :param path: :class: `str` path of the duplicate file
+
+        :rtype: copy of the item
+        """
+        item = copy(self)
+        item.path = abspath(path)
+        return item
+
+    # Following of Running Simulations
+    # Classes may follow the files of simulations, which are still running,
+    # eg. encoder logs, which are written while encoding. Items of these
+    # files are created by :func: `follow_file`, and are updated with the
+    # data appended to the file by :func: `refresh`, until the simulation
+    # has finished.
+    is_running = False
+
+    @classmethod
+    def aggregate_data(cls, items):
+        """Join the *data* of all *items* of the class at once, eg. by stacking
+        their values to arrays, instead of merging the data of the single
+        items by :func: `dict_tree_from_sim_data_items`. The values of all
+        items with equal identifiers are joined into one :class: `PlotData`
+        object.
+
+        :param items: :class: `list` of items of the class
+
+        :rtype: tree of :class: `dict`s with :class: `list`s of
+            :class: `PlotData` objects as leafs, see
+            :func: `dict_tree_from_sim_data_items`, or ``None``, if the data
+            of the items is merged item by item
+        """
+        return None
+
+    @classmethod
+    def sniff_dispatch_key(cls, path):
+        """Sniff the key of the file at *path*, which identifies the class of
+        the dispatch group parsing the file, see *sniff_dispatch_group*.
+        Classes of a dispatch group have to implement this method and
+        :func: `accepts_dispatch_key`, and the file can be parsed by a class
+        of the group, if and only if the class accepts the key.
+
+        :param path: :class: `str` path to file
+
+        :rtype: hashable key, or ``None``, if no class of the group can parse
+            the file
+        """
+        return None
+
+    @classmethod
+    def accepts_dispatch_key(cls, key):
+        """Check, if the class parses files with the dispatch *key*, see
+        :func: `sniff_dispatch_key`.
+
+        :rtype: :class: `bool`
+        """
+        return False
+
+    @classmethod
+    def can_follow_file(cls, path):
+        """Check, if the file at *path* belongs to a running simulation,
+        which can be followed by the class, see :func: `follow_file`. By
+        default, classes can not follow files.
+
+        :param path: :class: `str` path to file
+
+        :rtype: :class: `bool`
+        """
+        return False
+
+    @classmethod
+    def follow_file(cls, path):
+        """Create an item for the file at *path* of a running simulation.
+        The item is *is_running*, until :func: `refresh` finds the end of
+        the simulation in the file.
+
+        :param path: :class: `str` path to file
+
+        :rtype: object of the class
+        """
+        raise SimulationDataItemError("{} can not follow files".format(cls.__name__))
+
+    def refresh(self):
+        """Update a running item with the data appended to its file since
+        the last refresh. Only the appended data is read.
+
+        :rtype: :class: `bool` if the item has been changed
+        """
+        return False
+
     # Magic Methods
     # TODO remove if usefull 'set' is implemented
     def __hash__(self):
@@ -277,14 +1545,110 @@ class AbstractSimulationDataItem(metaclass=ABCMeta):
 
 
     # Helper Methods
+    @classmethod
+    def _read_file_text(cls, path):
+        """Read the text of the file at *path*. If a
+        :class: `FileContentProvider` is active, see
+        :func: `shared_file_contents`, the file is only read once by the
+        provider, and the cached text is returned.
+        """
+        return _get_file_content_provider().read_text(path)
+
+    @classmethod
+    def _parse_file(cls, path, parse_file):
+        """Return the result of the function *parse_file* applied to the
+        binary file object of the file at *path*. The file is only parsed
+        once by the active provider, see :func: `FileContentProvider.parse`.
+        """
+        return _get_file_content_provider().parse(path, parse_file)
+
+    @classmethod
+    def _read_file_head(cls, path, size):
+        """Read the text of the first *size* bytes of the file at *path*, see
+        :func: `FileContentProvider.read_head`.
+        """
+        return _get_file_content_provider().read_head(path, size)
+
+    @classmethod
+    def _read_file_range(cls, path, start, end=None):
+        """Read the text of the bytes from *start* to *end* of the file at
+        *path*, see :func: `FileContentProvider.read_range`.
+        """
+        return _get_file_content_provider().read_range(path, start, end)
+
+    @classmethod
+    def _read_file_lines(cls, path, start, end=None):
+        """Read the complete lines in the bytes from *start* to *end* of the
+        file at *path*, see :func: `FileContentProvider.read_lines`.
+        """
+        return _get_file_content_provider().read_lines(path, start, end)
+
+    @classmethod
+    def _scan_file(cls, path, pattern, start=0, end=None):
+        """Yield the decoded groups of the matches of the :class: `bytes`
+        regex *pattern* in the bytes from *start* to *end* of the file at
+        *path*, see :func: `FileContentProvider.scan`. Use this instead of
+        reading the text of large files.
+        """
+        return _get_file_content_provider().scan(path, pattern, start, end)
+
+    @classmethod
+    def _get_file_size(cls, path):
+        """Return the size of the file at *path* in bytes, see
+        :func: `FileContentProvider.get_size`.
+        """
+        return _get_file_content_provider().get_size(path)
+
+    @classmethod
+    def _read_file_head_until(cls, path, pattern, with_size=False):
+        """Read the head of the file at *path* up to the first line matching
+        *pattern*, see :func: `FileContentProvider.read_head_until`.
+        """
+        return _get_file_content_provider().read_head_until(path, pattern, with_size=with_size)
+
+    @classmethod
+    def _read_file_tail_until(cls, path, pattern, with_size=False):
+        """Read the tail of the file at *path* starting with the last line
+        matching *pattern*, see :func: `FileContentProvider.read_tail_until`.
+        """
+        return _get_file_content_provider().read_tail_until(path, pattern, with_size=with_size)
+
+    @classmethod
+    def _sniff_file(cls, path):
+        """Sniff the file at *path* using the declared *sniff_* attributes of
+        the class. Only the head and the tail window of the file are read.
+
+        :param path: :class: `str` path to file
+
+        :rtype: :class: `tuple` of two :class: `bool`, the first tells if the
+            head pattern matches, the second if all tail patterns match.
+            Both are ``False``, if the file name does not end with one of
+            the declared suffixes. The suffixes of compressed files are
+            ignored, see :func: `strip_compression_suffix`.
+        """
+        if not strip_compression_suffix(path).endswith(cls.sniff_file_name_suffixes):
+            return False, False
+
+        provider = _get_file_content_provider()
+
+        matches_head = True
+        if cls.sniff_head_pattern is not None:
+            head = provider.read_head(path, cls.sniff_head_size)
+            matches_head = bool(re.search(cls.sniff_head_pattern, head, re.M + re.X))
+
+        matches_tail = True
+        if cls.sniff_tail_patterns:
+            tail = provider.read_tail(path, cls.sniff_tail_size)
+            matches_tail = all(re.search(pattern, tail, re.M + re.X) for pattern in cls.sniff_tail_patterns)
+
+        return matches_head, matches_tail
+
     @classmethod
     def _is_file_text_matching_re_pattern(cls, path, pattern):
         """Check, if the file at *path* matches the given regex *pattern*
         """
-        with open(path, 'r') as simulation_data_item_file:
-            text = simulation_data_item_file.read()
-            return bool( re.search(pattern, text, re.M + re.X) )
-        raise SimulationDataItemError( "Could not open file {}".format(path) )
+        text = cls._read_file_text(path)
+        return bool( re.search(pattern, text, re.M + re.X) )
 
 
 
@@ -293,9 +1657,11 @@ class SimulationDataItemFactory:
     `AbstractSimulationDataItem` class.
 
     Sub classes can be passed, to the constructor or added by the
-    :func: `add_class` method. Additionally, a class method constructor
-    :func: `from_path` creates a factory instance from all sub classes found in
-    all python files in a directory.
+    :func: `add_class` method. Additionally, the class method constructors
+    :func: `from_registry` and :func: `from_path` create a factory instance
+    from all registered sub classes, see
+    :func: `get_simulation_data_item_classes`, or from all sub classes found
+    in all python files in a directory.
 
     Multiple methods are provided to create simulation data items and
     collections of simulation data items from paths using the sub classes known
@@ -304,59 +1670,80 @@ class SimulationDataItemFactory:
     class. Note, that the order of the classes is therefore important, as the
     first matching class will be used to create the item. Thus, more general
     items should be tried at last.
+
+    Only the classes declaring a suffix of the file name, see
+    *sniff_file_name_suffixes*, are tried. The ordered list of these
+    candidate classes is computed once per combination of matching
+    suffixes. Additionally, the factory remembers the class, which created
+    the last item of a directory, and tries it first for the other files of
+    the directory, though not before classes with a higher *parse_order*.
+    The classes of a dispatch group, see *sniff_dispatch_group*, are not
+    probed one by one, instead, the key sniffed from the file is mapped to
+    the class of the group by a lookup table.
+
+    Optionally, a :class: `SimulationDataItemCache` *cache* can be passed.
+    Items are then looked up in the cache, before the file is parsed, and
+    parsed items are stored in the cache. Files, which can not be parsed by
+    any class, are recorded as rejected in the cache, and are skipped by
+    later parses, until they or the classes change.
+
+    The timings of the parse of each file, and the bytes read from it, are
+    recorded in the :class: `ParseStatistics` *statistics* of the factory.
+    Data parsed on demand after the creation of the items, eg. the temporal
+    data of encoder logs, is not part of the records.
     """
 
     # Constructors
-    def __init__(self, classes=None):
+    def __init__(self, classes=None, cache=None):
         self._classes = set()
+        self._cache = cache
+        self.statistics = ParseStatistics()
+
+        # Dispatch index of the candidate classes by the suffixes matching a
+        # file name, see :func: `_get_candidate_classes`
+        self._suffixes = set()
+        self._candidate_classes = {}
+        # Class which created the last item per directory
+        self._directory_classes = {}
+        # Class parsing the files of a dispatch group and key, see
+        # :func: `_get_dispatch_class`
+        self._dispatch_classes = {}
+        # Names and versions of the classes, see :func: `_get_parser_versions`
+        self._parser_versions = None
 
         if classes is not None:
             for cls in classes:
                 self.add_class(cls)
 
     @classmethod
-    def from_path(cls, directory_path):
+    def from_registry(cls, cache=None):
+        """Create a *SimulationDataItemFactory* with all registered sub classes
+        of *AbstractSimulationDataItem*, see
+        :func: `get_simulation_data_item_classes`.
+
+        :param cache: :class: `SimulationDataItemCache` used by the factory
+
+        :rtype: :class: `SimulationDataItemFactory`
+        """
+        return cls(get_simulation_data_item_classes(), cache)
+
+    @classmethod
+    def from_path(cls, directory_path, cache=None):
         """Create a *SimulationDataItemFactory* by parsing a directory at
         *directory_path* for sub classes of *AbstractSimulationDataItem*. All
         python modules in the directory are parsed, and all sub classes are
-        passed to the factory. Packages are NOT parsed.
+        passed to the factory. Packages are NOT parsed. The modules are only
+        imported once per process, thus, further factories for the same
+        directory are created without parsing it again.
 
         :param directory_path String: Path to parse for
             *AbstractSimulationDataItem* sub classes
+        :param cache: :class: `SimulationDataItemCache` used by the factory
 
         :rtype: :class: `SimulationDataItemFactory` with sub classes of
             :class: `AbstractSimulationDataItem` from *directory_path*
         """
-
-        simulationDataItemFactory = cls()
-
-        # Automated loading of modules mechanism adapted
-        # from answer on stackoverflow at http://stackoverflow.com/a/8556471
-        # from user http://stackoverflow.com/users/633403/luca-invernizzi
-
-        # Parse *directory_path* for sub classes of *AbstractSimulationDataItem*
-        classes = []
-        for importer, name, _ in pkgutil.iter_modules([directory_path],'rdplot.SimulationDataItemClasses.'):
-            # Import a module from *directory_path*
-            module = importer.find_module(name).load_module(name)
-
-            # Add all sub classes of AbstractSimulationDataItem from the module
-            # to the factory
-            for _, module_item in module.__dict__.items():
-                if is_class(module_item):
-                    try:
-                        simulationDataItemFactory.add_class(module_item)
-                        # TODO usefull logging
-                        print((
-                            "Added sub class '{}' to simualtion data item "
-                            " factory"
-                        ).format(module_item))
-                    except IsNotAnAbstractSimulationDataItemSubClassError:
-                        pass
-
-        # end snippet
-
-        return simulationDataItemFactory
+        return cls(_get_classes_from_directory(directory_path), cache)
 
     # Interface to Set of Classes
     def add_class(self, cls):
@@ -370,6 +1757,11 @@ class SimulationDataItemFactory:
             ).format(cls))
 
         self._classes.add(cls)
+        self._suffixes.update(cls.sniff_file_name_suffixes)
+        self._candidate_classes.clear()
+        self._directory_classes.clear()
+        self._dispatch_classes.clear()
+        self._parser_versions = None
 
     # Factory Methods
     def create_item_from_file(self, file_path):
@@ -382,14 +1774,81 @@ class SimulationDataItemFactory:
         :rtype: object of sub class of :class: `AbstractSimulationDataItem`
         """
 
+        with recorded_parse(self.statistics, file_path) as record:
+            return self._create_item_from_file(file_path, record)
+
+    def _create_item_from_file(self, file_path, record):
+        """Create the items for the file at *file_path*, see
+        :func: `create_item_from_file`, and fill the :class: `ParseRecord`
+        *record* of the file.
+        """
+        if self._cache is not None:
+            cls_list = self._cache.get(file_path)
+            # Only use cached items of classes known to the factory
+            if cls_list and all(item.__class__ in self._classes for item in cls_list):
+                record.parser = cls_list[0].__class__.__name__
+                record.cached = True
+                return cls_list
+            # Skip files, which have been rejected by the classes before
+            rejection = self._cache.get_rejection(file_path, self._get_parser_versions())
+            if rejection is not None:
+                record.reason = rejection.reason
+                record.cached = True
+                return []
+
+        start_time = time.perf_counter()
         # Create simulatin data item of the first class which says, it can parse
         # the file
         cls_list = []
-        # try parser, in the order given by their parse_order attribute. use the first one that can parse the file
-        for cls in reversed(sorted(self._classes, key=lambda parser_class: parser_class.parse_order)):
-            if cls.can_parse_file(file_path):
-                cls_list.append(cls(file_path))
-                break
+        # The file is read only once, and its content is shared between the
+        # probes of all classes and the parser methods of the chosen class
+        classes = self._get_candidate_classes(file_path)
+        directory_path = dirname(file_path)
+        directory_class = self._directory_classes.get(directory_path)
+        if directory_class in classes:
+            # Try the class of the sibling files first, keeping the order given
+            # by the parse_order attribute
+            classes = sorted(classes, key=lambda cls: (-cls.parse_order, cls is not directory_class))
+        with shared_file_contents() as provider:
+            bytes_read = provider.bytes_read
+            try:
+                self._read_sniff_windows(provider, file_path, classes)
+                record.sniff_duration = time.perf_counter() - start_time
+                # try parser, in the order given by their parse_order attribute. use the first one that can parse the file
+                # The classes of a dispatch group are not probed, but the class of the group is looked up once
+                dispatch_classes = {}
+                for cls in classes:
+                    sniff_start_time = time.perf_counter()
+                    group = cls.sniff_dispatch_group
+                    if group is None:
+                        can_parse_file = cls.can_parse_file(file_path)
+                    else:
+                        if group not in dispatch_classes:
+                            dispatch_classes[group] = self._get_dispatch_class(file_path, cls)
+                        can_parse_file = cls is dispatch_classes[group]
+                    record.sniff_duration += time.perf_counter() - sniff_start_time
+                    if can_parse_file:
+                        try:
+                            cls_list.append(cls(file_path))
+                        except SimulationDataItemError as error:
+                            record.reason = "{} failed: {}".format(
+                                cls.__name__, str(error) or error.__class__.__name__)
+                            self._put_rejection(file_path, record.reason, start_time)
+                            raise
+                        record.parser = cls.__name__
+                        self._directory_classes[directory_path] = cls
+                        break
+            finally:
+                record.bytes_read = provider.bytes_read - bytes_read
+
+        if self._cache is not None and cls_list:
+            self._cache.put(file_path, cls_list)
+        if not cls_list:
+            if classes:
+                record.reason = "Not accepted by {}".format(", ".join(cls.__name__ for cls in classes))
+            else:
+                record.reason = "No parser for the name of the file"
+            self._put_rejection(file_path, record.reason, start_time)
         return cls_list
 
         raise SimulationDataItemError((
@@ -398,46 +1857,332 @@ class SimulationDataItemFactory:
             " SimulationDataItemFactory."
         ).format(file_path))
 
-    def create_item_list_from_directory(self, directory_path):
+    def create_running_item_from_file(self, file_path):
+        """Create an item following the file at *file_path* of a running
+        simulation, using the first class, which can follow the file, see
+        :func: `AbstractSimulationDataItem.follow_file`. Files, which can not
+        be followed (yet), eg. as the simulation has not written its
+        identifiers yet, result in an empty list. Running items are not
+        cached.
+
+        :param file_path: :class: `str` path to file
+
+        :rtype: :class: `list` of the running item
+        """
+        with recorded_parse(self.statistics, file_path) as record, shared_file_contents() as provider:
+            bytes_read = provider.bytes_read
+            try:
+                for cls in self._get_candidate_classes(file_path):
+                    if cls.can_follow_file(file_path):
+                        try:
+                            item = cls.follow_file(file_path)
+                        except SimulationDataItemError as error:
+                            record.reason = "{} failed: {}".format(
+                                cls.__name__, str(error) or error.__class__.__name__)
+                            return []
+                        record.parser = cls.__name__
+                        return [item]
+            finally:
+                record.bytes_read = provider.bytes_read - bytes_read
+            record.reason = "No parser can follow the file"
+            return []
+
+    def _get_parser_versions(self):
+        """Return the names and the versions of the classes of the factory.
+        Files rejected by other classes are tried again, see
+        :func: `SimulationDataItemCache.get_rejection`.
+        """
+        if self._parser_versions is None:
+            self._parser_versions = tuple(sorted(
+                (cls.__module__ + '.' + cls.__qualname__, cls.parser_version) for cls in self._classes
+            ))
+        return self._parser_versions
+
+    def _put_rejection(self, file_path, reason, start_time):
+        """Record the rejection of the file at *file_path* due to *reason* in
+        the cache, see :func: `SimulationDataItemCache.put_rejection`.
+        """
+        if self._cache is not None:
+            self._cache.put_rejection(file_path, self._get_parser_versions(), reason,
+                                      time.perf_counter() - start_time)
+
+    def _get_candidate_classes(self, file_path):
+        """Return the classes, which may parse the file at *file_path*, ordered
+        by their *parse_order*. These are the classes declaring a suffix of
+        the name of the file, and the classes declaring no suffixes. The
+        suffixes of compressed files are ignored, see
+        :func: `strip_compression_suffix`.
+
+        :rtype: :class: `list` of sub classes of
+            :class: `AbstractSimulationDataItem`
+        """
+        file_name = strip_compression_suffix(basename(file_path))
+        suffixes = frozenset(suffix for suffix in self._suffixes if file_name.endswith(suffix))
+        classes = self._candidate_classes.get(suffixes)
+        if classes is None:
+            classes = [cls for cls in self._classes
+                       if not cls.sniff_file_name_suffixes or suffixes.intersection(cls.sniff_file_name_suffixes)]
+            # Sort by name, too, to try classes of equal parse_order in a
+            # stable order
+            classes.sort(key=lambda cls: (-cls.parse_order, cls.__name__))
+            self._candidate_classes[suffixes] = classes
+        return classes
+
+    def _get_dispatch_class(self, file_path, cls):
+        """Return the class of the dispatch group of *cls*, which parses the
+        file at *file_path*, or ``None``. The dispatch key of the file is
+        sniffed once, and the class accepting it is looked up in a table,
+        which is filled on the first file with the key. Like the probes,
+        the classes of the group are tried in the order of their
+        *parse_order*, see :func: `_get_candidate_classes`.
+
+        :rtype: sub class of :class: `AbstractSimulationDataItem`
+        """
+        key = cls.sniff_dispatch_key(file_path)
+        if key is None:
+            return None
+        group = cls.sniff_dispatch_group
+        if (group, key) not in self._dispatch_classes:
+            group_classes = sorted((group_cls for group_cls in self._classes if group_cls.sniff_dispatch_group == group),
+                                   key=lambda group_cls: (-group_cls.parse_order, group_cls.__name__))
+            self._dispatch_classes[(group, key)] = next(
+                (group_cls for group_cls in group_classes if group_cls.accepts_dispatch_key(key)), None)
+        return self._dispatch_classes[(group, key)]
+
+    def _read_sniff_windows(self, provider, file_path, classes):
+        """Read the largest head and tail windows, which are sniffed by the
+        candidate *classes* for the file at *file_path*, at once. The probes
+        of the single classes are then served from these windows.
+        """
+        # Classes declaring no suffixes do not sniff files
+        classes = [cls for cls in classes if cls.sniff_file_name_suffixes]
+        head_sizes = [cls.sniff_head_size for cls in classes if cls.sniff_head_pattern is not None]
+        tail_sizes = [cls.sniff_tail_size for cls in classes if cls.sniff_tail_patterns]
+        try:
+            if head_sizes:
+                provider.read_head(file_path, max(head_sizes))
+            if tail_sizes:
+                provider.read_tail(file_path, max(tail_sizes))
+        except OSError:
+            # Errors are raised again by the probes of the classes
+            pass
+
+    def create_item_list_from_directory(self, directory_path, parallel=False, max_workers=None):
         """Try to create simulation data items for all files in a directory at
         *directory_path*. Ignore if files can not be parsed.
 
+        If *parallel* is set, the files are parsed by a pool of *max_workers*
+        processes. The items are pickled back to the calling process, and
+        returned in the same order as with a sequential parse. Duplicate
+        files are only parsed once, see :func: `_create_items_from_files`.
+
         :param directory_path: :class: `str` of directory path
+        :param parallel: :class: `bool` parse files in worker processes
+        :param max_workers: :class: `int` number of worker processes, defaults
+            to the number of processors of the machine
 
         :rtype: :class: `list` of simulation data items
         """
 
+        paths = [join(directory_path, file_name) for file_name in sorted(listdir(directory_path))]
+
+        if parallel:
+            return self._create_item_list_from_files_in_parallel(paths, max_workers)
+
         item_list = []
-        for file_name in listdir(directory_path):
-            path = join(directory_path, file_name)
-            try:
-                item_list.extend(self.create_item_from_file(path))
+        for path, items in self._create_items_from_files(paths):
+            if items:
                 print(("Parsed '{}' ").format(path))
-            except SimulationDataItemError as error:
-                pass
+            item_list.extend(items)
+
+        return item_list
+
+    def _create_items_from_files(self, paths):
+        """Yield the path and the list of simulation data items created for
+        each file at *paths*. Files, which can not be parsed, result in an
+        empty list.
+
+        Duplicate files, eg. copies of logs in several directories, are only
+        parsed once, see :class: `DuplicateFileIndex`. The items of a
+        duplicate are copies of the items of the original file, see
+        :func: `_copy_items_of_duplicate`.
+        """
+        duplicates = DuplicateFileIndex()
+        items_by_path = {}
+        for path in paths:
+            original_path = duplicates.get_original_path(path)
+            if original_path is not None:
+                yield path, self._copy_items_of_duplicate(items_by_path[original_path], path, original_path)
+                continue
+
+            try:
+                items = self.create_item_from_file(path)
+            except SimulationDataItemError:
                 # We definitely cannot accept thousands of execptions on the command line
-                #print((AbstractEncLog
-                #    "Could not create simulation data item from file '{}'"
-                #    " due to {}"
-                #).format(path, error))
+                items = []
+            items_by_path[path] = _DuplicatedItems(items)
+            yield path, items
+
+    def _copy_items_of_duplicate(self, duplicated_items, path, original_path):
+        """Return copies of the simulation data items of an original file at
+        *original_path* for its duplicate at *path*, sharing the parsed data,
+        see :func: `AbstractSimulationDataItem.copy_for_path`. Copies at the
+        same position in the tree as the original or another copy, eg. of
+        duplicates in the same directory, would be ambiguous, and are
+        skipped.
+
+        :param duplicated_items: :class: `_DuplicatedItems` of the original
+        """
+        copies = []
+        with recorded_parse(self.statistics, path) as record:
+            record.duplicate_of = original_path
+            for item in duplicated_items.items:
+                record.parser = item.__class__.__name__
+                try:
+                    item_copy = item.copy_for_path(path)
+                except SimulationDataItemError:
+                    continue
+                position = tuple(item_copy.tree_identifier_list)
+                if position not in duplicated_items.positions:
+                    duplicated_items.positions.add(position)
+                    copies.append(item_copy)
+        return copies
+
+    def _create_item_list_from_files_in_parallel(self, paths, max_workers=None):
+        """Parse the files at *paths* using a process pool with *max_workers*
+        processes. :func: `Executor.map` keeps the order of *paths*, thus, the
+        result equals the one of a sequential parse.
+        """
+        if max_workers is None:
+            max_workers = cpu_count() or 1
+
+        # Only the original files are sent to the workers, the items of their
+        # duplicates are copied afterwards
+        duplicates = DuplicateFileIndex()
+        original_paths = [duplicates.get_original_path(path) for path in paths]
+        parsed_paths = [path for path, original_path in zip(paths, original_paths) if original_path is None]
+
+        item_list = []
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_parser_process,
+                                 initargs=(self._classes, self._cache)) as executor:
+            # Send files in chunks to the workers, to reduce the overhead of
+            # inter process communication for directories with many small logs
+            chunksize = max(1, len(parsed_paths) // (4 * max_workers))
+            items_by_path = {}
+            for path, (items, records) in zip(parsed_paths, executor.map(_create_item_list_in_process, parsed_paths,
+                                                                         chunksize=chunksize)):
+                items_by_path[path] = _DuplicatedItems(items)
+                for record in records:
+                    self.statistics.add(record)
+
+        for path, original_path in zip(paths, original_paths):
+            if original_path is None:
+                items = items_by_path[path].items
+            else:
+                items = self._copy_items_of_duplicate(items_by_path[original_path], path, original_path)
+            if items:
+                print(("Parsed '{}' ").format(path))
+            item_list.extend(items)
 
         return item_list
 
-    def create_item_list_from_path(self, path):
+    def iter_item_lists_from_directory(self, directory_path, include=None, exclude=None, max_depth=None,
+                                       interval=ITEM_LIST_INTERVAL):
+        """Try to create simulation data items for all files in a directory at
+        *directory_path* and its sub directories, see :func: `walk_files`.
+        Ignore if files can not be parsed. Duplicate files are only parsed
+        once, see :func: `_create_items_from_files`.
+
+        The items are yielded in lists, while the files are parsed. A list is
+        yielded, as soon as *interval* seconds have passed since the last
+        one, thus, the items of large directory trees can be shown before all
+        files are parsed.
+
+        :param directory_path: :class: `str` of directory path
+        :param include: :class: `list` of glob patterns of the names of the
+            files to parse
+        :param exclude: :class: `list` of glob patterns of the names of the
+            files and directories to skip
+        :param max_depth: :class: `int` depth of the sub directories to parse
+        :param interval: :class: `float` minimal time between two lists in
+            seconds
+
+        :rtype: generator of :class: `list` of simulation data items
+        """
+        item_list = []
+        last_time = time.monotonic()
+        paths = walk_files(directory_path, include, exclude, max_depth)
+        for path, items in self._create_items_from_files(paths):
+            if items:
+                print(("Parsed '{}' ").format(path))
+            item_list.extend(items)
+
+            if item_list and time.monotonic() - last_time >= interval:
+                yield item_list
+                item_list = []
+                last_time = time.monotonic()
+
+        if item_list:
+            yield item_list
+
+    def create_item_list_from_archive(self, archive_path):
+        """Try to create simulation data items for all files in the archive at
+        *archive_path*, see :func: `iter_archive_members`. Ignore if files can
+        not be parsed.
+
+        The archive is read in one sequential pass. The contents of each file
+        are kept in memory only while the file is parsed, thus, the data of
+        the items, which is usually parsed on demand, eg. the temporal data
+        of encoder logs, is parsed right away. The path of the items is the
+        path of the file in the archive, see :func: `join_archive_path`.
+
+        :param archive_path: :class: `str` path of a tar or zip archive
+
+        :rtype: :class: `list` of simulation data items
+        """
+        item_list = []
+        try:
+            for (path, contents) in iter_archive_members(archive_path):
+                with shared_file_contents() as provider:
+                    provider.add_contents(path, contents)
+                    try:
+                        items = self.create_item_from_file(path)
+                    except (SimulationDataItemError, OSError):
+                        continue
+                    for item in items:
+                        getattr(item, 'temporal_data', None)
+                if items:
+                    print(("Parsed '{}' ").format(path))
+                item_list.extend(items)
+        except (tarfile.TarError, zipfile.BadZipFile, OSError, EOFError, lzma.LZMAError) as error:
+            raise SimulationDataItemError("Could not read archive '{}': {}".format(archive_path, error))
+
+        return item_list
+
+    def create_item_list_from_path(self, path, parallel=False, max_workers=None):
         """Create a list of simulation data items from a path. The path can
-        either be a file or a directory and is parsed accordingly. The
-        method fails if not at least one simulation data item can be
-        created.
+        either be a file, an archive or a directory and is parsed
+        accordingly. The method fails if not at least one simulation data
+        item can be created.
 
         :param path: :class: `str` path
+        :param parallel: :class: `bool` parse the files of a directory in
+            worker processes, see :func: `create_item_list_from_directory`
+        :param max_workers: :class: `int` number of worker processes
 
         :rtype: :class: `list` of simulation data items
         """
 
+        if is_archive(path):
+            item_list = self.create_item_list_from_archive(path)
+            if len(item_list) == 0:
+                raise SimulationDataItemError()
+            return item_list
         if isfile(path):
             return self.create_item_from_file(path)
         if isdir(path):
-            item_list = self.create_item_list_from_directory(path)
+            item_list = self.create_item_list_from_directory(path, parallel, max_workers)
             if len(item_list) == 0:
                 raise SimulationDataItemError()
             return item_list
@@ -447,6 +2192,32 @@ class SimulationDataItemFactory:
             " '{}'"
         ).format(path))
 
+    def iter_item_lists_from_path(self, path, include=None, exclude=None, max_depth=None,
+                                  interval=ITEM_LIST_INTERVAL):
+        """Create lists of simulation data items from a path. Directories are
+        parsed recursively, and their items are yielded while the files are
+        parsed, see :func: `iter_item_lists_from_directory`. Files and
+        archives are parsed like by :func: `create_item_list_from_path`. The
+        method fails if not at least one simulation data item can be created.
+
+        :param path: :class: `str` path
+
+        :rtype: generator of :class: `list` of simulation data items
+        """
+        if not isdir(path):
+            yield self.create_item_list_from_path(path)
+            return
+
+        is_empty = True
+        for item_list in self.iter_item_lists_from_directory(path, include, exclude, max_depth, interval):
+            is_empty = False
+            yield item_list
+        if is_empty:
+            raise SimulationDataItemError((
+                "Not at least one simulation data item can be created from path"
+                " '{}'"
+            ).format(path))
+
     # Magic Methods
     def __str__(self):
         return str(self._classes)
@@ -456,3 +2227,269 @@ class SimulationDataItemFactory:
             "SimulationDataItemFactory with loaded classes: "
             .format(str(self))
         )
+
+
+class _WatchedDirectory:
+    """Directory watched by a :class: `DirectoryWatcher`, with its
+    modification time, its *depth* below the watched *root* directory, and
+    the paths of its files and sub directories."""
+
+    def __init__(self, modification_time, depth, root, file_paths, sub_directory_paths):
+        self.modification_time = modification_time
+        self.depth = depth
+        self.root = root
+        self.file_paths = file_paths
+        self.sub_directory_paths = sub_directory_paths
+
+
+class DirectoryWatcher:
+    """Watches directories for new, changed and removed files, and keeps the
+    simulation data items of their files up to date, eg. while the
+    simulations of a batch job finish.
+
+    The directories are polled by :func: `poll`, which compares the
+    modification times and the sizes of the files with the ones seen by the
+    previous poll. Only new and changed files are parsed by the *factory*.
+    Items of running simulations, see
+    :func: `AbstractSimulationDataItem.follow_file`, are refreshed instead of
+    parsed again, and files, which can not be parsed, are followed, if they
+    belong to a running simulation.
+
+    Polls are cheap, even for large directory trees: new and removed files
+    are detected by the modification times of the directories, thus, only
+    directories, which have changed, are listed. Of the files, only the ones,
+    which have changed recently, are checked by every poll, eg. the logs of
+    running simulations. All files are checked every
+    *WATCH_FULL_SCAN_INTERVAL* seconds.
+
+    :param factory: :class: `SimulationDataItemFactory` parsing the files
+    :param include: :class: `list` of glob patterns of the names of the
+        files to watch, see :func: `walk_files`
+    :param exclude: :class: `list` of glob patterns of the names of the
+        files and directories to skip
+    :param max_depth: :class: `int` depth of the sub directories to watch
+    """
+
+    def __init__(self, factory, include=None, exclude=None, max_depth=None):
+        self._factory = factory
+        self._include = include
+        self._exclude = exclude
+        self._max_depth = max_depth
+
+        self._roots = []
+        # Watched directories by their paths, see :class: `_WatchedDirectory`
+        self._directories = {}
+        # Modification times and sizes of the watched files
+        self._files = {}
+        # Watched files, which have changed recently, with the time of their
+        # last change
+        self._hot_files = {}
+        self._last_full_scan_time = time.monotonic()
+        # Items of the watched files
+        self._items = {}
+
+    @property
+    def directories(self):
+        """:class: `list` of the paths of the watched directories"""
+        return list(self._roots)
+
+    def add_directory(self, directory_path):
+        """Watch the directory at *directory_path* and its sub directories.
+        The files present now are not reported by :func: `poll`, unless they
+        change. Their items, eg. the ones of an initial parse of the
+        directory, are passed by :func: `add_items`.
+        """
+        directory_path = abspath(directory_path)
+        if directory_path in self._roots:
+            return
+        # Raise an error, if the directory can not be read
+        listdir(directory_path)
+        self._roots.append(directory_path)
+        self._add_tree(directory_path, 0, directory_path, None)
+
+    def remove_directory(self, directory_path):
+        """Stop watching the directory at *directory_path*."""
+        directory_path = abspath(directory_path)
+        if directory_path not in self._roots:
+            return
+        self._roots.remove(directory_path)
+        removed_paths = []
+        for (path, directory) in list(self._directories.items()):
+            if directory.root == directory_path:
+                self._remove_tree(path, removed_paths)
+        for path in removed_paths:
+            self._items.pop(path, None)
+
+    def add_items(self, items):
+        """Add the simulation data *items* of files in the watched
+        directories, so that they are replaced, if their files change."""
+        for item in items:
+            if item.path in self._files:
+                self._items.setdefault(item.path, []).append(item)
+
+    def poll(self):
+        """Poll the watched directories for new, changed and removed files.
+        New and changed files are parsed, and the items of removed files are
+        dropped.
+
+        :rtype: :class: `tuple` of the :class: `list` of the items, which
+            have been removed or replaced, and the :class: `list` of the new
+            items. Refreshed items of running simulations are new items.
+        """
+        changed_paths = []
+        removed_paths = []
+        for root in self._roots:
+            if root not in self._directories and isdir(root):
+                # The directory has been created again
+                self._add_tree(root, 0, root, changed_paths)
+
+        # Files are added to and removed from directories, which have changed
+        for (path, directory) in list(self._directories.items()):
+            if path not in self._directories:
+                # Removed with its parent directory
+                continue
+            try:
+                modification_time = stat(path).st_mtime_ns
+            except OSError:
+                self._remove_tree(path, removed_paths)
+                continue
+            if modification_time != directory.modification_time:
+                directory.modification_time = modification_time
+                self._update_directory(path, changed_paths, removed_paths)
+
+        # Changes of the contents of files are only checked for the hot files,
+        # and for all files by a full scan
+        current_time = time.monotonic()
+        if current_time - self._last_full_scan_time >= WATCH_FULL_SCAN_INTERVAL:
+            self._last_full_scan_time = current_time
+            paths = list(self._files)
+        else:
+            paths = list(self._hot_files)
+        for path in paths:
+            signature = self._get_signature(path)
+            if signature is not None and signature != self._files.get(path, signature):
+                self._files[path] = signature
+                self._hot_files[path] = current_time
+                changed_paths.append(path)
+        for (path, change_time) in list(self._hot_files.items()):
+            if current_time - change_time > WATCH_HOT_TIME:
+                del self._hot_files[path]
+
+        removed_items = []
+        new_items = []
+        for path in removed_paths:
+            removed_items.extend(self._items.pop(path, []))
+        for path in dict.fromkeys(changed_paths):
+            if path not in self._files:
+                continue
+            items = self._items.get(path, [])
+            if items and all(item.is_running for item in items):
+                # Running items are updated in place
+                if any([item.refresh() for item in items]):
+                    new_items.extend(items)
+                continue
+
+            removed_items.extend(items)
+            items = self._create_items(path)
+            if items:
+                self._items[path] = items
+            else:
+                self._items.pop(path, None)
+            new_items.extend(items)
+
+        return removed_items, new_items
+
+    def _create_items(self, path):
+        try:
+            items = self._factory.create_item_from_file(path)
+        except SimulationDataItemError:
+            items = []
+        if not items:
+            items = self._factory.create_running_item_from_file(path)
+        return items
+
+    def _add_tree(self, directory_path, depth, root, new_paths):
+        """Watch the directory at *directory_path* and its sub directories.
+        The paths of their files are appended to *new_paths*, if it is not
+        ``None``."""
+        directories = deque([(directory_path, depth)])
+        while directories:
+            (path, depth) = directories.popleft()
+            if path in self._directories:
+                continue
+            try:
+                modification_time = stat(path).st_mtime_ns
+                (file_paths, sub_directory_paths) = _list_directory(path, depth, self._include, self._exclude,
+                                                                    self._max_depth)
+            except OSError:
+                continue
+            self._directories[path] = _WatchedDirectory(modification_time, depth, root, file_paths,
+                                                        sub_directory_paths)
+            for file_path in file_paths:
+                self._add_file(file_path, new_paths)
+            directories.extend((sub_directory_path, depth + 1) for sub_directory_path in sub_directory_paths)
+
+    def _update_directory(self, directory_path, changed_paths, removed_paths):
+        """List the changed directory at *directory_path* again, and add or
+        remove its files and sub directories."""
+        directory = self._directories[directory_path]
+        try:
+            (file_paths, sub_directory_paths) = _list_directory(directory_path, directory.depth, self._include,
+                                                                self._exclude, self._max_depth)
+        except OSError:
+            self._remove_tree(directory_path, removed_paths)
+            return
+
+        for path in set(directory.file_paths).difference(file_paths):
+            self._remove_file(path, removed_paths)
+        for path in set(file_paths).difference(directory.file_paths):
+            self._add_file(path, changed_paths)
+        # Files may have been replaced, eg. by moving other files in place
+        for path in set(file_paths).intersection(directory.file_paths):
+            signature = self._get_signature(path)
+            if signature is not None and signature != self._files.get(path):
+                self._files[path] = signature
+                self._hot_files[path] = time.monotonic()
+                changed_paths.append(path)
+        for path in set(directory.sub_directory_paths).difference(sub_directory_paths):
+            self._remove_tree(path, removed_paths)
+        for path in set(sub_directory_paths).difference(directory.sub_directory_paths):
+            self._add_tree(path, directory.depth + 1, directory.root, changed_paths)
+        directory.file_paths = file_paths
+        directory.sub_directory_paths = sub_directory_paths
+
+    def _remove_tree(self, directory_path, removed_paths):
+        directory = self._directories.pop(directory_path, None)
+        if directory is None:
+            return
+        for path in directory.file_paths:
+            self._remove_file(path, removed_paths)
+        for path in directory.sub_directory_paths:
+            self._remove_tree(path, removed_paths)
+
+    def _add_file(self, path, new_paths):
+        signature = self._get_signature(path)
+        if signature is None:
+            return
+        self._files[path] = signature
+        if new_paths is not None:
+            new_paths.append(path)
+            self._hot_files[path] = time.monotonic()
+        elif time.time() - signature[0] / 1e9 < WATCH_HOT_TIME:
+            self._hot_files[path] = time.monotonic()
+
+    def _remove_file(self, path, removed_paths):
+        if self._files.pop(path, None) is not None:
+            removed_paths.append(path)
+        self._hot_files.pop(path, None)
+
+    @staticmethod
+    def _get_signature(path):
+        try:
+            file_stat = stat(path)
+        except OSError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    def __repr__(self):
+        return "DirectoryWatcher of {}".format(self.directories)
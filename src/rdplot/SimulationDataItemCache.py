@@ -0,0 +1,300 @@
+##################################################################################################
+#    This file is part of RDPlot - A gui for creating rd plots based on pyqt and matplotlib
+#    <https://git.rwth-aachen.de/IENT-Software/rd-plot-gui>
+#    Copyright (C) 2017  Institut fuer Nachrichtentechnik, RWTH Aachen University, GERMANY
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+##################################################################################################
+import hashlib
+import os
+import pickle
+import time
+
+from collections import namedtuple
+from os.path import abspath, expanduser, join
+from tempfile import NamedTemporaryFile
+
+
+#
+# Functions
+#
+
+def get_default_cache_directory():
+    """Return the directory, in which rdplot caches data of the user. Follows
+    the XDG base directory specification, ie. defaults to *~/.cache/rdplot*.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or join(expanduser('~'), '.cache')
+    return join(cache_home, 'rdplot')
+
+
+# -------------------------------------------------------------------------------
+
+#
+# Classes
+#
+
+# File, which has been rejected by all parsers, see
+# :func: `SimulationDataItemCache.put_rejection`. The *reason* describes why
+# the file has been rejected, *duration* is the time spent on the file in
+# seconds, and *time* the time of the rejection in seconds since the epoch.
+FileRejection = namedtuple('FileRejection', ['path', 'reason', 'duration', 'time'])
+
+
+class SimulationDataItemCache:
+    """Persistent cache of parsed simulation data items. The items parsed from
+    a file are pickled to an entry in *directory*. The entry is keyed by the
+    absolute path, the size and the modification time of the file. Thus, an
+    entry is invalidated by any change of the file. Additionally, the
+    *parser_version* of the class of the items is stored. If a parser changes
+    the structure of its data, it increases its version, and all entries
+    created by older versions are ignored.
+
+    Files, which can not be parsed at all, are recorded as rejected, see
+    :func: `put_rejection`, so that they can be skipped by later parses. A
+    rejection is keyed like the items, and additionally by the classes and
+    the versions of the parsers, which rejected the file. Thus, a file is
+    tried again, if it changes, or if a parser is added or changed.
+
+    The size of all entries is capped to *max_size* bytes. If the cap is
+    exceeded, the least recently used entries are evicted. The last use of an
+    entry is recorded as modification time of its file.
+
+    :param directory: :class: `str` directory of the cache entries, defaults
+        to :func: `get_default_cache_directory`
+    :param max_size: :class: `int` maximum size of all entries in bytes
+    """
+
+    ENTRY_SUFFIX = '.items'
+    REJECTION_SUFFIX = '.rejected'
+
+    def __init__(self, directory=None, max_size=512 * 1024 * 1024):
+        if directory is None:
+            directory = get_default_cache_directory()
+        self.directory = join(directory, 'items')
+        self.max_size = max_size
+
+        # Sum of the sizes of all entries, determined on first write
+        self._size = None
+
+    # Interface
+
+    def get(self, path):
+        """Return the cached simulation data items of the file at *path*, or
+        ``None`` if there is no valid entry for the file.
+
+        :param path: :class: `str` path to file
+
+        :rtype: :class: `list` of simulation data items or ``None``
+        """
+        key = self._get_key(path)
+        if key is None:
+            return None
+
+        entry_path = self._get_entry_path(key, self.ENTRY_SUFFIX)
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                (entry_key, versions, items) = pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # The entry is corrupted, or refers to classes, which do not
+            # exist anymore
+            self._remove_entry(entry_path)
+            return None
+
+        if entry_key != key or versions != [item.parser_version for item in items]:
+            self._remove_entry(entry_path)
+            return None
+
+        # Record the use of the entry for the LRU eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        return items
+
+    def put(self, path, items):
+        """Store the simulation data *items* parsed from the file at *path*.
+
+        :param path: :class: `str` path to file
+        :param items: :class: `list` of simulation data items
+        """
+        key = self._get_key(path)
+        if key is None:
+            return
+
+        versions = [item.parser_version for item in items]
+        self._write_entry(self._get_entry_path(key, self.ENTRY_SUFFIX), (key, versions, items))
+
+    def get_rejection(self, path, parsers):
+        """Return the rejection of the file at *path* by the *parsers*, or
+        ``None`` if the file has not been rejected, or if it or the parsers
+        have changed since.
+
+        :param path: :class: `str` path to file
+        :param parsers: hashable description of the parsers, eg. their names
+            and versions
+
+        :rtype: :class: `FileRejection` or ``None``
+        """
+        key = self._get_key(path)
+        if key is None:
+            return None
+
+        entry_path = self._get_entry_path(key, self.REJECTION_SUFFIX)
+        entry = self._read_entry(entry_path)
+        if entry is None:
+            return None
+        (entry_key, entry_parsers, rejection) = entry
+        if entry_key != key or entry_parsers != parsers:
+            self._remove_entry(entry_path)
+            return None
+        return rejection
+
+    def put_rejection(self, path, parsers, reason, duration):
+        """Record, that the file at *path* has been rejected by all *parsers*
+        due to *reason*, after spending *duration* seconds on it.
+
+        :param path: :class: `str` path to file
+        :param parsers: hashable description of the parsers, see
+            :func: `get_rejection`
+        :param reason: :class: `str` reason of the rejection
+        :param duration: :class: `float` time spent on the file in seconds
+        """
+        key = self._get_key(path)
+        if key is None:
+            return
+
+        rejection = FileRejection(key[0], reason, duration, time.time())
+        self._write_entry(self._get_entry_path(key, self.REJECTION_SUFFIX), (key, parsers, rejection))
+
+    def get_rejections(self):
+        """Return all recorded rejections of files, ordered by the paths of
+        the files. Rejections by other parsers, or of files changed since,
+        are included.
+
+        :rtype: :class: `list` of :class: `FileRejection`
+        """
+        rejections = []
+        for entry in self._scan_entries(self.REJECTION_SUFFIX):
+            entry = self._read_entry(entry.path)
+            if entry is not None:
+                rejections.append(entry[2])
+        return sorted(rejections)
+
+    def clear_rejections(self):
+        """Remove all recorded rejections, so that all files are tried again."""
+        for entry in self._scan_entries(self.REJECTION_SUFFIX):
+            self._remove_entry(entry.path)
+        self._size = None
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for entry in self._scan_entries():
+            self._remove_entry(entry.path)
+        self._size = 0
+
+    # Helper Methods
+
+    def _read_entry(self, entry_path):
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                return pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # The entry is corrupted
+            self._remove_entry(entry_path)
+            return None
+
+    def _write_entry(self, entry_path, entry):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first, so that concurrent readers
+            # never see incomplete entries
+            with NamedTemporaryFile(dir=self.directory, delete=False) as entry_file:
+                pickle.dump(entry, entry_file, pickle.HIGHEST_PROTOCOL)
+            entry_size = os.path.getsize(entry_file.name)
+            # An entry of the same file is replaced, thus only the difference
+            # of the sizes changes the size of the cache
+            try:
+                old_entry_size = os.path.getsize(entry_path)
+            except FileNotFoundError:
+                old_entry_size = 0
+            os.replace(entry_file.name, entry_path)
+        except (OSError, pickle.PicklingError):
+            return
+
+        if self._size is None:
+            self._size = self._get_size_of_entries()
+        else:
+            self._size += entry_size - old_entry_size
+        if self._size > self.max_size:
+            self._evict(entry_path)
+
+    def _get_key(self, path):
+        path = abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (path, stat.st_size, stat.st_mtime_ns)
+
+    def _get_entry_path(self, key, suffix):
+        name = hashlib.sha1(key[0].encode(errors='surrogateescape')).hexdigest()
+        return join(self.directory, name + suffix)
+
+    def _scan_entries(self, *suffixes):
+        suffixes = suffixes or (self.ENTRY_SUFFIX, self.REJECTION_SUFFIX)
+        try:
+            return [entry for entry in os.scandir(self.directory)
+                    if entry.name.endswith(suffixes)]
+        except OSError:
+            return []
+
+    def _get_size_of_entries(self):
+        return sum(entry.stat().st_size for entry in self._scan_entries())
+
+    def _evict(self, kept_entry_path):
+        """Evict least recently used entries, until the size of the cache
+        is below *max_size*. The entry at *kept_entry_path*, which has just
+        been written, is never evicted."""
+        entries = sorted(self._scan_entries(), key=lambda entry: entry.stat().st_mtime_ns)
+        size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if size <= self.max_size:
+                break
+            if entry.path == kept_entry_path:
+                continue
+            size -= entry.stat().st_size
+            self._remove_entry(entry.path)
+        self._size = size
+
+    def _remove_entry(self, entry_path):
+        try:
+            entry_size = os.path.getsize(entry_path)
+            os.remove(entry_path)
+        except OSError:
+            return
+        if self._size is not None:
+            self._size = max(self._size - entry_size, 0)
+
+    # Magic Methods
+
+    def __repr__(self):
+        return str(
+            "SimulationDataItemCache at {}".format(self.directory)
+        )
@@ -17,24 +17,115 @@
 #    along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 ##################################################################################################
-import xmltodict
+from xml.parsers import expat
 from xml.parsers.expat import ExpatError
 from os.path import normpath, basename, sep, dirname
 
 from rdplot.SimulationDataItem import (AbstractSimulationDataItem,
-                                SimulationDataItemError)
+                                SimulationDataItemError,
+                                strip_compression_suffix)
+
+
+def parse_dat_log(xml_file):
+    """Parse the Dat log in the binary file object *xml_file* in one
+    streaming pass. The elements below the *Logfile* root, eg. *Codec*,
+    *SeqName*, *QP* and *Rate*, are mapped to a dict of the texts of their
+    children, eg. their *Value* and *Unit*, or to their own text, if they have
+    no children. Deeper levels and attributes are skipped. For Dat logs, the
+    result equals the *Logfile* entry of :func: `xmltodict.parse`.
+
+    :param xml_file: binary file object
+
+    :rtype: :class: `dict`
+    """
+    sim_data = {}
+    # Names of the open elements
+    names = []
+    texts = []
+    children = {}
+
+    def start_element(name, attributes):
+        names.append(name)
+        if len(names) == 1 and name != 'Logfile':
+            raise SimulationDataItemError("Root element {} is not 'Logfile'".format(name))
+        if len(names) == 2:
+            children.clear()
+        if len(names) <= 3:
+            del texts[:]
+
+    def end_element(name):
+        text = ''.join(texts).strip() or None
+        if len(names) == 3:
+            children[name] = text
+        elif len(names) == 2:
+            sim_data[name] = dict(children) if children else text
+        del texts[:]
+        names.pop()
+
+    def character_data(data):
+        if 2 <= len(names) <= 3:
+            texts.append(data)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    parser.ParseFile(xml_file)
+    return sim_data
+
+
+def sniff_dat_log_codec(head):
+    """Return the value of the *Codec* of the Dat log, whose first bytes are
+    *head*. The head is parsed until the value is found, thus, only the
+    beginning of large logs is read.
+
+    :param head: :class: `bytes` head of the file
+
+    :rtype: :class: `str` value of the codec, or ``None``, if it is not in
+        the head
+    :raises SimulationDataItemError: if the root is not a *Logfile*
+    :raises ExpatError: if the head is not well-formed
+    """
+    names = []
+    texts = []
+
+    class CodecFound(Exception):
+        pass
+
+    def start_element(name, attributes):
+        names.append(name)
+        if len(names) == 1 and name != 'Logfile':
+            raise SimulationDataItemError("Root element {} is not 'Logfile'".format(name))
+        del texts[:]
+
+    def end_element(name):
+        if names == ['Logfile', 'Codec', 'Value']:
+            raise CodecFound(''.join(texts).strip() or None)
+        names.pop()
+
+    def character_data(data):
+        texts.append(data)
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    try:
+        parser.Parse(head, False)
+    except CodecFound as found:
+        return found.args[0]
+    return None
 
 
 class AbstractDatLog(AbstractSimulationDataItem):
+    sniff_file_name_suffixes = ('.xml',)
+
     def __init__(self, path):
         super().__init__(path)
 
-        with open(self.path, 'r') as dat_log:
-            xml = dat_log.read()
-            sim_data = xmltodict.parse(xml)
-            sim_data = sim_data['Logfile']
-            # store the parsed xml dict
-            self.sim_data = sim_data
+        # store the parsed xml dict, which is shared with the class probes
+        self.sim_data = self._read_sim_data(self.path)
 
         # Parse file path and set additional identifiers
         # self.logType = self._get_Type(path)
@@ -57,6 +148,11 @@ class AbstractDatLog(AbstractSimulationDataItem):
 
         return sequence, config, qp
 
+    def copy_for_path(self, path):
+        item = super().copy_for_path(path)
+        item.sequence, item.config, item.qp = item._parse_path(item.path)
+        return item
+
     # Properties
 
     @property
@@ -79,26 +175,53 @@ class AbstractDatLog(AbstractSimulationDataItem):
         ]
 
     # Non-abstract Helper Functions
+    @classmethod
+    def _read_sim_data(cls, path):
+        """Return the values of the Dat log at *path*, see
+        :func: `parse_dat_log`. The file is only parsed once for all
+        classes."""
+        return cls._parse_file(path, parse_dat_log)
+
     @classmethod
     def _enc_log_file_matches_re_pattern(cls, path, pattern):
         """"""
-        if path.endswith("enc.log"):
+        if strip_compression_suffix(path).endswith("enc.log"):
             return cls._is_file_text_matching_re_pattern(path, pattern)
         return False
 
 
 class DatLogBasedOnClassName(AbstractDatLog):
+    # The codec of the log is sniffed once per file, and mapped to the class
+    # by the factory, instead of probing all classes
+    sniff_dispatch_group = 'DatLogCodec'
+    sniff_head_size = 4 * 1024
+
     @classmethod
     def can_parse_file(cls, path):
-            try:
-                with open(path, 'r') as dat_log:
-                    xml = dat_log.read()
-                sim_data = xmltodict.parse(xml)
-                # discard 'DatLog' from class name, then compare to class specified in log file
-                is_sim_of_this_class = ( cls.__name__[6:]  in sim_data['Logfile']['Codec']['Value'])
-                return is_sim_of_this_class
-            except (ExpatError, UnicodeDecodeError, KeyError, IsADirectoryError,FileNotFoundError, PermissionError):
-                return False
+            codec = cls.sniff_dispatch_key(path)
+            return codec is not None and cls.accepts_dispatch_key(codec)
+
+    @classmethod
+    def sniff_dispatch_key(cls, path):
+        """Return the value of the codec of the Dat log at *path*. Only the
+        head of the log is parsed, the whole log only, if the codec is not in
+        the head."""
+        if not strip_compression_suffix(path).endswith(cls.sniff_file_name_suffixes):
+            return None
+        try:
+            head = cls._read_file_head(path, cls.sniff_head_size)
+            codec = sniff_dat_log_codec(head.encode(errors='surrogateescape'))
+            if codec is None:
+                codec = cls._read_sim_data(path)['Codec']['Value']
+            return codec
+        except (ExpatError, SimulationDataItemError, KeyError, TypeError, IsADirectoryError,
+                FileNotFoundError, PermissionError):
+            return None
+
+    @classmethod
+    def accepts_dispatch_key(cls, key):
+        # discard 'DatLog' from class name, then compare to class specified in log file
+        return cls.__name__[6:] in key
 
     def _parse_summary_data(self):
         try:
@@ -164,13 +287,10 @@ class DatLogConversionPSNRLoss360(DatLogBasedOnClassName):
         # prepend simulation directory to config
         config = dirname(normpath(path)) + config
         qp = None
-        with open(self.path, 'r') as dat_log:
-            try:
-                xml = dat_log.read()
-                sim_data = xmltodict.parse(xml)
-                # TODO support for layer specific qp
-                qp = sim_data['Logfile']['QP']['Value']
-            except (IndexError, ExpatError):
-                raise SimulationDataItemError
+        try:
+            # TODO support for layer specific qp
+            qp = self.sim_data['QP']['Value']
+        except (KeyError, TypeError):
+            raise SimulationDataItemError
 
         return sequence, config, qp
@@ -20,10 +20,208 @@
 import re
 from os.path import normpath, basename, dirname
 
-from rdplot.SimulationDataItem import AbstractSimulationDataItem, SimulationDataItemError
+import numpy as np
+
+from rdplot.SimulationDataItem import (AbstractSimulationDataItem, SimulationDataItemError, PlotData,
+                                      TemporalSeries, strip_compression_suffix)
+
+
+class DecoderStatistics:
+    """Counters of the statistics written by the decoder analyser, stored in
+    the dense array *values* indexed by (statistic, width, type, counter).
+    The statistic names, widths and types are listed in the order of their
+    first occurrence in the log, the counters are given by *COUNTERS*.
+    Combinations of statistic, width and type, which are not written to the
+    log, are NaN.
+
+    :param names: :class: `list` of names of the statistics
+    :param widths: :class: `list` of the widths, eg. '-' or '8'
+    :param types: :class: `list` of the types, eg. '-' or 'Y'
+    :param values: :class: `numpy.ndarray` of the counters
+    """
+
+    COUNTERS = ('CABAC Count', 'CABAC Sum', 'CABAC bits', 'EP Count', 'EP Sum', 'EP bits', 'Total bits',
+                'Total bytes')
+
+    def __init__(self, names, widths, types, values):
+        self.names = names
+        self.widths = widths
+        self.types = types
+        self.values = values
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Create the statistics from *rows* of the log.
+
+        :param rows: :class: `list` of :class: `tuple`s of name, width, type
+            and the :class: `tuple` of the counters as :class: `str`
+        """
+        names, widths, types = {}, {}, {}
+        indices = [(names.setdefault(name, len(names)), widths.setdefault(width, len(widths)),
+                    types.setdefault(statistic_type, len(types)))
+                   for (name, width, statistic_type, _) in rows]
+        values = np.full((len(names), len(widths), len(types), len(cls.COUNTERS)), np.nan)
+        if rows:
+            # a later row of the same statistic, width and type overwrites an earlier one
+            values[tuple(np.array(indices).T)] = np.array([counters for (*_, counters) in rows], dtype=np.float64)
+        return cls(list(names), list(widths), list(types), values)
+
+    def get(self, name, width='-', statistic_type='-'):
+        """Return the counters of the statistic *name* for *width* and
+        *statistic_type*.
+
+        :rtype: :class: `numpy.ndarray` indexed like *COUNTERS*
+        """
+        return self.values[self.names.index(name), self.widths.index(width), self.types.index(statistic_type)]
+
+    def __repr__(self):
+        return "DecoderStatistics of {} statistics, {} widths and {} types".format(
+            len(self.names), len(self.widths), len(self.types))
+
+
+class QPSeries(TemporalSeries):
+    """Series of the values of one statistic over the QPs of simulations.
+    Unlike frame indices, QPs are not necessarily integers, thus, they are
+    stored as floats."""
+
+    FRAME_DTYPE = np.float64
+
+
+class DecoderStatisticsStack:
+    """Decoder statistics of several :class: `DecAnalyserLogHM` items stacked
+    to the array *values* indexed by (sequence and config, QP, statistic).
+    *groups* lists the pairs of sequence and config, and *qps* the QPs in
+    ascending order. The statistics are the counters of the statistics of
+    all widths and types, and of the totals, found in any item. *keys* gives
+    the path of each statistic in the analyser data, eg.
+    ('Y', '8', 'SKIP_FLAG', 'CABAC bits') or ('Total', 'TOTAL', 'Total bits').
+    Statistics not written by a simulation are NaN. Each simulation has one
+    cell, thus, the items have to differ in sequence, config or QP.
+
+    :param items: :class: `list` of :class: `DecAnalyserLogHM` items
+    """
+
+    def __init__(self, items):
+        groups = {}
+        qps = sorted({float(item.qp) for item in items})
+        qp_indices = {qp: index for (index, qp) in enumerate(qps)}
+        cells = {}
+        # Columns of the present cells of the statistics of an item. The logs
+        # of one decoder usually share the same cells, thus, the columns are
+        # only looked up once, and the values of the items are copied at once
+        columns_of_layouts = {}
+
+        placements = []
+        simulations = set()
+        for item in items:
+            group = groups.setdefault((item.sequence, item.config), len(groups))
+            qp = qp_indices[float(item.qp)]
+            if (group, qp) in simulations:
+                raise SimulationDataItemError(
+                    "Decoder statistics of sequence '{}', config '{}' and QP {} are given twice, see '{}'".format(
+                        item.sequence, item.config, item.qp, item.path))
+            simulations.add((group, qp))
+            for (statistics, is_total) in ((item.analyser_statistics, False), (item.analyser_totals, True)):
+                present = ~np.isnan(statistics.values[..., 0])
+                layout = (is_total, tuple(statistics.names), tuple(statistics.widths), tuple(statistics.types),
+                          present.tobytes())
+                columns = columns_of_layouts.get(layout)
+                if columns is None:
+                    cell_indices = []
+                    for (name, width, statistic_type) in zip(*np.nonzero(present)):
+                        if is_total:
+                            cell = ('Total', statistics.names[name])
+                        else:
+                            cell = (statistics.types[statistic_type], statistics.widths[width],
+                                    statistics.names[name])
+                        cell_indices.append(cells.setdefault(cell, len(cells)))
+                    counter_count = len(DecoderStatistics.COUNTERS)
+                    columns = (np.array(cell_indices, dtype=np.intp)[:, np.newaxis] * counter_count
+                               + np.arange(counter_count)).reshape(-1)
+                    columns_of_layouts[layout] = columns
+                placements.append((group, qp, columns, statistics.values[present].reshape(-1)))
+
+        self.groups = list(groups)
+        self.qps = np.array(qps)
+        self.keys = [cell + (counter,) for cell in cells for counter in DecoderStatistics.COUNTERS]
+        self.values = np.full((len(self.groups), len(self.qps), len(self.keys)), np.nan)
+        for (group, qp, columns, values) in placements:
+            self.values[group, qp, columns] = values
+
+    def get_series(self, group, statistic):
+        """Return the values of the *statistic* of the *group* over the QPs,
+        which are not NaN. The values are a slice of *values*, if the
+        statistic is given for all QPs.
+
+        :param group: :class: `int` index of the group
+        :param statistic: :class: `int` index of the statistic
+
+        :rtype: :class: `QPSeries`
+        """
+        values = self.values[group, :, statistic]
+        is_present = ~np.isnan(values)
+        if is_present.all():
+            return QPSeries(self.qps, values)
+        return QPSeries(self.qps[is_present], values[is_present])
+
+    def get_dict_tree(self, get_label):
+        """Return the stacked statistics as tree of :class: `dict`s below
+        'Analyser', with one :class: `PlotData` object per group as leafs,
+        see :func: `AbstractSimulationDataItem.aggregate_data`.
+
+        :param get_label: function returning the label of a path in the tree
+        """
+        dict_tree = {}
+        identifiers = [[sequence, config] for (sequence, config) in self.groups]
+        is_present = ~np.isnan(self.values)
+        # Statistics given for all QPs of a group are sliced without masking
+        (is_any_present, is_all_present) = (is_present.any(axis=1), is_present.all(axis=1))
+        for (statistic, key) in enumerate(self.keys):
+            groups = np.nonzero(is_any_present[:, statistic])[0].tolist()
+            if not groups:
+                continue
+            path = ['Analyser', *key]
+            label = get_label(path)
+            parent = dict_tree
+            for path_key in path[:-1]:
+                parent = parent.setdefault(path_key, {})
+
+            values = self.values[:, :, statistic]
+            is_value_present = is_present[:, :, statistic]
+            is_complete = is_all_present[:, statistic].tolist()
+            parent[path[-1]] = [
+                PlotData(identifiers[group],
+                         QPSeries(self.qps, values[group]) if is_complete[group]
+                         else QPSeries(self.qps[is_value_present[group]],
+                                             values[group][is_value_present[group]]),
+                         list(path), label)
+                for group in groups
+            ]
+        return dict_tree
+
+    def __repr__(self):
+        return "DecoderStatisticsStack of {} groups, {} QPs and {} statistics".format(
+            len(self.groups), len(self.qps), len(self.keys))
+
+
+# A line of the decoder statistics, eg.
+#  CU_TRANSQUANT_BYPASS_FLAG    :     64      -   0   0   0   0   0   0   0 (   0)
+# Lines of totals are in brackets, and use '~' as separator, eg.
+# [TOTAL                        ~      -      -   ...                        (1234)]
+# The counters are numbers in the formats written by printf, eg. 1e+06 or -nan
+_NUMBER_PATTERN = r'([-+]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|(?i:nan|inf(?:inity)?)))'
+_STATISTIC_PATTERN = re.compile(
+    r'^(?:(\[)(\S+?)[ \t]*~|[ \t]*(\S+?)[ \t]*:)' +  # bracket and name of totals, or name of statistics
+    r'[ \t]*(\S+)[ \t]+(\S+)' +                       # width, type
+    (r'[ \t]+' + _NUMBER_PATTERN) * 7 +                # CABAC Count, Sum, bits, EP Count, Sum, bits, Total bits
+    r'[ \t]*\([ \t]*' + _NUMBER_PATTERN + r'\)' +     # Total bytes
+    r'(?(1)\])',                                      # closing bracket of totals
+    re.M)
 
 
 class AbstractDecAnalyserLog(AbstractSimulationDataItem):
+    sniff_file_name_suffixes = ('dec.log',)
+
     def __init__(self, path):
         super().__init__(path)
 
@@ -52,6 +250,11 @@ class AbstractDecAnalyserLog(AbstractSimulationDataItem):
 
         return sequence, config, qp
 
+    def copy_for_path(self, path):
+        item = super().copy_for_path(path)
+        item.sequence, item.config, item.qp = item._parse_path(item.path)
+        return item
+
     def _get_label(self, keys):
         """
         :param keys: Variable/Path for which to get the labels
@@ -83,105 +286,70 @@ class AbstractDecAnalyserLog(AbstractSimulationDataItem):
     @classmethod
     def _enc_log_file_matches_re_pattern(cls, path, pattern):
         """"""
-        if path.endswith("dec.log"):
+        if strip_compression_suffix(path).endswith("dec.log"):
             return cls._is_file_text_matching_re_pattern(path, pattern)
         return False
 
 
 class DecAnalyserLogHM(AbstractDecAnalyserLog):
-    # at the moment not the complete decoder analyser log is parsed. the bySize and bySize/byType values are left out
+    # The statistics, including the bySize and byType lines, are stored in
+    # dense arrays, see :class: `DecoderStatistics`, and as analyser data for plotting
 
     # Order value, used to determine order in which parser are tried.
     parse_order = 10
+    parser_version = 2
+
+    sniff_head_pattern = r'^HM \s software'
+    # The statistics are written at the end of the log, the totals being the
+    # last block of the statistics
+    sniff_tail_patterns = (r'\[TOTAL',)
+    sniff_tail_size = 64 * 1024
 
     @classmethod
     def can_parse_file(cls, path):
-        matches_class = cls._enc_log_file_matches_re_pattern(path, r'^HM \s software')
-        is_finished = cls._enc_log_file_matches_re_pattern(path, '\[TOTAL')
+        matches_class, is_finished = cls._sniff_file(path)
         return matches_class and is_finished
 
-    def _parse_analyser_data(self):
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-
-            # we are only interested in the statistics. splitting the file at the line with 'Decoder statistics'
-            dec_statistics = re.split('Decoder statistics', log_text)[1]
-            # each statistic has its own line:
-            dec_statistics = re.split('\n', dec_statistics)
-
-            data = dict()
-            data['Total'] = {}
-
-            variables_list = ['CABAC Count', 'CABAC Sum', 'CABAC bits', 'EP Count', 'EP Sum', 'EP bits', 'Total bits',
-                              'Total bytes']
-
-            # process each line
-            for statistic in dec_statistics:
-                # try to match non total items
-                m = re.match(
-                    '\s*(\S+)\s*:' +         # name
-                    '\s*(\S+)' +             # width
-                    '\s*(\S+)' +             # type
-                    '\s*(\S+)' +             # CABAC Count
-                    '\s*(\S+)' +             # CABAC Sum
-                    '\s*(\S+)' +             # CABAC bits
-                    '\s*(\S+)' +             # EP Count
-                    '\s*(\S+)' +             # EP Sum
-                    '\s*(\S+)' +             # EP bits
-                    '\s*(\S+)' +             # Total bits
-                    '\s*\(\s*(\S+)\)',       # Total bytes
-                    statistic)
-                if m:
-                    statistic_name = m.group(1)
-                    statistic_width = m.group(2)
-                    statistic_type = m.group(3)
-
-                    # create type, width, statistic name if not existing
-                    if statistic_type not in data:
-                        data[statistic_type] = {}
-                    if statistic_width not in data[statistic_type]:
-                        data[statistic_type][statistic_width] = {}
-                    if statistic_name not in data[statistic_type][statistic_width]:
-                        data[statistic_type][statistic_width][statistic_name] = {}
-
-                    for idx, var_name in enumerate(variables_list):
-                        # Reference all data to bit rate
-                        data[statistic_type][statistic_width][statistic_name][var_name] = []
-                        # add an entry for each variable in variables_list
-                        data[statistic_type][statistic_width][statistic_name][var_name].append(
-                            (self.qp, float(m.group(idx + 4))))
-                        pass
-
-                    continue
-
-                # try to match total items
-                m = re.match(
-                    '\[(\S+)\s*~' +          # name
-                    '\s*(\S+)' +             # width
-                    '\s*(\S+)' +             # type
-                    '\s*(\S+)' +             # CABAC Count
-                    '\s*(\S+)' +             # CABAC Sum
-                    '\s*(\S+)' +             # CABAC bits
-                    '\s*(\S+)' +             # EP Count
-                    '\s*(\S+)' +             # EP Sum
-                    '\s*(\S+)' +             # EP bits
-                    '\s*(\S+)' +             # Total bits
-                    '\s*\(\s*(\S+)\)\]',     # Total bytes
-                    statistic)
-                if m:
-                    statistic_name = m.group(1)
-
-                    # create  statistic name if not existing
-                    if statistic_name not in data['Total']:
-                        data['Total'][statistic_name] = {}
-
-                    for idx, var_name in enumerate(variables_list):
-                        # Reference all data to qp
-                        data['Total'][statistic_name][var_name] = []
-                        # add an entry for each variable in variables_list
-                        data['Total'][statistic_name][var_name].append((self.qp, float(m.group(idx + 4))))
-                        pass
-
-                    continue
+    @classmethod
+    def aggregate_data(cls, items):
+        # The statistics of all items are stacked to one array, and the leaves of the
+        # variable tree are slices of it, instead of merging the values of the items one by one.
+        # Items of the same sequence, config and QP would share one cell of the stack, thus,
+        # these are merged one by one, keeping the values of all items
+        simulations = {(item.sequence, item.config, float(item.qp)) for item in items}
+        if len(simulations) < len(items):
+            return None
+        return DecoderStatisticsStack(items).get_dict_tree(items[0]._get_label)
 
+    def _parse_analyser_data(self):
+        # we are only interested in the statistics at the end of the log, thus, only the tail starting with the
+        # line with 'Decoder statistics' is read, and tokenized in a single pass
+        dec_statistics = self._read_file_tail_until(self.path, r'Decoder statistics')
+        if 'Decoder statistics' not in dec_statistics.partition('\n')[0]:
+            raise SimulationDataItemError("No decoder statistics in '{}'".format(self.path))
+
+        data = dict()
+        data['Total'] = {}
+
+        rows = []
+        total_rows = []
+        for m in _STATISTIC_PATTERN.finditer(dec_statistics):
+            (bracket, total_name, statistic_name, statistic_width, statistic_type) = m.group(1, 2, 3, 4, 5)
+            counters = m.groups()[5:]
+            if bracket:
+                statistic_name = total_name
+                total_rows.append((statistic_name, statistic_width, statistic_type, counters))
+                # Reference all data to qp
+                data['Total'][statistic_name] = {
+                    var_name: [(self.qp, float(value))] for (var_name, value) in zip(DecoderStatistics.COUNTERS, counters)
+                }
+            else:
+                rows.append((statistic_name, statistic_width, statistic_type, counters))
+                # create type, width, statistic name if not existing
+                data.setdefault(statistic_type, {}).setdefault(statistic_width, {})[statistic_name] = {
+                    var_name: [(self.qp, float(value))] for (var_name, value) in zip(DecoderStatistics.COUNTERS, counters)
+                }
+
+        self.analyser_statistics = DecoderStatistics.from_rows(rows)
+        self.analyser_totals = DecoderStatistics.from_rows(total_rows)
         return data
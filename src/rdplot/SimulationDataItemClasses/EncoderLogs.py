@@ -23,13 +23,43 @@ from os.path import abspath, join, isdir, isfile, normpath, basename, sep, dirna
 from abc import ABCMeta
 
 from rdplot.SimulationDataItem import (AbstractSimulationDataItem,
-                                SimulationDataItemError)
+                                SimulationDataItemError, TemporalSeries,
+                                strip_compression_suffix, get_compression_suffix)
 from collections import defaultdict
+from operator import itemgetter
+
+import numpy as np
 
 class AbstractEncLog(AbstractSimulationDataItem):
-    def __init__(self, path):
+    # Encoder logs are identified by their file name, and have to contain the
+    # total encoding time at their end, which is written when the encoder
+    # has finished.
+    sniff_file_name_suffixes = ('enc.log',)
+    sniff_tail_patterns = (r'Total\ Time',)
+
+    # Patterns of the first line of the frames, ie. of the body of the log,
+    # and of the first line of the summary at the end of the log. A summary
+    # only parse reads the header of the log up to the body, and the tail of
+    # the log from the summary on, see :func: `_read_log_text`.
+    log_body_pattern = r'^POC'
+    log_summary_pattern = r'^SUMMARY'
+    # Pattern of the lines of the frames, scanned by :func: `_scan_log_body`
+    _poc_line_pattern = re.compile(rb'^POC[^\n]*', re.M)
+
+    # 2: Temporal data is stored as numeric series
+    parser_version = 2
+
+    def __init__(self, path, summary_only=True):
         super().__init__(path)
 
+        # If set, the body of the log is not read, and the temporal data is
+        # parsed on first access. The summary and the config are available
+        # nevertheless.
+        self._summary_only = summary_only
+        # Offsets of the body of the log in the file, recorded by the summary
+        # only parse, ``None`` if the whole file has to be read
+        self._body_range = None
+
         # Parse file path and set additional identifiers
         # self.logType = self._get_Type(path)
         self.sequence, self.config = self._parse_path(self.path)
@@ -37,7 +67,7 @@ class AbstractEncLog(AbstractSimulationDataItem):
 
         # Dictionaries holding the parsed values
         self.summary_data = self._parse_summary_data()
-        self.temporal_data = self._parse_temporal_data()
+        self._temporal_data = None if summary_only else self._parse_temporal_data()
         self.additional_params = []
 
     def _parse_path(self, path):
@@ -47,10 +77,9 @@ class AbstractEncLog(AbstractSimulationDataItem):
         # set config to path of sim data item
         config = dirname(normpath(path))
         # open log file and parse for sequence name and qp
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-            sequence = re.findall(r""" ^Input \s+ File \s+ : \s+ (\S+) $
-                                    """, log_text, re.M + re.X)
+        log_text = self._read_log_text()
+        sequence = re.findall(r""" ^Input \s+ File \s+ : \s+ (\S+) $
+                                """, log_text, re.M + re.X)
 
         # set sequence to the sequence name without path and suffix
         # not for
@@ -58,6 +87,13 @@ class AbstractEncLog(AbstractSimulationDataItem):
 
         return sequence, config
 
+    def copy_for_path(self, path):
+        # The sequence is parsed from the log, only the config depends on the
+        # path of the log
+        item = super().copy_for_path(path)
+        item.config = dirname(normpath(item.path))
+        return item
+
     def _get_label(self, keys):
         """
         :param keys: Variable/Path for which to get the labels
@@ -95,6 +131,32 @@ class AbstractEncLog(AbstractSimulationDataItem):
 
     # Properties
 
+    @property
+    def temporal_data(self):
+        """Temporal data of the log. If the log has been parsed summary only,
+        the temporal data is parsed on first access. Only the body of the log
+        is read then, using the offsets recorded by the summary only parse.
+        """
+        if self._temporal_data is None:
+            self._temporal_data = self._parse_temporal_data()
+        return self._temporal_data
+
+    @temporal_data.setter
+    def temporal_data(self, temporal_data):
+        self._temporal_data = temporal_data
+
+    def drop_temporal_data(self):
+        """Drop the temporal data to free memory. It is parsed again on next
+        access. Data can not be dropped, if the log is not available anymore,
+        eg. if the item has been loaded from an rd file.
+
+        :rtype: :class: `bool` if the data has been dropped
+        """
+        if not isfile(self.path) or self.is_running:
+            return False
+        self._temporal_data = None
+        return True
+
     @property
     def tree_identifier_list(self):
         """Builds up the tree in case of more than one (QP) parameter varied in one simulation directory """
@@ -129,81 +191,363 @@ class AbstractEncLog(AbstractSimulationDataItem):
         ]
 
     # Non-abstract Helper Functions
+    @staticmethod
+    def _temporal_series_from_rows(rows, names):
+        """Convert the *rows* of values parsed from the lines of the frames
+        to a dict of :class: `TemporalSeries`. The values are converted to
+        numbers once, here, and not on every use of the data.
+
+        :param rows: :class: `list` of tuples of strings, one per frame
+        :param names: :class: `dict` mapping the index of a value in a row
+            to its key in the output dict
+        """
+        columns = list(zip(*rows))
+        return {
+            name: TemporalSeries.from_values(columns[index] if columns else [])
+            for (index, name) in names.items()
+        }
+
+    def _read_log_text(self):
+        """Read the text of the log. In a summary only parse, the body of the
+        log is skipped, and the text consists of the header and the summary
+        of the log. Only these parts are read from the file, which are a
+        small fraction of large logs.
+
+        :rtype: :class: `str`
+        """
+        if not self._summary_only:
+            return self._read_file_text(self.path)  # reads the whole text file
+
+        (header, header_size) = self._read_file_head_until(self.path, self.log_body_pattern, with_size=True)
+        (summary, summary_size) = self._read_file_tail_until(self.path, self.log_summary_pattern, with_size=True)
+        # The header and the summary overlap, if the log has no body or
+        # summary. Then, the windows cover the whole log
+        if header.endswith(summary):
+            self._body_range = None
+            return header
+        if summary.startswith(header):
+            self._body_range = None
+            return summary
+
+        self._body_range = (header_size, self._get_file_size(self.path) - summary_size)
+        return header + summary
+
+    def _scan_log_body(self, pattern):
+        """Scan the body of the log, ie. the lines of the frames, for the
+        :class: `bytes` regex *pattern*, see :func: `_scan_file`. The log is
+        not read into memory. If the offsets of the body have been recorded
+        by a summary only parse, only the body is scanned. Otherwise, the
+        whole log is scanned.
+
+        :rtype: generator of the decoded groups of the matches
+        """
+        # Items loaded from rd files, which were written by older versions of
+        # rdplot, do not have a body range
+        body_range = getattr(self, '_body_range', None)
+        if body_range is None:
+            return self._scan_file(self.path, pattern)
+        return self._scan_file(self.path, pattern, *body_range)
+
     @classmethod
     def _enc_log_file_matches_re_pattern(cls, path, pattern):
         """"""
-        if path.endswith("enc.log"):
+        if strip_compression_suffix(path).endswith("enc.log"):
             return cls._is_file_text_matching_re_pattern(path, pattern)
         return False
 
     def _parse_summary_data(self):
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
+        log_text = self._read_file_text(self.path)  # reads the whole text file
 
 
 class EncLogHM(AbstractEncLog):
     # Order value, used to determine order in which parser are tried.
     parse_order = 10
 
-    def __init__(self, path):
-        super().__init__(path)
+    sniff_head_pattern = r'^HM \s software'
+
+    # 2: The config does not contain parameters parsed from the lines of the frames
+    # 3: Temporal data is stored as numeric series
+    parser_version = 3
+
+    # Patterns applied to single lines of the log by :func: `_parse_log`.
+    # Lines are classified by their prefix first, thus, each pattern is only
+    # applied to the few lines it can match.
+    _input_file_pattern = re.compile(r""" Input \s+ File \s+ : \s+ (\S+) $
+                                      """, re.X)
+    _hm_version_pattern = re.compile(r'HM software: Encoder Version \[([a-zA-Z-]+)?([0-9]+)\.([0-9]+)')
+    _total_time_pattern = re.compile(r""" \s*Total\s+Time.\s+(\d+.\d+)
+                                      """, re.X)
+    _summary_values_pattern = re.compile(r""" \s* (\d+\s+)\w # catch frame number
+                                          ((?:\s+\d+\.\d+)+) # catch the fractional numbers (rate, PSNRs)
+                                          """, re.X)
+    # Pattern of the usual line of a frame, eg.
+    # POC 0 TId: 0 ( I-SLICE, nQP 22 QP 22 ) 3580968 bits [Y 40.5837 dB U 47.1845 dB V 46.9922 dB] [ET 53 ] ..
+    _poc_fast_pattern = re.compile(r"""
+        POC \s+ (\d+) \s [^()]* \( [^()]* \) \s+ (\d+) \s+ bits \s+ # POC, bits
+        \[ Y \s+ (\d+\.\d+) \s+ dB \s+ U \s+ (\d+\.\d+) \s+ dB \s+ V \s+ (\d+\.\d+) \s+ dB\] # PSNRs
+        \s+ \[ ET \s+ (\d+) \s # Encoding time
+        """, re.X)
+    # General pattern of the line of a frame. Groups 0, 2, 5, 7, 9, 11 are
+    # the groups of *_poc_fast_pattern*
+    _poc_pattern = re.compile(r"""
+        POC \s+ (\d+) \s+ .+ \s+ \d+ \s+ . \s+ (.-\D+) ,  #Slice
+        \s .+ \) \s+ (\d+) \s+ (.+) \s+ #bits
+        \[ (\D+) \s+ (\d+.\d+) \s+ #Y PSNR
+        \D+ \s+ (\D+) \s+ (\d+.\d+) \s+ # U PSNR
+        \D+ \s+ (\D+) \s+ (\d+.\d+) \s+ \D+ . # V PSNR
+        \s+ \[ (\D+) \s+ (\d+) \s+# Encoding time
+        """, re.X)
+    # some of the configs should not be interpreted as parameters
+    # those are removed from the config
+    _param_not_considered_pattern = re.compile('|'.join(
+        ['RealFormat', 'Warning', 'InternalFormat', 'Byteswrittentofile', 'Frameindex', 'TotalTime', 'HMsoftware']))
+    _multi_param_prefilter_pattern = re.compile(r'\s:\s+\(')
+    _multi_param_pattern = re.compile(r'\w+ \s+ \w+ \s+ \w+ \s+ :\s+ \( \w+ : \d+ , \s+ \w+ : \d+ \)', re.X)
+    # Parameters start at the beginning of a word. Otherwise, long words, like
+    # the MD5 sums in the lines of the frames, are scanned from every position
+    _param_pattern = re.compile(r"(?<!\w) \w+ : (?: \d+ | \s+ \w+ = \d+)", re.X)
+
+    # Association between the index of a value in the rows returned by
+    # :func: `_parse_poc_line` and the corresponding key of the temporal data
+    _temporal_names = {0: 'Frames', 1: 'Bits', 2: 'Y-PSNR', 3: 'U-PSNR', 4: 'V-PSNR', 5: 'ET'}
+
+    def __init__(self, path, summary_only=True):
+        # The log is parsed in a single pass by *_parse_log*, the parse
+        # methods called by the constructors only pick up their results
+        self._parsed_log = None
+        super().__init__(path, summary_only)
         self.encoder_config = self._parse_encoder_config()
+        del self._parsed_log
 
     @classmethod
     def can_parse_file(cls, path):
-        matches_class = cls._enc_log_file_matches_re_pattern(path, r'^HM \s software')
-        is_finished = cls._enc_log_file_matches_re_pattern(path, 'Total\ Time')
+        matches_class, is_finished = cls._sniff_file(path)
         if is_finished is False and matches_class is True:
             # In case an enc.log file has not a Total Time mark it is very likely that the file is erroneous.
             # TODO: Inform user with a dialog window
             print("Warning: The file" + path + " might be erroneous.")
         return matches_class and is_finished
 
-    def _parse_summary_data(self):
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-
-            hm_match = re.search(r'HM software: Encoder Version \[([a-zA-Z-]+)?([0-9]+)\.([0-9]+)', log_text)
-            hm_major_version = hm_match.group(2)
-            hm_minor_version = hm_match.group(3)
-
-            if hm_major_version == '14':  # HM 14 does not write out average YUV-PSNR
-                # catch summary line
-                summaries = re.findall(r""" ^(\w*)-*.*$
-                                   \s* # catch newline and space
-                                   (.*)\| # catch phrase Total Frames / I / P / B
-                                   (\s+\S+)(\s+\S+)(\s+\S+)(\s+\S+)# catch rest of the line
-                                   \s* # catch newline and space
-                                   (\d+\s+)\w # catch frame number
-                                   (\s+\d+\.\d+)(\s+\d+\.\d+)(\s+\d+\.\d+)(\s+\d+\.\d+) # catch the fractional number (rate, PSNRs)
-                              """, log_text, re.M + re.X)
-                total_time = re.findall(r""" ^\s*Total\s+Time.\s+(\d+.\d+)
-                               """, log_text, re.M + re.X)
+    @classmethod
+    def can_follow_file(cls, path):
+        # Compressed logs can not be read from an offset, without
+        # decompressing them from their start
+        if get_compression_suffix(path):
+            return False
+        matches_class, is_finished = cls._sniff_file(path)
+        return matches_class and not is_finished
+
+    @classmethod
+    def follow_file(cls, path):
+        """Create an item for the log at *path* of a running encoder. The
+        log is parsed incrementally by :func: `refresh`, which feeds the lines
+        appended to the log to the same parser as the one of finished logs,
+        see :func: `_parse_log_lines`. The temporal data is extended with the
+        parsed frames, and the summary is parsed, when the encoder has
+        written the total time.
+        """
+        item = cls.__new__(cls)
+        AbstractSimulationDataItem.__init__(item, path)
+        item.is_running = True
+        item._summary_only = False
+        item._body_range = None
+        item.summary_data = {}
+        item.additional_params = []
+        item._follow_log()
+        item.refresh()
+        if item.is_running and not hasattr(item, 'encoder_config'):
+            raise SimulationDataItemError(
+                "The encoder has not written the config to the log '{}' yet".format(path))
+        return item
+
+    def _follow_log(self):
+        """Start to follow the log from its beginning."""
+        # Offset in the log up to which the lines have been parsed
+        self._follow_offset = 0
+        self._parsed_log = self._create_parsed_log()
+        self._temporal_data = self._temporal_series_from_rows([], self._temporal_names)
+
+    def refresh(self):
+        if not self.is_running:
+            return False
+
+        size = self._get_file_size(self.path)
+        if size == self._follow_offset:
+            return False
+        if size < self._follow_offset:
+            # The log has been written again, eg. by a restarted encoder
+            self._follow_log()
+
+        # Only complete lines are parsed, an incomplete last line is read
+        # again by the next refresh
+        (lines, lines_size) = self._read_file_lines(self.path, self._follow_offset, size)
+        if not lines:
+            return False
+        self._follow_offset += lines_size
+
+        parsed_log = self._parsed_log
+        self._parse_log_lines(lines, parsed_log)
+        if parsed_log['temporal']:
+            temporal_data = self._temporal_series_from_rows(parsed_log['temporal'], self._temporal_names)
+            # The values are referenced by their index in the whole log
+            frame_count = len(self._temporal_data['Frames'])
+            for (name, series) in temporal_data.items():
+                self._temporal_data[name].extend(TemporalSeries(series.frames + frame_count, series.values))
+            parsed_log['temporal'] = []
+
+        if parsed_log['total_times']:
+            # The encoder has finished. The config of older HM versions, which
+            # do not mark its end, is complete only now
+            self.sequence, self.config = self._parse_path(self.path)
+            self.encoder_config = self._parse_encoder_config()
+            self.summary_data = self._parse_summary_data()
+            self.is_running = False
+            del self._parsed_log
+        elif not hasattr(self, 'encoder_config') and (
+                parsed_log['is_config_finished'] or len(self._temporal_data['Frames'])):
+            self.sequence, self.config = self._parse_path(self.path)
+            self.encoder_config = self._parse_encoder_config()
+        return True
+
+    def _get_parsed_log(self):
+        if self._parsed_log is None:
+            self._parsed_log = self._parse_log(self._read_log_text())
+        return self._parsed_log
+
+    def _parse_log(self, log_text):
+        """Parse the text *log_text* of the log in a single pass over its
+        lines, see :func: `_parse_log_lines`.
+
+        :rtype: :class: `dict` of lists of the parsed lines, which are
+            further processed by the parse methods
+        """
+        parsed_log = self._create_parsed_log()
+        self._parse_log_lines(log_text.split('\n'), parsed_log)
+        return parsed_log
+
+    @staticmethod
+    def _create_parsed_log():
+        """Return the empty result of :func: `_parse_log`. Besides the lists
+        of the parsed lines, it holds the state of the parse, thus, a log can
+        be parsed in several parts, see :func: `refresh`."""
+        return {'input_files': [], 'hm_version': None, 'summaries': [], 'total_times': [],
+                'temporal': [], 'config': [],
+                'is_config_finished': False, 'previous_line': None, 'summary_header': None,
+                'summary_names': None}
+
+    def _parse_log_lines(self, lines, parsed_log):
+        """Parse the *lines* of the log into *parsed_log*. Each line is
+        classified by its prefix, and added to the summaries, the temporal
+        values or the encoder config.
+        """
+        config = parsed_log['config']
+        is_config_finished = parsed_log['is_config_finished']
+        # A summary consists of a header line, eg. 'SUMMARY ---' or
+        # 'I Slices---', a line with the names of the values separated from
+        # 'Total Frames' by '|', and the line of the values
+        previous_line = parsed_log['previous_line']
+        summary_header = parsed_log['summary_header']
+        summary_names = parsed_log['summary_names']
+
+        for line in lines:
+            if not line or line.isspace():
+                continue
+
+            # Older HM versions do not mark the end of the config. The lines
+            # of the frames are skipped nevertheless, so that the config does
+            # not depend on the body of the log, which is not read by a
+            # summary only parse
+            if not is_config_finished and not line.startswith('POC'):
+                if 'Non-environment-variable-controlled' in line:
+                    is_config_finished = True
+                else:
+                    self._parse_encoder_config_line(line, config)
+
+            if parsed_log['hm_version'] is None:
+                parsed_log['hm_version'] = self._hm_version_pattern.search(line)
+
+            if line.startswith('POC'):
+                values = self._parse_poc_line(line)
+                if values is not None:
+                    parsed_log['temporal'].append(values)
+            elif summary_names is not None:
+                match = self._summary_values_pattern.match(line)
+                values = match.group(2).split() if match is not None else []
+                if match is not None and len(values) >= len(summary_names) - 1:
+                    summary_values = [match.group(1)] + values[:len(summary_names) - 1]
+                    parsed_log['summaries'].append((summary_header, summary_names, summary_values))
+                summary_names = None
+            elif '|' in line:
+                if previous_line is not None:
+                    (total_frames, names) = line.rsplit('|', 1)
+                    summary_header = re.match(r'\w*', previous_line).group()
+                    summary_names = [total_frames] + names.split()
+            elif line.startswith('Input'):
+                match = self._input_file_pattern.match(line)
+                if match is not None:
+                    parsed_log['input_files'].append(match.group(1))
+            elif 'Total' in line:
+                match = self._total_time_pattern.match(line)
+                if match is not None:
+                    parsed_log['total_times'].append(match.group(1))
+
+            previous_line = line
+
+        parsed_log['is_config_finished'] = is_config_finished
+        parsed_log['previous_line'] = previous_line
+        parsed_log['summary_header'] = summary_header
+        parsed_log['summary_names'] = summary_names
+
+    def _parse_poc_line(self, line):
+        """Return the POC, the bits, the PSNRs and the encoding time of the
+        *line* of a frame as strings, or ``None`` if the line can not be
+        parsed."""
+        match = self._poc_fast_pattern.match(line)
+        if match is not None:
+            return match.groups()
+        match = self._poc_pattern.match(line)
+        if match is not None:
+            return itemgetter(0, 2, 5, 7, 9, 11)(match.groups())
+        return None
+
+    def _parse_encoder_config_line(self, line, config):
+        """Add the parameters in the *line* of the encoder config to the
+        list *config* of 'name:value' strings."""
+        colon_count = line.count(':')
+        if colon_count == 1:
+            clean_line = re.sub(r'\s+', '', line)
+            if not self._param_not_considered_pattern.search(clean_line):
+                config.append(clean_line)
+        elif colon_count > 1:
+            if (self._multi_param_prefilter_pattern.search(line)
+                    and self._multi_param_pattern.search(line)):
+                clean_line = self._multi_param_pattern.findall(line)
             else:
-                # catch summary line
-                summaries = re.findall(r""" ^(\w*)-*.*$
-                               \s* # catch newline and space
-                               (.*)\| # catch phrase Total Frames / I / P / B
-                               (\s+\S+)(\s+\S+)(\s+\S+)(\s+\S+)(\s+\S+)# catch rest of the line
-                               \s* # catch newline and space
-                               (\d+\s+)\w # catch frame number
-                               (\s+\d+\.\d+)(\s+\d+\.\d+)(\s+\d+\.\d+)(\s+\d+\.\d+)(\s+\d+\.\d+)# catch the fractional number (rate, PSNRs)
-                          """, log_text, re.M + re.X)
-                total_time = re.findall(r""" ^\s*Total\s+Time.\s+(\d+.\d+)
-                               """, log_text, re.M + re.X)
+                clean_line = self._param_pattern.findall(line)
+            for clean_item in clean_line:
+                if not self._param_not_considered_pattern.search(clean_item):
+                    config.append(clean_item)
+
+    def _parse_path(self, path):
+        config = dirname(normpath(path))
+        # set sequence to the sequence name without path and suffix
+        sequence = splitext(basename(self._get_parsed_log()['input_files'][-1]))[0]
+        return sequence, config
+
+    def _parse_summary_data(self):
+        parsed_log = self._get_parsed_log()
+
+        hm_match = parsed_log['hm_version']
+        hm_major_version = hm_match.group(2)
+        hm_minor_version = hm_match.group(3)
+        total_time = parsed_log['total_times']
+
         data = {}
-        for summary in summaries:
-            summary_type = summary[0]
+        for (summary_type, names, vals) in parsed_log['summaries']:
             # Create upon first access
             if summary_type not in data:
                 data[summary_type] = {}
 
-            # remove first element, we need an even number of elements. then split into two list, values and names
-            # and pack them together
-            summary = summary[1:]
-            names = summary[:len(summary) // 2]
-            vals = summary[len(summary) // 2:]
-
             names = [name.strip() for name in names]  # remove leading and trailing space
             vals = [float(val) for val in vals]  # convert to numbers
 
@@ -230,99 +574,72 @@ class EncLogHM(AbstractEncLog):
         return data
 
     def _parse_encoder_config(self):
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-            lines = log_text.split('\n')
-            cleanlist = []
-            # some of the configs should not be interpreted as parameters
-            # those are removed from the cleanlist
-            param_not_considered = ['RealFormat', 'Warning', 'InternalFormat', 'Byteswrittentofile', 'Frameindex',
-                                    'TotalTime', 'HMsoftware']
-            for one_line in lines:
-                if one_line:
-                    if 'Non-environment-variable-controlled' in one_line:
-                        break
-                    if one_line.count(':') == 1:
-                        clean_line = one_line.strip(' \n\t\r')
-                        clean_line = re.sub('\s+', '', clean_line)
-                        if not any(re.search(param,clean_line) for param in param_not_considered):
-                            cleanlist.append(clean_line)
-                    elif one_line.count(':') > 1:
-                        if re.search('\w+ \s+ \w+ \s+ \w+ \s+ :\s+ \( \w+ : \d+ , \s+ \w+ : \d+ \)', one_line, re.X):
-                            clean_line = re.findall('\w+ \s+ \w+ \s+ \w+ \s+ :\s+ \( \w+ : \d+ , \s+ \w+ : \d+ \)', one_line, re.X)
-                        else:
-                            clean_line = re.findall('\w+ : \d+ | \w+ : \s+ \w+ = \d+', one_line, re.X)
-                        for clean_item in clean_line:
-                            if not any(re.search(param,clean_item) for param in param_not_considered):
-                                cleanlist.append(clean_item)
-
-        parsed_config = dict(item.split(':', 1) for item in cleanlist)
+        parsed_config = dict(item.split(':', 1) for item in self._get_parsed_log()['config'])
         self.qp = parsed_config['QP']
         return parsed_config
 
     def _parse_temporal_data(self):
         # this function extracts temporal values
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-
-        temp_data = re.findall(r"""
-            ^POC \s+ (\d+) \s+ .+ \s+ \d+ \s+ . \s+ (.-\D+) ,  #Slice
-            \s .+ \) \s+ (\d+) \s+ (.+) \s+ #bits
-            \[ (\D+) \s+ (\d+.\d+) \s+ #Y PSNR
-            \D+ \s+ (\D+) \s+ (\d+.\d+) \s+ # U PSNR
-            \D+ \s+ (\D+) \s+ (\d+.\d+) \s+ \D+ . # V PSNR
-            \s+ \[ (\D+) \s+ (\d+) \s+# Encoding time
-            """, log_text, re.M + re.X)
-
-        # Association between index of data in temp_data and corresponding
-        # output key. Output shape definition is in one place.
-        names = {0: 'Frames', 2: 'Bits', 5: 'Y-PSNR', 7: 'U-PSNR',
-                 9: 'V-PSNR', 11: 'ET'}
-
-        # Define output data dict and fill it with parsed values
-        data = {name: [] for (index, name) in names.items()}
-        for i in range(0, len(temp_data)):
-            # As referencing to frame produces error, reference to index *i*
-            for (index, name) in names.items():
-                data[name].append(
-                    (i, temp_data[i][index])
-                )
-        return data
+        if hasattr(self, '_parsed_log'):
+            # Within the constructor, the lines of the frames are parsed by
+            # the single pass over the whole log
+            temp_data = self._get_parsed_log()['temporal']
+        else:
+            temp_data = [values for values in map(self._parse_poc_line, self._scan_log_body(self._poc_line_pattern))
+                         if values is not None]
+
+        # Define output data dict and fill it with parsed values. As
+        # referencing to frame produces error, values are referenced by
+        # their index.
+        return self._temporal_series_from_rows(temp_data, self._temporal_names)
 
 
 class EncLogHM360Lib(AbstractEncLog):
     # Order value, used to determine order in which parser are tried.
     parse_order = 20
 
-    def __init__(self, path):
-        super().__init__(path)
+    # The 360 metrics are part of the summary tables at the end of the log,
+    # thus, the tail window has to include all of them
+    sniff_tail_patterns = (r'Y-PSNR_(?:DYN_)?VP0', r'Total\ Time')
+    sniff_tail_size = 16 * 1024
+
+    # 3: The columns of the temporal data are derived from the labels in the log
+    parser_version = 3
+
+    # Names of the first metric groups of the lines of the frames with the
+    # layout parsed by older versions, in the order of the groups. The names of
+    # further groups, and of the groups of other layouts, are their labels.
+    legacy_temporal_group_count = 11
+    legacy_temporal_metric_names = ('PSNR', 'SPSNR_NN', 'WSPSNR', 'SPSNR_I', 'CPPSNR',
+                                    'E2EWSPSNR', 'PSNR_VP0', 'PSNR_VP1')
+
+    def __init__(self, path, summary_only=True):
+        super().__init__(path, summary_only)
         self.encoder_config = self._parse_encoder_config()
 
     @classmethod
     def can_parse_file(cls, path):
-        matches_class = cls._enc_log_file_matches_re_pattern(path, r'Y-PSNR_(?:DYN_)?VP0')
-        is_finished = cls._enc_log_file_matches_re_pattern(path, 'Total\ Time')
+        matches_class, is_finished = cls._sniff_file(path)
         return matches_class and is_finished
 
     def _parse_encoder_config(self):
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-            lines = log_text.split('\n')
-            cleanlist = []
-            for one_line in lines:
-                if one_line:
-                    if '-----360 video parameters----' in one_line:
-                        break
-                    if one_line.count(':') == 1:
-                        clean_line = one_line.strip(' \n\t\r')
-                        clean_line = clean_line.replace(' ', '')
-                        cleanlist.append(clean_line)
-                        # elif one_line.count(':')>1:
-                        # Ignore Multiline stuff for now
-                        # TODO: do something smart
-                        # else:
-                        # Something else happened, do nothing
-                        # TODO: do something smart
+        log_text = self._read_log_text()
+        lines = log_text.split('\n')
+        cleanlist = []
+        for one_line in lines:
+            if one_line:
+                if '-----360 video parameters----' in one_line:
+                    break
+                if one_line.count(':') == 1:
+                    clean_line = one_line.strip(' \n\t\r')
+                    clean_line = clean_line.replace(' ', '')
+                    cleanlist.append(clean_line)
+                    # elif one_line.count(':')>1:
+                    # Ignore Multiline stuff for now
+                    # TODO: do something smart
+                    # else:
+                    # Something else happened, do nothing
+                    # TODO: do something smart
         parsed_config = dict(item.split(':') for item in cleanlist)
 
         # parse 360 rotation parameter
@@ -337,10 +654,9 @@ class EncLogHM360Lib(AbstractEncLog):
 
     def _parse_summary_data(self):
 
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()
-            total_time = re.findall(r""" ^\s*Total\s+Time.\s+(\d+.\d+)
-                            """, log_text, re.M + re.X)
+        log_text = self._read_log_text()
+        total_time = re.findall(r""" ^\s*Total\s+Time.\s+(\d+.\d+)
+                        """, log_text, re.M + re.X)
 
         # get 360 Lib version
         m = re.match(r'-----360Lib\ software\ version\ (\[3.0\])-----',log_text)
@@ -388,147 +704,193 @@ class EncLogHM360Lib(AbstractEncLog):
 
     def _parse_temporal_data(self):
         # this function extracts temporal values
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-            temp_data = re.findall(r"""
-                ^POC \s+ (\d+) \s+ .+ \s+ \d+ \s+ . \s+ (.-\D+) ,  # POC, Slice
-                \s .+ \) \s+ (\d+) \s+ \S+ \s+  # bitrate
-                \[ \S \s (\S+) \s \S+ \s+ \S \s (\S+) \s \S+ \s+ \S \s (\S+) \s \S+ ] \s  # y-, u-, v-PSNR
-                \[ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ ] \s  #y-, u-, v-SPSNR_NN
-                \[ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ ] \s  #y-, u-, v-WSPSNR
-                \[ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ ] \s  #y-, u-, v-SPSNR_I
-                \[ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ ] \s  #y-, u-, v-CPPPSNR
-                \[ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ ] \s  #y-, u-, v-E2EWSPSNR
-                \[ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ ] \s  #y-, u-, v-PSNR_VP0
-                \[ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ \s+ \S+ \s (\S+) \s \S+ ] \s  #y-, u-, v-PSNR_VP1
-                \[ \S+ \s \S+ \s \S+ \s+ \S+ \s \S+ \s \S+ \s+ \S+ \s \S+ \s \S+ ] \s  #y-, u-, v-CFSPSNR_NN
-                \[ \S+ \s \S+ \s \S+ \s+ \S+ \s \S+ \s \S+ \s+ \S+ \s \S+ \s \S+ ] \s  #y-, u-, v-CFSPSNR_I
-                \[ \S+ \s \S+ \s \S+ \s+ \S+ \s \S+ \s \S+ \s+ \S+ \s \S+ \s \S+ ] \s  #y-, u-, v-CFCPPPSNR
-                \[ \D+ \s+ (\d+) \s+ #ET
-                """, log_text, re.M + re.X)
-
-        # Association between index of data in temp_data and corresponding
-        # output key. Output shape definition is in one place.
-        names = {0: 'Frames', 2: 'Bits',
-                 3: 'Y-PSNR', 4: 'U-PSNR', 5: 'V-PSNR',
-                 6: 'Y-SPSNR_NN', 7: 'U-SPSNR_NN', 8: 'V-SPSNR_NN',
-                 9: 'Y-WSPSNR', 10: 'U-WSPSNR', 11: 'V-WSPSNR',
-                 12: 'Y-SPSNR_I', 13: 'U-SPSNR_I', 14: 'V-SPSNR_I',
-                 15: 'Y-CPPSNR', 16: 'U-CPPSNR', 17: 'V-CPPSNR',
-                 18: 'Y-E2EWSPSNR', 19: 'U-E2EWSPSNR', 20: 'V-E2EWSPSNR',
-                 21: 'Y-PSNR_VP0', 22: 'U-PSNR_VP0', 23: 'V-PSNR_VP0',
-                 24: 'Y-PSNR_VP1', 25: 'U-PSNR_VP1', 26: 'V-PSNR_VP1', 27: 'ET'
-                 }
-
-        # Define output data dict and fill it with parsed values
-        data = {name: [] for (index, name) in names.items()}
-        for i in range(0, len(temp_data)):
-            # As referencing to frame produces error, reference to index *i*
-            for (index, name) in names.items():
-                data[name].append(
-                    (i, temp_data[i][index])
-                )
-        return data
+        poc_lines = list(self._scan_log_body(self._poc_line_pattern))
+        if not poc_lines:
+            return self._temporal_series_from_rows([], {0: 'Frames', 1: 'Bits', 2: 'ET'})
+
+        # The layout of the lines of all frames is equal, thus, the columns
+        # are derived from the labels of the first line only
+        (names, token_indices) = zip(*self._get_temporal_columns(poc_lines[0]))
+        get_values = itemgetter(*token_indices)
+
+        # Split each line at whitespace and pick the values of the columns
+        # by position. The label of the encoding time is used to check, that
+        # the line fits the layout; lines which do not are skipped.
+        et_label_index = token_indices[names.index('ET')] - 1 if 'ET' in names else 0
+        et_label = poc_lines[0].split()[et_label_index]
+        value_strings = []
+        for line in poc_lines:
+            tokens = line.split()
+            if len(tokens) > et_label_index and tokens[et_label_index] == et_label:
+                value_strings.extend(get_values(tokens))
+
+        # Convert all values at once, one row per frame
+        try:
+            values = np.array(value_strings, dtype=np.float64).reshape(-1, len(names))
+        except ValueError:
+            # Skip the frames with values, which are not numbers
+            rows = [value_strings[i:i + len(names)] for i in range(0, len(value_strings), len(names))]
+            values = np.array([row for row in rows if self._is_numeric_row(row)],
+                              dtype=np.float64).reshape(-1, len(names))
+
+        return {name: TemporalSeries.from_values(values[:, column])
+                for (column, name) in enumerate(names)}
+
+    @staticmethod
+    def _is_numeric_row(row):
+        try:
+            [float(value) for value in row]
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def _get_temporal_columns(cls, poc_line):
+        """Derive the columns of the temporal data from the first line of
+        the frames. Besides the POC and the bits, the line consists of
+        groups enclosed by brackets, eg.::
+
+            POC 0 TId: 0 ( I-SLICE, ... )  4902520 bits [Y 44.49 dB  U 48.24 dB  V 47.62 dB] [Y-WSPSNR ...] ... [ET  74 ]
+
+        Each metric group has a triple of label, value and unit per
+        component. The number and the kind of the metric groups depends on
+        the version and the configuration of 360Lib.
+
+        :param poc_line: :class: `str` first line of the frames
+        :rtype: :class: `list` of pairs of name of the column and index of
+            its value in the whitespace separated tokens of the line
+        """
+        tokens = poc_line.split()
+        columns = [('Frames', 1), ('Bits', tokens.index('bits') - 1)]
+
+        # Labels of the metrics as tuples of index of the group, label and
+        # index of the value
+        metrics = []
+        group_count = 0
+        for (index, token) in enumerate(tokens[:-1]):
+            if token == '[ET':
+                columns.append(('ET', index + 1))
+            elif index + 2 < len(tokens) and tokens[index + 2].startswith('dB'):
+                # The first label of a group starts with the bracket
+                if token.startswith('['):
+                    group_count += 1
+                metrics.append((group_count - 1, token.lstrip('['), index + 1))
+
+        # Older versions of rdplot named the metrics of the layout with
+        # 11 groups by the position of the group. Keep these names.
+        use_legacy_names = group_count == cls.legacy_temporal_group_count
+        for (group_index, label, value_index) in metrics:
+            (component, _, metric) = label.partition('-')
+            if use_legacy_names and group_index < len(cls.legacy_temporal_metric_names):
+                metric = cls.legacy_temporal_metric_names[group_index]
+            elif not metric:
+                metric = 'PSNR'
+            columns.append((component + '-' + metric, value_index))
+
+        return columns
 
 
 class EncLogSHM(AbstractEncLog):
     # Order value, used to determine order in which parser are tried.
     parse_order = 21
+    # 3: Total time of all layers, layers are split by their id
+    parser_version = 3
+
+    sniff_head_pattern = r'^SHM \s software'
+
+    # Pattern of the lines of the frames, scanned by :func: `_scan_log_body`
+    # Only the values of the structured array of the frames are captured, see
+    # :func: `_parse_poc_lines`
+    _poc_pattern = re.compile(rb"""
+        ^POC \s+ (\d+) \s+ LId: \s+ (\d+) [^)\n]* \)    # POC, layer id, slice
+        \s+ (\d+) \s+ bits \s+                          # bits
+        \[ Y \s+ (\S+) \s+ dB \s+                       # Y PSNR
+        U \s+ (\S+) \s+ dB \s+                          # U PSNR
+        V \s+ (\S+) \s+ dB \s* \]                       # V PSNR
+        \s+ \[ ET \s+ (\d+)                             # Encoding time
+        """, re.M + re.X)
+    # Fields of the structured array of the lines of the frames, with the
+    # index of their group in *_poc_pattern*, see :func: `_parse_poc_lines`
+    _poc_fields = [('POC', np.int32, 0), ('layer', np.int32, 1), ('bits', np.int64, 2), ('Y-PSNR', np.float64, 3),
+                   ('U-PSNR', np.float64, 4), ('V-PSNR', np.float64, 5), ('ET', np.float64, 6)]
+    # Association between the fields and the keys of the temporal data
+    _temporal_fields = [('POC', 'Frames'), ('bits', 'Bits'), ('Y-PSNR', 'Y-PSNR'), ('U-PSNR', 'U-PSNR'),
+                        ('V-PSNR', 'V-PSNR'), ('ET', 'ET')]
 
     @classmethod
     def can_parse_file(cls, path):
-        matches_class = cls._enc_log_file_matches_re_pattern(path, r'^SHM \s software')
-        is_finished = cls._enc_log_file_matches_re_pattern(path, 'Total\ Time')
+        matches_class, is_finished = cls._sniff_file(path)
         return matches_class and is_finished
 
     def _parse_summary_data(self):
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-            summaries = re.findall(r"""
-                        ^\s+ L (\d+) \s+ (\d+) \s+ \D \s+ # the next is bitrate
-                        (\S+) \s+ (\S+) \s+ (\S+) \s+ (\S+) \s+ (\S+)
-                        """, log_text, re.M + re.X)
-            total_time = re.findall(r""" ^\s*Total\s+Time.\s+(\d+.\d+)
-                                        """, log_text, re.M + re.X)
-        data = {}
-        layer_quantity = int(len(summaries) / 4)
+        log_text = self._read_log_text()
+        summaries = re.findall(r"""
+                    ^\s+ L (\d+) \s+ (\d+) \s+ \D \s+ # the next is bitrate
+                    (\S+) \s+ (\S+) \s+ (\S+) \s+ (\S+) \s+ (\S+)
+                    """, log_text, re.M + re.X)
+        total_time = re.findall(r""" ^\s*Total\s+Time.\s+(\d+.\d+)
+                                    """, log_text, re.M + re.X)
         header_names = ['SUMMARY', 'I', 'P', 'B']
-        names = {1: 'Frames', 2: 'Bitrate', 3: 'Y-PSNR', 4: 'U-PSNR',
-                 5: 'V-PSNR', 6: 'YUV-PSNR', }
+        names = ['Frames', 'Bitrate', 'Y-PSNR', 'U-PSNR', 'V-PSNR', 'YUV-PSNR']
+
+        # The values of the summaries indexed by (summary, layer, name). The
+        # string '-nan' of layers without frames is converted to NaN
+        layer_quantity = len(summaries) // len(header_names)
+        values = np.array([summary[1:] for summary in summaries[:len(header_names) * layer_quantity]],
+                          dtype=np.float64).reshape(len(header_names), layer_quantity, len(names))
+        bitrates = values[:, :, 1]
+        # Layers without frames are set to 0
+        layer_values = np.where(np.isnan(bitrates)[:, :, np.newaxis], 0., values)
+        layer_bitrates = layer_values[:, :, 1]
+
+        # add the addition of the rates of all layers. PSNR values are taken from the last layer. If the last
+        # layer has no frames, the rate is 0
+        # TODO make this nice one day
+        sum_bitrates = np.where(np.isnan(bitrates[:, -1]), 0., bitrates.sum(axis=1))
 
-        for it in range(0, 4):  # iterate through Summary, I, P, B
+        data = {}
+        for (it, header_name) in enumerate(header_names):  # iterate through Summary, I, P, B
             data2 = {}
             for layer in range(0, layer_quantity):  # iterate through layers
-                layerstring = 'layer ' + str(layer)
-                data2[layerstring] = {}
-                data3 = {}
-                bitrate = summaries[layer_quantity * it + layer][2]
-                for (index, name) in names.items():
-                    # convert string '-nan' to int 0 if necessary
-                    data3[name] = []
-                    if isinstance(bitrate, str) and (bitrate == '-nan'):
-                        data3[name].append(
-                            (float(0), float(0))
-                        )
-                    else:
-                        data3[name].append(
-                            (float(bitrate), float(summaries[layer_quantity * it + layer][index]))
-                        )
-                data2[layerstring] = data3
-
-            # add the addition of layers 1 and two in rate. PSNR values are taken from Layer one
-            # TODO make this nice one day
-            layerstring = 'layer 1 + 2'
-            # data2[layerstring] = {}
-            data4 = {}
-            bitrate = 0
-            for layer in range(0, layer_quantity):
-                if summaries[layer_quantity * it + layer_quantity - 1][2] != '-nan':
-                    bitrate += float(summaries[layer_quantity * it + layer][2])
-            for (index, name) in names.items():
-                data4[name] = []
-                if summaries[layer_quantity * it + layer_quantity - 1][2] == 'nan':
-                    data4[name].append((float(0), float(0)))
-                else:
-                    data4[name].append(
-                        (bitrate, float(summaries[layer_quantity * it + layer_quantity - 1][index])))
-            data2[layerstring] = data4
+                data2['layer ' + str(layer)] = {
+                    name: [(float(layer_bitrates[it, layer]), float(layer_values[it, layer, index]))]
+                    for (index, name) in enumerate(names)
+                }
+            data2['layer 1 + 2'] = {
+                name: [(float(sum_bitrates[it]), float(values[it, -1, index]))]
+                for (index, name) in enumerate(names)
+            }
+            data[header_name] = data2
+
+        for layer in range(0, layer_quantity):
+            data['SUMMARY']['layer ' + str(layer)]['Total Time'] = [(float(bitrates[0, layer]), float(total_time[0]))]
+        data['SUMMARY']['layer 1 + 2']['Total Time'] = [(float(sum_bitrates[0]), float(total_time[0]))]
+        return data
 
-            data[header_names[it]] = data2
+    def _parse_poc_lines(self):
+        """Parse the lines of the frames of all layers into one structured
+        array with the fields of *_poc_fields*, in the order of the lines.
 
-        data['SUMMARY']['layer 0']['Total Time'] = [(float(summaries[0][2]), float(total_time[0]))]
-        data['SUMMARY']['layer 1']['Total Time'] = [(float(summaries[1][2]), float(total_time[0]))]
-        data['SUMMARY']['layer 1 + 2']['Total Time'] = [
-            (float(data['SUMMARY']['layer 1 + 2']['Bitrate'][0][0]), float(total_time[0]))]
-        return data
+        :rtype: :class: `numpy.ndarray`
+        """
+        rows = list(self._scan_log_body(self._poc_pattern))
+        columns = list(zip(*rows))
+        frames = np.empty(len(rows), dtype=[(name, dtype) for (name, dtype, _) in self._poc_fields])
+        for (name, dtype, index) in self._poc_fields:
+            frames[name] = np.asarray(columns[index] if columns else [], dtype=dtype)
+        return frames
 
     def _parse_temporal_data(self):
-        # this function extracts temporal values
-        with open(self.path, 'r') as log_file:
-            log_text = log_file.read()  # reads the whole text file
-            temp_data = re.findall(r"""
-                                ^POC \s+ (\d+) .+? : \s+ (\d+) .+ (\D-\D+) \s \D+,  #Slice
-                                .+ \) \s+ (\d+) \s+ (.+) \s+ \[ (\D+) \s+ (\d+.\d+) \s+ #Y PSNR
-                                \D+ \s+ (\D+) \s+ (\d+.\d+) \s+ # U PSNR
-                                \D+ \s+ (\D+) \s+ (\d+.\d+) \s+ \D+ . # v PSNR
-                                \s+ \[ (\D+) \s+ (\d+) \s+# Encoding time
-                                """, log_text, re.M + re.X)
-
-        # Association between index of data in temp_data and corresponding
-        # output key. Output shape definition is in one place.
-        names = {0: 'Frames', 3: 'Bits', 6: 'Y-PSNR', 8: 'U-PSNR',
-                 10: 'V-PSNR', 12: 'ET'}
+        # this function extracts temporal values of all layers at once, and splits them by layer
+        frames = self._parse_poc_lines()
+        if not len(frames):
+            return {}
 
-        layer_quantity = int(max(temp_data[i][1] for i in range(0, len(temp_data)))) + 1
-        layer_quantity = int(layer_quantity)
         data = {}
-        for layer in range(0, layer_quantity):  # iterate through layers
-            data2 = {name: [] for (index, name) in names.items()}
-            for j in range(0, int(len(temp_data) / layer_quantity)):  # iterate through frames (POCS)
-                for (index, name) in names.items():
-                    data2[name].append(
-                        (j, temp_data[layer_quantity * j + layer][index])
-                    )
-            layerstring = 'layer ' + str(layer)
-            data[layerstring] = data2
+        layers = frames['layer']
+        for layer in range(0, int(layers.max()) + 1):  # iterate through layers
+            layer_frames = frames[layers == layer]
+            data['layer ' + str(layer)] = {
+                name: TemporalSeries.from_values(layer_frames[field]) for (field, name) in self._temporal_fields
+            }
         return data
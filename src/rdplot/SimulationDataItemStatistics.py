@@ -0,0 +1,365 @@
+##################################################################################################
+#    This file is part of RDPlot - A gui for creating rd plots based on pyqt and matplotlib
+#    <https://git.rwth-aachen.de/IENT-Software/rd-plot-gui>
+#    Copyright (C) 2017  Institut fuer Nachrichtentechnik, RWTH Aachen University, GERMANY
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+##################################################################################################
+import json
+import math
+import threading
+import time
+
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+
+#
+# Functions
+#
+
+
+def timed_parse_phase(method):
+    """Decorate the parse *method* of a simulation data item class, so that
+    the time spent in the method is recorded as phase of the
+    :class: `ParseRecord`, which is active in the thread, see
+    :func: `recorded_parse`. The time of nested phases is only recorded for
+    the innermost phase.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def timed_method(*args, **kwargs):
+        record = getattr(_active_record, 'record', None)
+        if record is None:
+            return method(*args, **kwargs)
+        with record.phase(name):
+            return method(*args, **kwargs)
+
+    timed_method.is_timed_parse_phase = True
+    return timed_method
+
+
+@contextmanager
+def recorded_parse(statistics, path):
+    """Context manager recording the parse of the file at *path* in a
+    :class: `ParseRecord`, which is added to the :class: `ParseStatistics`
+    *statistics* on exit. The record is active in the thread, thus, the
+    phases of the parse are recorded, see :func: `timed_parse_phase`. Errors
+    raised in the context are recorded as *reason* of the record.
+
+    :rtype: :class: `ParseRecord`
+    """
+    record = ParseRecord(path)
+    previous_record = getattr(_active_record, 'record', None)
+    _active_record.record = record
+    try:
+        yield record
+    except Exception as error:
+        record.failed = True
+        if record.reason is None:
+            record.reason = "{}: {}".format(error.__class__.__name__, error)
+        raise
+    finally:
+        _active_record.record = previous_record
+        record.finish()
+        statistics.add(record)
+
+
+def format_summary(summary):
+    """Return the *summary* of :class: `ParseStatistics` as human readable
+    text, see :func: `ParseStatistics.get_summary`.
+
+    :rtype: :class: `str`
+    """
+    def format_seconds(seconds):
+        return '-' if seconds is None else '{:.1f} ms'.format(1000 * seconds)
+
+    lines = [
+        "{files} files: {parsed} parsed, {cached} cached, {duplicates} duplicates, "
+        "{rejected} rejected, {failed} failed".format(**summary),
+        "{:.2f} s, {:.1f} files/s, {:.2f} MB/s, {:.1f} MB read".format(
+            summary['wall_time'], summary['files_per_second'], summary['megabytes_per_second'],
+            summary['bytes_read'] / 1e6),
+    ]
+    for (parser, parser_summary) in sorted(summary['parsers'].items()):
+        lines.append("{}: {} files, p50 {}, p95 {}".format(
+            parser, parser_summary['files'], format_seconds(parser_summary['p50']),
+            format_seconds(parser_summary['p95'])))
+    if summary['phases']:
+        lines.append("Phases: " + ", ".join(
+            "{} {}".format(phase, format_seconds(duration))
+            for (phase, duration) in sorted(summary['phases'].items(), key=lambda item: -item[1])))
+    model_updates = summary['model_updates']
+    if model_updates['count']:
+        lines.append("Model updates: {} with {} items, {}".format(
+            model_updates['count'], model_updates['items'], format_seconds(model_updates['duration'])))
+    return "\n".join(lines)
+
+
+# -------------------------------------------------------------------------------
+
+#
+# Classes
+#
+
+# The record, which is currently active in a thread, see :func: `recorded_parse`
+_active_record = threading.local()
+
+
+class ParseRecord:
+    """Timings of the parse of the file at *path*.
+
+    The *duration* is the whole time spent on the file, *sniff_duration* the
+    time spent on probing the parser classes, and *phases* maps the names of
+    the parse methods of the classes, eg. *_parse_summary_data*, to the time
+    spent in them, see :func: `timed_parse_phase`. All times are in seconds.
+    *bytes_read* are the bytes read from the file, *parser* is the name of
+    the class, which parsed the file, and *reason* describes, why the file
+    could not be parsed. If the parse raised an error, the record is
+    marked as *failed*. Files served from the cache are marked as *cached*,
+    duplicates of other files have their path as *duplicate_of*.
+
+    :param path: :class: `str` path to file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parser = None
+        self.cached = False
+        self.duplicate_of = None
+        self.reason = None
+        self.failed = False
+        self.duration = None
+        self.sniff_duration = 0.
+        self.phases = defaultdict(float)
+        self.bytes_read = 0
+
+        self._start_time = time.perf_counter()
+        self._end_time = None
+        # Phases, which are currently timed, with the time spent in their
+        # nested phases
+        self._phase_stack = []
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager recording the time spent in the context as phase
+        *name*, excluding the time of nested phases."""
+        start_time = time.perf_counter()
+        self._phase_stack.append(0.)
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start_time
+            self.phases[name] += duration - self._phase_stack.pop()
+            if self._phase_stack:
+                self._phase_stack[-1] += duration
+
+    def finish(self):
+        """Set the end of the parse of the file."""
+        self._end_time = time.perf_counter()
+        self.duration = self._end_time - self._start_time
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'parser': self.parser,
+            'cached': self.cached,
+            'duplicate_of': self.duplicate_of,
+            'reason': self.reason,
+            'failed': self.failed,
+            'duration': self.duration,
+            'sniff_duration': self.sniff_duration,
+            'phases': dict(self.phases),
+            'bytes_read': self.bytes_read,
+        }
+
+    def __repr__(self):
+        return "ParseRecord({})".format(self.to_dict())
+
+
+class DurationHistogram:
+    """Histogram of durations in buckets of logarithmic width, from which
+    percentiles are estimated. Adding a duration takes constant time, and
+    the memory is bounded by the number of buckets, however many durations
+    are added. An estimated percentile is the upper bound of its bucket,
+    thus, it is at most 1/*BUCKETS_PER_OCTAVE* of an octave too large, but
+    never outside of the range of the added durations.
+    """
+
+    BUCKETS_PER_OCTAVE = 16
+    # Durations below are counted in the bucket of the minimum duration
+    MIN_DURATION = 1e-9
+
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._bucket_counts = defaultdict(int)
+
+    def add(self, duration):
+        """Add the *duration* in seconds."""
+        bucket = math.floor(math.log2(max(duration, self.MIN_DURATION)) * self.BUCKETS_PER_OCTAVE)
+        self._bucket_counts[bucket] += 1
+        self.count += 1
+        self.min = duration if self.min is None else min(self.min, duration)
+        self.max = duration if self.max is None else max(self.max, duration)
+
+    def get_percentile(self, percentile):
+        """Return the estimated *percentile* of the durations, using the
+        nearest rank method, or ``None`` if no duration has been added.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        count = 0
+        for bucket in sorted(self._bucket_counts):
+            count += self._bucket_counts[bucket]
+            if count >= rank:
+                break
+        upper_bound = 2 ** ((bucket + 1) / self.BUCKETS_PER_OCTAVE)
+        return min(max(upper_bound, self.min), self.max)
+
+
+class ParseStatistics:
+    """Collection of :class: `ParseRecord`s of the files parsed by a
+    :class: `SimulationDataItemFactory`, and of the updates of the models of
+    the GUI with the parsed items. The records are aggregated to throughput
+    statistics, which are updated with each record, and returned by
+    :func: `get_summary`. Thus, the statistics of long sessions, eg. of
+    watched directories, are neither recomputed on every update, nor is
+    every record kept. Only the last *max_records* records are kept, which
+    can be dumped as JSON by :func: `dump`.
+
+    :param max_records: :class: `int` maximum number of kept records
+    """
+
+    def __init__(self, max_records=10000):
+        self.records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._reset_aggregates()
+
+    def add(self, record):
+        """Add the finished :class: `ParseRecord` *record*."""
+        with self._lock:
+            self.records.append(record)
+
+            self._file_count += 1
+            self._start_time = min(self._start_time, record._start_time)
+            self._end_time = max(self._end_time, record._end_time)
+            self._duration += record.duration
+            self._bytes_read += record.bytes_read
+            if record.parser is not None and not record.cached and record.duplicate_of is None:
+                self._durations_by_parser[record.parser].add(record.duration)
+            self._cached_count += record.cached
+            self._duplicate_count += record.duplicate_of is not None
+            self._rejected_count += (record.parser is None and not record.failed
+                                     and record.duplicate_of is None)
+            self._failed_count += record.failed
+            for (phase, duration) in record.phases.items():
+                self._phases[phase] += duration
+            self._phases['sniff'] += record.sniff_duration
+
+    def add_model_update(self, item_count, duration):
+        """Record the update of a model with *item_count* items, which took
+        *duration* seconds."""
+        with self._lock:
+            self._model_update_count += 1
+            self._model_update_items += item_count
+            self._model_update_duration += duration
+
+    def clear(self):
+        """Remove all records."""
+        with self._lock:
+            self.records.clear()
+            self._reset_aggregates()
+
+    def get_summary(self):
+        """Return the throughput statistics of all added records. The
+        throughput is computed with respect to the time from the start of
+        the first to the end of the last parse, *wall_time*. Per parser, the
+        median and the 95th percentile of the durations of the files parsed
+        by it are given, see :class: `DurationHistogram`. Files served from
+        the cache and duplicates are not included in the percentiles.
+
+        :rtype: :class: `dict`
+        """
+        with self._lock:
+            wall_time = self._end_time - self._start_time if self._file_count else 0.
+            return {
+                'files': self._file_count,
+                'parsed': sum(durations.count for durations in self._durations_by_parser.values()),
+                'cached': self._cached_count,
+                'duplicates': self._duplicate_count,
+                'rejected': self._rejected_count,
+                'failed': self._failed_count,
+                'wall_time': wall_time,
+                'duration': self._duration,
+                'bytes_read': self._bytes_read,
+                'files_per_second': self._file_count / wall_time if wall_time else 0.,
+                'megabytes_per_second': self._bytes_read / 1e6 / wall_time if wall_time else 0.,
+                'phases': dict(self._phases),
+                'parsers': {
+                    parser: {
+                        'files': durations.count,
+                        'p50': durations.get_percentile(50),
+                        'p95': durations.get_percentile(95),
+                    }
+                    for (parser, durations) in self._durations_by_parser.items()
+                },
+                'model_updates': {
+                    'count': self._model_update_count,
+                    'items': self._model_update_items,
+                    'duration': self._model_update_duration,
+                },
+            }
+
+    def to_dict(self):
+        """Return the summary and the kept records as :class: `dict`, which
+        can be serialized as JSON."""
+        with self._lock:
+            records = list(self.records)
+        return {
+            'summary': self.get_summary(),
+            'files': [record.to_dict() for record in records],
+        }
+
+    def dump(self, path):
+        """Write the summary and the kept records as JSON to the file at
+        *path*."""
+        with open(path, 'w') as statistics_file:
+            json.dump(self.to_dict(), statistics_file, indent=2)
+
+    # Helper Methods
+
+    def _reset_aggregates(self):
+        self._file_count = 0
+        self._start_time = math.inf
+        self._end_time = -math.inf
+        self._duration = 0.
+        self._bytes_read = 0
+        self._cached_count = 0
+        self._duplicate_count = 0
+        self._rejected_count = 0
+        self._failed_count = 0
+        self._phases = defaultdict(float)
+        self._durations_by_parser = defaultdict(DurationHistogram)
+        self._model_update_count = 0
+        self._model_update_items = 0
+        self._model_update_duration = 0.
+
+    def __repr__(self):
+        return "ParseStatistics of {} files".format(self._file_count)
@@ -10,6 +10,8 @@ from PyQt5.uic import loadUiType
 
 
 from rdplot.SimulationDataItem import dict_tree_from_sim_data_items
+from rdplot.SimulationDataItemCache import SimulationDataItemCache
+from rdplot.SimulationDataItemStatistics import format_summary
 from rdplot.Widgets.PlotWidget import PlotWidget
 from rdplot.model import SimDataItemTreeModel, OrderedDictModel, VariableTreeModel, BdTableModel
 from rdplot.view import QRecursiveSelectionModel
@@ -73,6 +75,12 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.actionOpen_Directory_List.triggered.connect(
             self.simDataItemTreeView.add_folder_list
         )
+        self.actionWatch_Directory.triggered.connect(
+            self.simDataItemTreeView.watch_folder
+        )
+        self.actionStop_Watching.triggered.connect(
+            self.simDataItemTreeView.stop_watching
+        )
         self.actionHide_PlotSettings.triggered.connect(
             self.set_plot_settings_visibility
         )
@@ -99,6 +107,22 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.open_about_page
         )
 
+        self.actionShow_Rejected_Files.triggered.connect(
+            self.open_rejected_files
+        )
+
+        self.actionSave_Parse_Statistics.triggered.connect(
+            self.save_parse_statistics
+        )
+
+        # items of changed and removed files of watched directories are removed
+        self.simDataItemTreeView.parserThread.removedData.connect(self.remove_sim_data_items)
+
+        # show the timings of the parsed files in the status widget
+        self.simDataItemTreeView.parserThread.newParsedData.connect(self.update_parse_statistics)
+        self.simDataItemTreeView.parserThread.streamedData.connect(self.update_parse_statistics)
+        self.simDataItemTreeView.parserThread.allParsed.connect(self.update_parse_statistics)
+
         self.variableTreeModel = VariableTreeModel()
         self.variableTreeView.setModel(self.variableTreeModel)
         self.plotsettings.visibilityChanged.connect(self.plot_settings_visibility_changed)
@@ -175,8 +199,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         values = self.selectedSimulationDataItemListModel.values()
         # List call necessary to avoid runtime error because of elements changing
         # during iteration
+        self.remove_sim_data_items(list(values))
+
+    def remove_sim_data_items(self, sim_data_items):
         self._variable_tree_selection_model.selectionChanged.disconnect()
-        self.simDataItemTreeModel.remove(list(values))
+        self.simDataItemTreeModel.remove(sim_data_items)
         self._variable_tree_selection_model.selectionChanged.connect(self.update_plot)
 
     def change_list(self, q_selected, q_deselected):
@@ -388,10 +415,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         header = legend[0]
 
         for plot_data in plot_data_collection:
-            values = ((float(x), float(y)) for (x, y) in plot_data.values)
-
-            sorted_value_pairs = sorted(values, key=lambda pair: pair[0])
-            [xs, ys] = list(zip(*sorted_value_pairs))
+            (xs, ys) = plot_data.get_sorted_values()
 
             # make header
             if plot_data.identifiers[0] not in data_names:
@@ -445,10 +469,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         for plot_data in plot_data_collection:
 
-            values = ((float(x), float(y)) for (x, y) in plot_data.values)
-
-            sorted_value_pairs = sorted(values, key=lambda pair: pair[0])
-            [xs, ys] = list(zip(*sorted_value_pairs))
+            (xs, ys) = plot_data.get_sorted_values()
 
             # make header, important if more than one plot
             if plot_data.identifiers[0] not in data_names:
@@ -553,10 +574,28 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         filename = QtWidgets.QFileDialog.getSaveFileName(self, 'Save RD data as', '.', '*.rd')
         filename = filename[0] + filename[1][1:]
         if not len(filename) == 0:
+            sim_data_items = self.get_selected_simulation_data_items()
+            # The rd file has to contain all data, as the logs might not be
+            # available, when it is loaded. Thus, temporal data, which is
+            # parsed lazily, is parsed now
+            for sim_data_item in sim_data_items:
+                sim_data_item.temporal_data
             f = open(filename, 'w')
-            f.write(jsonpickle.encode(self.get_selected_simulation_data_items()))
+            f.write(jsonpickle.encode(sim_data_items))
             f.close()
 
+    def update_parse_statistics(self):
+        """Shows the summary of the timings of the parsed files"""
+        statistics = self.simDataItemTreeView.parserThread.statistics
+        self.parseStatisticsTextEdit.setPlainText(format_summary(statistics.get_summary()))
+
+    def save_parse_statistics(self):
+        """Saves the timings of all parsed files as json"""
+        filename = QtWidgets.QFileDialog.getSaveFileName(self, 'Save parse statistics as', '.', '*.json')
+        filename = filename[0]
+        if not len(filename) == 0:
+            self.simDataItemTreeView.parserThread.statistics.dump(filename)
+
     def process_cmd_line_args(self, args):
         """Processes cmd line arguments. Those are only pathes or files."""
         for path in args[1:]:
@@ -601,3 +640,41 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             html_error.setText("Error opening about or help")
             html_error.setInformativeText("The html file from the resource could not be loaded.")
             html_error.exec_()
+
+    def open_rejected_files(self):
+        """Opens a dialog listing the files, which have been rejected by all
+        parsers, and are therefore skipped when parsing directories"""
+        cache = SimulationDataItemCache()
+        rejections = cache.get_rejections()
+
+        rejected_files_dialog = QtWidgets.QDialog(self)
+        rejected_files_dialog.setWindowTitle("Rejected Files")
+        rejected_files_dialog.resize(950, 500)
+        layout = QtWidgets.QVBoxLayout(rejected_files_dialog)
+
+        label = QtWidgets.QLabel(
+            "These files could not be parsed by any parser, and are skipped until they change.",
+            rejected_files_dialog)
+        layout.addWidget(label)
+
+        table = QtWidgets.QTableWidget(len(rejections), 3, rejected_files_dialog)
+        table.setHorizontalHeaderLabels(["File", "Reason", "Time Spent [s]"])
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        for row, rejection in enumerate(rejections):
+            table.setItem(row, 0, QtWidgets.QTableWidgetItem(rejection.path))
+            table.setItem(row, 1, QtWidgets.QTableWidgetItem(rejection.reason))
+            table.setItem(row, 2, QtWidgets.QTableWidgetItem("{:.3f}".format(rejection.duration)))
+        table.resizeColumnsToContents()
+        layout.addWidget(table)
+
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Close, rejected_files_dialog)
+        retry_button = buttons.addButton("Try All Files Again", QtWidgets.QDialogButtonBox.ResetRole)
+        buttons.rejected.connect(rejected_files_dialog.close)
+
+        def clear_rejections():
+            cache.clear_rejections()
+            table.setRowCount(0)
+        retry_button.clicked.connect(clear_rejections)
+        layout.addWidget(buttons)
+
+        rejected_files_dialog.exec_()
@@ -148,10 +148,8 @@ class PlotWidget(QWidget, Ui_PlotWidget):
             # Create legend from variable path and sim data items identifiers
             l = legend[plot_count] #" ".join([i for i in plot_data.identifiers] + plot_data.path)
 
-            # Convert list of pairs of strings to two sorted lists of floats
-            values = ((float(x), float(y)) for (x, y) in plot_data.values)
-            sorted_value_pairs = sorted(values, key=lambda pair: pair[0])
-            [xs, ys] = list(zip(*sorted_value_pairs))
+            # Get two sorted sequences of floats
+            (xs, ys) = plot_data.get_sorted_values()
 
             # plot the current plotdata and set the legend
             curve = self.ax.plot(xs, ys, label=l)
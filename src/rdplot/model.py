@@ -726,6 +726,11 @@ class SimDataItemTreeModel(OrderedDictTreeModel):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # Sim data items of the load in progress, and those of them, which are
+        # held back from the tree, see :func: `stream`
+        self._streamed_items = []
+        self._held_items = []
+
     # Implement *add*, *update* and remove to add/remove sim data items to the
     # tree.
     # Note, that *add* is implemented using update, so *items_changed* is
@@ -748,7 +753,77 @@ class SimDataItemTreeModel(OrderedDictTreeModel):
 
         """
 
-        additional_param_found = []
+        additional_params = self._choose_additional_params(sim_data_items)
+        self._insert(sim_data_items, additional_params)
+
+        self.items_changed.emit()
+
+    def stream(self, sim_data_items):
+        """Adds all elements in the iterable *sim_data_items* to the tree, while
+        the files of a load, eg. a directory tree, are still parsed. The
+        additional parameters are chosen once for all elements of the load,
+        see :func: `finish_stream`, thus, the elements are added without them.
+        Elements at the position of a sim data item with a different path are
+        held back until then. Issues the *items_changed* signal.
+
+        :param sim_data_items: Iterable collection of :class: `SimDataItem`s to be added
+        """
+
+        for sim_data_item in sim_data_items:
+            self._streamed_items.append(sim_data_item)
+            item = self.create_path(*sim_data_item.tree_identifier_list)
+            if self._find_ambiguous_value(item, sim_data_item) is None:
+                item.values.add(sim_data_item)
+            else:
+                self._held_items.append(sim_data_item)
+
+        self.items_changed.emit()
+
+    def finish_stream(self):
+        """Finishes the load of the elements added by :func: `stream`, like
+        :func: `update` does for all elements at once. The elements of classes
+        with additional parameters are moved to their position at the tree.
+        The held back elements are added, and raise
+        :class: `AmbiguousSimDataItems`, if their position is still taken.
+        Issues the *items_changed* signal.
+        """
+
+        (sim_data_items, held_items) = (self._streamed_items, self._held_items)
+        self._streamed_items = []
+        self._held_items = []
+
+        try:
+            additional_params = self._choose_additional_params(sim_data_items)
+            moved_items = [item for item in sim_data_items if item.__class__ in additional_params]
+            self._discard(moved_items)
+            self._insert(moved_items, additional_params)
+            self._insert([item for item in held_items if item.__class__ not in additional_params],
+                         additional_params)
+        finally:
+            self.items_changed.emit()
+
+    def remove(self, sim_data_items):
+        """Remove all elements in iterable collection *sim_data_items* from the tree.
+        Emit *items_changed* signal after all sim data items are removed.
+
+        :param sim_data_items: Iterable collection of :class: `SimDataItem`s to be removed
+        """
+
+        self._discard(sim_data_items)
+
+        self.items_changed.emit()
+
+    def _choose_additional_params(self, sim_data_items):
+        """Let the user choose the parameters with varying values of the
+        elements in *sim_data_items*, which are added to the tree below the
+        sequence.
+
+        :param sim_data_items: Iterable collection of :class: `SimDataItem`s
+
+        :rtype: :class: `dict` of the chosen parameters by sim data item class
+        """
+
+        additional_params = {}
 
         all_enc_configs = {}
         diff_dict = {}
@@ -819,18 +894,26 @@ class SimDataItemTreeModel(OrderedDictTreeModel):
                         dialog.exec()
                     for i in range(len(not_chosen_par)):
                         diff_dict[sim_class].pop(not_chosen_par.item(i).text(), None)
-                    additional_param_found.append(sim_class)
+                    additional_params[sim_class] = [chosen_par.item(i).text() for i in range(len(chosen_par))]
 
         except(AttributeError):
             # maybe do something useful here
             # This is for conformance with rd data written out by older versions of rdplot
             pass
 
+        return additional_params
+
+    def _insert(self, sim_data_items, additional_params):
+        """Adds all elements in *sim_data_items* to the tree, with the
+        additional parameters of their class in *additional_params*, see
+        :func: `_choose_additional_params`.
+        """
+
         for sim_data_item in sim_data_items:
 
             has_additional_params = False
-            if sim_data_item.__class__ in additional_param_found:
-                sim_data_item.additional_params = [chosen_par.item(i).text() for i in range(len(chosen_par))]
+            if sim_data_item.__class__ in additional_params:
+                sim_data_item.additional_params = additional_params[sim_data_item.__class__]
                 has_additional_params = True
 
             # Get *item* of the tree corresponding to *sim_data_item*
@@ -838,36 +921,40 @@ class SimDataItemTreeModel(OrderedDictTreeModel):
 
             # This prevents an sim data item overwriting another one
             # with same *tree_identifier_list* but different absolute path
-            for value in item.values:
-                condition = (
-                    value.tree_identifier_list == sim_data_item.tree_identifier_list
-                    and value.path != sim_data_item.path
-                    and not has_additional_params
-                )
-                if condition:
-                    raise AmbiguousSimDataItems((
-                                                    "Ambigious sim data items: Sim Data Item {} and {}"
-                                                    " have different absolute paths but the same"
-                                                    " position at the tree {}"
-                                                ).format(sim_data_item, value, AbstractEncLog.tree_identifier_list))
+            value = self._find_ambiguous_value(item, sim_data_item)
+            if value is not None and not has_additional_params:
+                raise AmbiguousSimDataItems((
+                                                "Ambigious sim data items: Sim Data Item {} and {}"
+                                                " have different absolute paths but the same"
+                                                " position at the tree {}"
+                                            ).format(sim_data_item, value, AbstractEncLog.tree_identifier_list))
             # Add *sim_data_item* to the set of values of the tree item *item*
             item.values.add(sim_data_item)
 
-        self.items_changed.emit()
-
-    def remove(self, sim_data_items):
-        """Remove all elements in iterable collection *sim_data_items* from the tree.
-        Emit *items_changed* signal after all sim data items are removed.
-
-        :param sim_data_items: Iterable collection of :class: `SimDataItem`s to be removed
-        """
+    def _discard(self, sim_data_items):
+        """Remove all elements in *sim_data_items* from the tree, without
+        issuing the *items_changed* signal."""
 
         for sim_data_item in sim_data_items:
             # Get *item* of the tree corresponding to *sim_data_item*
             item = self.create_path(*sim_data_item.tree_identifier_list)
-            self.remove_item(item)
-
-        self.items_changed.emit()
+            # Keep the item, if it holds other sim data items, eg. the new
+            # version of a changed file
+            item.values.discard(sim_data_item)
+            if len(item.values) == 0:
+                self.remove_item(item)
+
+    @staticmethod
+    def _find_ambiguous_value(item, sim_data_item):
+        """Return a sim data item of the tree item *item* with the same
+        *tree_identifier_list* as *sim_data_item*, but a different path, or
+        None."""
+
+        for value in item.values:
+            if (value.tree_identifier_list == sim_data_item.tree_identifier_list
+                    and value.path != sim_data_item.path):
+                return value
+        return None
 
 
 class VariableTreeModel(OrderedDictTreeModel):
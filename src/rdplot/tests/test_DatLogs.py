@@ -1,9 +1,11 @@
 import unittest
+from unittest import mock
 from rdplot.SimulationDataItemClasses import EncoderLogs, DatLogs
 from rdplot.SimulationDataItem import AbstractSimulationDataItem
-from rdplot.SimulationDataItem import SimulationDataItemFactory
+from rdplot.SimulationDataItem import SimulationDataItemFactory, shared_file_contents
 # import SimulationDataItem
 from os import path, listdir
+from tempfile import TemporaryDirectory
 
 # path to test module (this file)
 TEST_DIR = path.dirname(path.abspath(__file__))
@@ -117,7 +119,9 @@ class TestDatLogs(unittest.TestCase):
                                            'V-SPSNR_I', 'Y-CPPSNR', 'U-CPPSNR', 'V-CPPSNR', 'Y-E2EWSPSNR',
                                            'U-E2EWSPSNR',
                                            'V-E2EWSPSNR', 'Y-PSNR_VP0', 'U-PSNR_VP0', 'V-PSNR_VP0', 'Y-PSNR_VP1',
-                                           'U-PSNR_VP1', 'V-PSNR_VP1'])
+                                           'U-PSNR_VP1', 'V-PSNR_VP1', 'Y-CFSPSNR_NN', 'U-CFSPSNR_NN',
+                                           'V-CFSPSNR_NN', 'Y-CFSPSNR_I', 'U-CFSPSNR_I', 'V-CFSPSNR_I',
+                                           'Y-CFCPPPSNR', 'U-CFCPPPSNR', 'V-CFCPPPSNR'])
 
                     # check structure of summary data dict
                     # any stream will have at least summary and intra pictures:
@@ -246,5 +250,69 @@ class TestDatLogs(unittest.TestCase):
                 print('Can parse %s with %s' % (log_path, type(cls_list[0])))
 
 
+    def test_xml_is_parsed_once_per_log(self):
+        dat_log_dir = path.join(TEST_DIR, 'test_logs/exampleDatLogDirs/JEM-7.0-360Lib-4.0')
+        for log_path in [path.join(dat_log_dir, log) for log in listdir(dat_log_dir)]:
+            with self.subTest(log_path=log_path):
+                # the probes of all dat log classes and the constructor share one parse of the xml
+                with mock.patch('rdplot.SimulationDataItemClasses.DatLogs.parse_dat_log',
+                                side_effect=DatLogs.parse_dat_log) as mocked_parse:
+                    items = self._factory.create_item_from_file(log_path)
+                self.assertEqual(mocked_parse.call_count, 1)
+                self.assertEqual([type(item) for item in items], [DatLogs.DatLogJEM501_360])
+
+                item = items[0]
+                self.assertEqual(item.qp, item.sim_data['QP']['Value'])
+                self.assertIn('JEM501_360', item.sim_data['Codec']['Value'])
+                self.assertIn('Rate', item.sim_data)
+                self.assertNotIn('Rate', item.summary_data)
+                for (key, values) in item.summary_data.items():
+                    self.assertEqual(values, [(float(item.sim_data['Rate']['Value']),
+                                               float(item.sim_data[key]['Value']))])
+
+    def test_codec_is_sniffed_from_head(self):
+        dat_log_dir = path.join(TEST_DIR, 'test_logs/exampleDatLogDirs/JEM-7.0-360Lib-4.0')
+        dat_classes = [cls for cls in self._factory._classes if issubclass(cls, DatLogs.DatLogBasedOnClassName)]
+        for log_path in [path.join(dat_log_dir, log) for log in listdir(dat_log_dir)]:
+            with self.subTest(log_path=log_path):
+                # the probes only parse the head of the log
+                with mock.patch('rdplot.SimulationDataItemClasses.DatLogs.parse_dat_log') as mocked_parse, \
+                        shared_file_contents():
+                    accepting_classes = [cls for cls in dat_classes if cls.can_parse_file(log_path)]
+                mocked_parse.assert_not_called()
+                self.assertEqual(accepting_classes, [DatLogs.DatLogJEM501_360])
+
+                # the factory sniffs the codec once, and looks up the class
+                with mock.patch.object(DatLogs.DatLogBasedOnClassName, 'sniff_dispatch_key',
+                                       side_effect=DatLogs.DatLogBasedOnClassName.sniff_dispatch_key) as mocked_sniff:
+                    items = self._factory.create_item_from_file(log_path)
+                self.assertEqual(mocked_sniff.call_count, 1)
+                self.assertEqual([type(item) for item in items], [DatLogs.DatLogJEM501_360])
+
+    def test_codec_after_head_is_parsed(self):
+        with TemporaryDirectory() as directory:
+            log_path = path.join(directory, 'late_codec.xml')
+            with open(log_path, 'w') as log_file:
+                log_file.write('<Logfile>\n<!-- {} -->\n'.format('x' * DatLogs.DatLogHEVC.sniff_head_size))
+                log_file.write('<Codec><Value>HEVC</Value></Codec>\n<QP><Value>22</Value></QP>\n</Logfile>\n')
+            with shared_file_contents():
+                self.assertIsNone(DatLogs.sniff_dat_log_codec(
+                    open(log_path, 'rb').read(DatLogs.DatLogHEVC.sniff_head_size)))
+                self.assertEqual(DatLogs.DatLogHEVC.sniff_dispatch_key(log_path), 'HEVC')
+                self.assertTrue(DatLogs.DatLogHEVC.can_parse_file(log_path))
+                self.assertFalse(DatLogs.DatLogJEM501_360.can_parse_file(log_path))
+
+    def test_invalid_xml_is_not_parsed(self):
+        with TemporaryDirectory() as directory:
+            for (name, text) in [('broken.xml', '<Logfile><Codec><Value>HEVC'),
+                                 ('other_root.xml', '<Other><Codec><Value>HEVC</Value></Codec></Other>'),
+                                 ('no_codec.xml', '<Logfile><QP><Value>22</Value></QP></Logfile>')]:
+                log_path = path.join(directory, name)
+                with open(log_path, 'w') as log_file:
+                    log_file.write(text)
+                with self.subTest(log_path=log_path), shared_file_contents():
+                    self.assertFalse(DatLogs.DatLogHEVC.can_parse_file(log_path))
+
+
 if __name__ == '__main__':
     unittest.main()
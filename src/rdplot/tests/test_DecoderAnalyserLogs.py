@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+from rdplot.SimulationDataItemClasses import DecoderAnalyserLogs
+from rdplot.SimulationDataItem import SimulationDataItemFactory, SimulationDataItemError, dict_tree_from_sim_data_items
+from os import path
+from tempfile import TemporaryDirectory
+import numpy as np
+
+# path to test module (this file)
+TEST_DIR = path.dirname(path.abspath(__file__))
+
+# Path to the folder containing simulation data sub classes. The classes
+# are loaded by the simulation data item factory and used for parsing files
+SIMULATION_DATA_ITEM_CLASSES_PATH = path.normpath(path.join(TEST_DIR, '../SimulationDataItemClasses'))
+
+
+class TestDecoderAnalyserLogs(unittest.TestCase):
+    def setUp(self):
+        self._factory = SimulationDataItemFactory.from_path(
+            SIMULATION_DATA_ITEM_CLASSES_PATH
+        )
+
+    @staticmethod
+    def _write_decoder_analyser_log(log_path, statistics):
+        """Write a decoder log of HM with the decoder statistics, given as
+        tuples of name, separator, width, type and the counters."""
+        with open(log_path, 'w') as log_file:
+            log_file.write('\nHM software: Decoder Version [16.15] (including RExt)[Linux][GCC 7.3.0][64 bit]\n')
+            log_file.write('POC    0 TId: 0 ( I-SLICE, QP 27 ) [DT  0.012 ] [L0 ] [L1 ] [:,(unk)]\n')
+            log_file.write('\n %-45s-   Width   Type  CABAC Count ... ( Total bytes)\n' % 'Decoder statistics')
+            for (name, separator, width, statistic_type, counters) in statistics:
+                log_file.write('%c%-45s%c  %6s %6s %12d %12d %12d %12d %12d %12d %12d (%12d)%c\n' % (
+                    '[' if separator == '~' else ' ', name, separator, width, statistic_type, *counters,
+                    counters[-1] // 8, ']' if separator == '~' else ' '))
+
+    def test_parsing_of_decoder_analyser_logs(self):
+        with TemporaryDirectory() as log_dir:
+            log_path = path.join(log_dir, 'BasketballDrive_1920x1080_QP27_dec.log')
+            self._write_decoder_analyser_log(log_path, [
+                ('SKIP_FLAG', ':', '-', '-', [10, 20, 30, 0, 0, 0, 30]),
+                ('SKIP_FLAG', ':', '8', 'Y', [1, 2, 3, 0, 0, 0, 3]),
+                ('COEFFS', ':', '16', 'Cb', [4, 5, 6, 7, 8, 9, 15]),
+                ('TOTAL', '~', '-', '-', [14, 25, 36, 7, 8, 9, 45]),
+            ])
+            # counters in exponent form or not a number are parsed, lines with other separators are not
+            with open(log_path, 'a') as log_file:
+                log_file.write(' LARGE  :  32  Cr  1e+06  -nan  inf  0  0  0  2.5E-3 (  0)\n')
+                log_file.write(' EQUALS =  32  Cr  1  2  3  0  0  0  3 (  0)\n')
+                log_file.write(' TILDE  ~  -  -  1  2  3  0  0  0  3 (  0)\n')
+
+            items = self._factory.create_item_from_file(log_path)
+            self.assertEqual([type(item) for item in items], [DecoderAnalyserLogs.DecAnalyserLogHM])
+            item = items[0]
+
+            # the bySize and byType lines are part of the analyser data, too
+            self.assertEqual(item.analyser_data['Y']['8']['SKIP_FLAG']['CABAC bits'], [('27', 3.)])
+            self.assertEqual(item.analyser_data['Cb']['16']['COEFFS']['EP Sum'], [('27', 8.)])
+            self.assertEqual(item.analyser_data['Total']['TOTAL']['Total bytes'], [('27', 5.)])
+
+            statistics = item.analyser_statistics
+            self.assertEqual((statistics.names, statistics.widths, statistics.types),
+                             (['SKIP_FLAG', 'COEFFS', 'LARGE'], ['-', '8', '16', '32'], ['-', 'Y', 'Cb', 'Cr']))
+            self.assertEqual(statistics.values.shape, (3, 4, 4, len(DecoderAnalyserLogs.DecoderStatistics.COUNTERS)))
+            np.testing.assert_array_equal(statistics.get('LARGE', '32', 'Cr'), [1e6, np.nan, np.inf, 0, 0, 0, 2.5e-3, 0])
+            self.assertEqual(item.analyser_data['Cr']['32'], {'LARGE': item.analyser_data['Cr']['32']['LARGE']})
+            self.assertEqual(list(item.analyser_data['Total']), ['TOTAL'])
+            np.testing.assert_array_equal(statistics.get('SKIP_FLAG', '8', 'Y'), [1, 2, 3, 0, 0, 0, 3, 0])
+            self.assertTrue(np.isnan(statistics.get('COEFFS', '8', 'Y')).all())
+            np.testing.assert_array_equal(item.analyser_totals.get('TOTAL'), [14, 25, 36, 7, 8, 9, 45, 5])
+
+    def test_aggregation_of_decoder_analyser_statistics(self):
+        with TemporaryDirectory() as log_dir:
+            for (sequence, qp) in [('BasketballDrive', 22), ('BasketballDrive', 27), ('Cactus', 22), ('Cactus', 37)]:
+                statistics = [('SKIP_FLAG', ':', '8', 'Y', [qp, 1, 2, 0, 0, 0, 2]),
+                              ('TOTAL', '~', '-', '-', [qp, 2, 4, 0, 0, 0, 4])]
+                if sequence == 'Cactus' and qp == 37:
+                    statistics.append(('COEFFS', ':', '16', 'Cb', [qp, 5, 6, 7, 8, 9, 15]))
+                self._write_decoder_analyser_log(
+                    path.join(log_dir, '{}_1920x1080_QP{}_dec.log'.format(sequence, qp)), statistics)
+            items = self._factory.create_item_list_from_directory(log_dir)
+
+            stack = DecoderAnalyserLogs.DecoderStatisticsStack(items)
+            self.assertEqual([sequence for (sequence, _) in stack.groups], ['BasketballDrive', 'Cactus'])
+            np.testing.assert_array_equal(stack.qps, [22, 27, 37])
+            self.assertEqual(stack.values.shape, (2, 3, len(stack.keys)))
+            statistic = stack.keys.index(('Y', '8', 'SKIP_FLAG', 'CABAC Count'))
+            np.testing.assert_array_equal(stack.values[:, :, statistic], [[22, 27, np.nan], [22, np.nan, 37]])
+
+            # the aggregated tree equals the one merged item by item
+            dict_tree = dict_tree_from_sim_data_items(items)
+            with mock.patch.object(DecoderAnalyserLogs.DecAnalyserLogHM, 'aggregate_data', return_value=None):
+                merged_dict_tree = dict_tree_from_sim_data_items(items)
+
+            def get_leaves(tree, keys=()):
+                if isinstance(tree, dict):
+                    for (key, sub_tree) in tree.items():
+                        yield from get_leaves(sub_tree, keys + (key,))
+                else:
+                    yield (keys, [(plot_data.identifiers, plot_data.path, plot_data.label,
+                                   [list(values) for values in plot_data.get_sorted_values()])
+                                  for plot_data in tree])
+
+            self.assertEqual(dict(get_leaves(dict_tree)), dict(get_leaves(merged_dict_tree)))
+            [skip_flag_plot_data, _] = dict_tree['Analyser']['Y']['8']['SKIP_FLAG']['CABAC Count']
+            self.assertEqual(list(skip_flag_plot_data.values), [(22, 22.), (27, 27.)])
+
+            # QPs, which are not integers, are kept
+            items[0].qp = 22.5
+            stack = DecoderAnalyserLogs.DecoderStatisticsStack(items)
+            np.testing.assert_array_equal(stack.qps, [22, 22.5, 27, 37])
+            self.assertEqual(list(stack.get_series(0, statistic)), [(22.5, 22.), (27., 27.)])
+            items[0].qp = 22.
+
+            # the statistics of simulations given twice are merged item by item, keeping all values
+            items = items + self._factory.create_item_from_file(path.join(log_dir, 'Cactus_1920x1080_QP22_dec.log'))
+            with self.assertRaises(SimulationDataItemError):
+                DecoderAnalyserLogs.DecoderStatisticsStack(items)
+            self.assertIsNone(DecoderAnalyserLogs.DecAnalyserLogHM.aggregate_data(items))
+            [_, skip_flag_plot_data] = dict_tree_from_sim_data_items(items)['Analyser']['Y']['8']['SKIP_FLAG'][
+                'CABAC Count']
+            self.assertEqual([list(values) for values in skip_flag_plot_data.get_sorted_values()],
+                             [[22., 22., 37.], [22., 22., 37.]])
+
+
+if __name__ == '__main__':
+    unittest.main()
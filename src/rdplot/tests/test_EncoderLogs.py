@@ -1,9 +1,15 @@
+import re
 import unittest
+from unittest import mock
 from rdplot.SimulationDataItemClasses import EncoderLogs, DatLogs
 from rdplot.SimulationDataItem import AbstractSimulationDataItem
-from rdplot.SimulationDataItem import SimulationDataItemFactory
+from rdplot.SimulationDataItem import (SimulationDataItemFactory, TemporalSeries, PlotData, FileContentProvider,
+                                      COMPRESSED_FILE_OPENERS, strip_compression_suffix)
 # import SimulationDataItem
 from os import path, listdir
+from tempfile import TemporaryDirectory
+import jsonpickle
+import numpy as np
 
 # path to test module (this file)
 TEST_DIR = path.dirname(path.abspath(__file__))
@@ -117,7 +123,9 @@ class TestEncoderLogs(unittest.TestCase):
                                            'V-SPSNR_I', 'Y-CPPSNR', 'U-CPPSNR', 'V-CPPSNR', 'Y-E2EWSPSNR',
                                            'U-E2EWSPSNR',
                                            'V-E2EWSPSNR', 'Y-PSNR_VP0', 'U-PSNR_VP0', 'V-PSNR_VP0', 'Y-PSNR_VP1',
-                                           'U-PSNR_VP1', 'V-PSNR_VP1'])
+                                           'U-PSNR_VP1', 'V-PSNR_VP1', 'Y-CFSPSNR_NN', 'U-CFSPSNR_NN',
+                                           'V-CFSPSNR_NN', 'Y-CFSPSNR_I', 'U-CFSPSNR_I', 'V-CFSPSNR_I',
+                                           'Y-CFCPPPSNR', 'U-CFCPPPSNR', 'V-CFCPPPSNR'])
 
                     # check structure of summary data dict
                     # any stream will have at least summary and intra pictures:
@@ -254,6 +262,248 @@ class TestEncoderLogs(unittest.TestCase):
                 self.assertTrue(can_parse_file)
                 print('Can parse %s with %s' % (log_path, type(cls_list[0])))
 
+    def test_summary_only_parse(self):
+        for log_path in self.log_paths:
+            if not log_path.endswith('enc.log'):
+                continue
+            with self.subTest(log=log_path):
+                items = self._factory.create_item_from_file(log_path)
+                if not items:
+                    continue
+                item = type(items[0])(log_path, summary_only=False)
+
+                # only the header and the summary are read, not the whole log
+                with mock.patch('rdplot.SimulationDataItem.FileContentProvider.read_text') as read_text:
+                    summary_item = type(item)(log_path, summary_only=True)
+                    read_text.assert_not_called()
+                    self.assertIsNone(summary_item._temporal_data)
+
+                    # the temporal data is parsed on first access from the body of the log
+                    self.assertEqual(item.temporal_data, summary_item.temporal_data)
+                    read_text.assert_not_called()
+
+                self.assertEqual(item.sequence, summary_item.sequence)
+                self.assertEqual(getattr(item, 'encoder_config', None), getattr(summary_item, 'encoder_config', None))
+                # compare representations, as NaN values in the summaries do not compare equal
+                self.assertEqual(repr(item.summary_data), repr(summary_item.summary_data))
+
+                # dropped temporal data is parsed again
+                self.assertTrue(summary_item.drop_temporal_data())
+                self.assertIsNone(summary_item._temporal_data)
+                self.assertEqual(item.temporal_data, summary_item.temporal_data)
+
+    def test_summary_only_parse_of_crlf_logs(self):
+        # logs written on Windows are parsed like the ones written on Linux
+        for log_path in self.log_paths:
+            if not log_path.endswith('enc.log'):
+                continue
+            with self.subTest(log=log_path), TemporaryDirectory() as log_dir:
+                with open(log_path, 'rb') as log_file:
+                    log_data = log_file.read().replace(b'\r\n', b'\n')
+                crlf_log_path = path.join(log_dir, path.basename(log_path))
+                with open(crlf_log_path, 'wb') as log_file:
+                    log_file.write(log_data.replace(b'\n', b'\r\n'))
+
+                [item] = self._factory.create_item_from_file(log_path)
+                [crlf_item] = self._factory.create_item_from_file(crlf_log_path)
+                self.assertIs(type(crlf_item), type(item))
+                self.assertTrue(crlf_item._summary_only)
+                self.assertEqual(crlf_item.sequence, item.sequence)
+                self.assertEqual(getattr(crlf_item, 'encoder_config', None), getattr(item, 'encoder_config', None))
+                self.assertEqual(repr(crlf_item.summary_data), repr(item.summary_data))
+                self.assertEqual(crlf_item.temporal_data, item.temporal_data)
+
+    def test_temporal_data_is_numeric(self):
+        for log_path in self.log_paths:
+            if not log_path.endswith('enc.log'):
+                continue
+            with self.subTest(log=log_path):
+                items = self._factory.create_item_from_file(log_path)
+                if not items:
+                    continue
+                temporal_data = items[0].temporal_data
+                # SHM logs have one dict of series per layer
+                series_dicts = list(temporal_data.values()) if isinstance(items[0], EncoderLogs.EncLogSHM) \
+                    else [temporal_data]
+                for series_dict in series_dicts:
+                    for series in series_dict.values():
+                        self.assertIsInstance(series, TemporalSeries)
+                        self.assertEqual(series.frames.dtype, np.int32)
+                        self.assertEqual(series.values.dtype, np.float64)
+                        self.assertEqual(list(series.frames), list(range(len(series))))
+
+                        # the series is still a sequence of pairs, which can be plotted
+                        for (frame, value) in series:
+                            self.assertIsInstance(frame, int)
+                            self.assertIsInstance(value, float)
+                        (xs, ys) = PlotData([], series, [], None).get_sorted_values()
+                        self.assertEqual(list(ys), list(series.values))
+
+                        # series are written to .rd files as plain lists
+                        self.assertEqual(jsonpickle.decode(jsonpickle.encode(series)), series)
+
+    def test_temporal_columns_of_360lib_logs(self):
+        # the columns are derived from the labels of the groups of any layout
+        line = ('POC    0 TId: 0 ( I-SLICE, nQP 19 QP 19 )    4902520 bits [Y 44.4919 dB    U 48.2435 dB    '
+                'V 47.6260 dB] [Y-PSNR_DYN_VP0 44.9865 dB   U-PSNR_DYN_VP0 49.4938 dB   V-PSNR_DYN_VP0 48.8632 dB] '
+                '[ET    74 ] [L0 ] [L1 ]')
+        columns = EncoderLogs.EncLogHM360Lib._get_temporal_columns(line)
+        self.assertEqual([name for (name, _) in columns],
+                         ['Frames', 'Bits', 'ET', 'Y-PSNR', 'U-PSNR', 'V-PSNR',
+                          'Y-PSNR_DYN_VP0', 'U-PSNR_DYN_VP0', 'V-PSNR_DYN_VP0'])
+        tokens = line.split()
+        self.assertEqual([tokens[index] for (_, index) in columns],
+                         ['0', '4902520', '74', '44.4919', '48.2435', '47.6260', '44.9865', '49.4938', '48.8632'])
+
+    def test_temporal_data_of_360lib_logs(self):
+        # the values of the second and the last frame, as parsed by the
+        # verbose regular expression of older versions
+        expected_values = {
+            'HM-16.5-360Lib-CMP-AerialCity_3840x1920_QP22_enc.log': {
+                1: {'Frames': 16, 'Bits': 1708872, 'Y-PSNR': 41.7088, 'U-SPSNR_NN': 46.3202, 'V-WSPSNR': 44.8695,
+                    'Y-SPSNR_I': 41.3792, 'U-CPPSNR': 46.4193, 'V-E2EWSPSNR': 44.8619, 'Y-PSNR_VP0': 42.9248,
+                    'V-PSNR_VP1': 45.9843, 'ET': 237},
+                300: {'Frames': 299, 'Bits': 24752, 'Y-PSNR': 40.1774, 'U-SPSNR_NN': 46.0103, 'V-WSPSNR': 44.5415,
+                      'Y-SPSNR_I': 40.0592, 'U-CPPSNR': 46.0719, 'V-E2EWSPSNR': 44.5344, 'Y-PSNR_VP0': 41.3812,
+                      'V-PSNR_VP1': 45.8915, 'ET': 107},
+            },
+            'HM-16.5-360Lib-ERP-DrivingInCountry_3840x1920_QP37_enc.log': {
+                1: {'Frames': 16, 'Bits': 229352, 'Y-PSNR': 33.8301, 'U-SPSNR_NN': 43.1146, 'V-WSPSNR': 44.1738,
+                    'Y-SPSNR_I': 32.9194, 'U-CPPSNR': 43.1610, 'V-E2EWSPSNR': 44.1644, 'Y-PSNR_VP0': 32.3302,
+                    'V-PSNR_VP1': 43.8710, 'ET': 193},
+                300: {'Frames': 299, 'Bits': 13448, 'Y-PSNR': 31.3971, 'U-SPSNR_NN': 42.9197, 'V-WSPSNR': 44.1972,
+                      'Y-SPSNR_I': 30.8598, 'U-CPPSNR': 42.9351, 'V-E2EWSPSNR': 44.1872, 'Y-PSNR_VP0': 35.1448,
+                      'V-PSNR_VP1': 43.3340, 'ET': 98},
+            },
+        }
+        legacy_keys = ['Frames', 'Bits', 'ET']
+        for metric in ('PSNR', 'SPSNR_NN', 'WSPSNR', 'SPSNR_I', 'CPPSNR', 'E2EWSPSNR', 'PSNR_VP0', 'PSNR_VP1'):
+            legacy_keys += [component + '-' + metric for component in 'YUV']
+        cf_keys = [component + '-' + metric for metric in ('CFSPSNR_NN', 'CFSPSNR_I', 'CFCPPPSNR')
+                   for component in 'YUV']
+
+        log_dir = path.join(TEST_DIR, 'test_logs', 'examplesForDifferentVersions', 'HM360Lib')
+        for (log_name, frame_values) in expected_values.items():
+            with self.subTest(log=log_name):
+                item = EncoderLogs.EncLogHM360Lib(path.join(log_dir, log_name), summary_only=False)
+                temporal_data = item.temporal_data
+                self.assertCountEqual(temporal_data.keys(), legacy_keys + cf_keys)
+
+                for (key, series) in temporal_data.items():
+                    self.assertEqual([frame for (frame, _) in series], list(range(301)), key)
+                for (index, values) in frame_values.items():
+                    for (key, value) in values.items():
+                        self.assertAlmostEqual(temporal_data[key][index][1], value, places=4, msg=key)
+
+    def test_compressed_logs(self):
+        self.assertEqual(strip_compression_suffix('/logs/x_enc.log.gz'), '/logs/x_enc.log')
+        self.assertEqual(strip_compression_suffix('/logs/x_enc.log'), '/logs/x_enc.log')
+
+        with TemporaryDirectory() as directory:
+            for log_path in self.log_paths:
+                items = self._factory.create_item_from_file(log_path)
+                if not items or not log_path.endswith('enc.log'):
+                    continue
+                with open(log_path, 'rb') as log_file:
+                    log_data = log_file.read()
+
+                for (suffix, open_compressed) in COMPRESSED_FILE_OPENERS.items():
+                    with self.subTest(log=log_path, suffix=suffix):
+                        compressed_path = path.join(directory, path.basename(log_path) + suffix)
+                        with open_compressed(compressed_path, 'wb') as compressed_file:
+                            compressed_file.write(log_data)
+
+                        # compressed logs are parsed like the uncompressed ones,
+                        # also if their frames are scanned in small blocks
+                        compressed_items = self._factory.create_item_from_file(compressed_path)
+                        self.assertEqual(len(compressed_items), 1)
+                        self.assertIs(type(compressed_items[0]), type(items[0]))
+                        self.assertEqual(compressed_items[0].sequence, items[0].sequence)
+                        self.assertEqual(getattr(compressed_items[0], 'encoder_config', None),
+                                         getattr(items[0], 'encoder_config', None))
+                        self.assertEqual(repr(compressed_items[0].summary_data), repr(items[0].summary_data))
+                        with mock.patch.multiple('rdplot.SimulationDataItem', SCAN_BLOCK_SIZE=4096,
+                                                 SCAN_OVERLAP_SIZE=1024):
+                            self.assertEqual(compressed_items[0].temporal_data, items[0].temporal_data)
+
+    def test_following_of_running_logs(self):
+        hm_log_dir = path.join(TEST_DIR, 'test_logs', 'examplesForDifferentVersions', 'HM')
+        for (file_name, line_break) in [(name, line_break) for name in sorted(listdir(hm_log_dir))
+                                        for line_break in (b'\n', b'\r\n')]:
+            log_path = path.join(hm_log_dir, file_name)
+            with open(log_path, 'rb') as log_file:
+                log_data = log_file.read().replace(b'\r\n', b'\n').replace(b'\n', line_break)
+            parsed_item = EncoderLogs.EncLogHM(log_path, summary_only=False)
+
+            # blocks cut the line breaks of logs written on Windows, too
+            with self.subTest(log=file_name, line_break=line_break), TemporaryDirectory() as log_dir:
+                running_log_path = path.join(log_dir, file_name)
+                # the encoder has written the config and the first frame
+                offset = log_data.index(b'\n', log_data.index(b'\nPOC') + 1) + 1
+                with open(running_log_path, 'wb') as log_file:
+                    log_file.write(log_data[:offset])
+                self.assertEqual(self._factory.create_item_from_file(running_log_path), [])
+                (item,) = self._factory.create_running_item_from_file(running_log_path)
+                self.assertTrue(item.is_running)
+                self.assertEqual(item.sequence, parsed_item.sequence)
+                self.assertEqual(item.encoder_config['QP'], parsed_item.encoder_config['QP'])
+                self.assertEqual(len(item.temporal_data['Frames']), 1)
+                self.assertFalse(item.refresh())
+
+                # lines are appended in blocks, which cut lines
+                temporal_data = item.temporal_data
+                appended_size = len(log_data) - offset
+                with mock.patch.object(FileContentProvider, 'read_lines', autospec=True,
+                                       side_effect=FileContentProvider.read_lines) as read_lines:
+                    while offset < len(log_data):
+                        with open(running_log_path, 'ab') as log_file:
+                            log_file.write(log_data[offset:offset + 1000])
+                        offset += 1000
+                        item.refresh()
+                # only the appended bytes and the cut lines are read again
+                read_size = sum(end - start for ((_, _, start, end), _) in read_lines.call_args_list)
+                self.assertLess(read_size, 1.5 * appended_size)
+
+                # the temporal data is updated in place, the summary once the encoder has finished
+                self.assertFalse(item.is_running)
+                self.assertIs(item.temporal_data, temporal_data)
+                self.assertEqual(item.temporal_data, parsed_item.temporal_data)
+                self.assertEqual(item.summary_data, parsed_item.summary_data)
+                self.assertEqual(item.encoder_config, parsed_item.encoder_config)
+                self.assertFalse(item.refresh())
+
+    def test_parsing_of_shm_logs_with_three_layers(self):
+        log_dir = path.join(TEST_DIR, 'test_logs', 'examplesForDifferentVersions', 'SHM')
+        log_name = sorted(listdir(log_dir))[0]
+        with open(path.join(log_dir, log_name)) as log_file:
+            log_text = log_file.read()
+        # add a third layer, copying the frames and the summaries of the second one
+        log_text = re.sub(r'^(POC .* LId: )1( .*)$', r'\g<0>\n\g<1>2\g<2>', log_text, flags=re.M)
+        log_text = re.sub(r'^  L1( .*)$', r'\g<0>\n  L2\g<1>', log_text, flags=re.M)
+
+        with TemporaryDirectory() as directory:
+            log_path = path.join(directory, log_name)
+            with open(log_path, 'w') as log_file:
+                log_file.write(log_text)
+            shm_log = EncoderLogs.EncLogSHM(path.join(log_dir, log_name))
+            item = EncoderLogs.EncLogSHM(log_path)
+
+            temporal_data = item.temporal_data
+            self.assertEqual(list(temporal_data), ['layer 0', 'layer 1', 'layer 2'])
+            for layer in ['layer 0', 'layer 1']:
+                for (name, series) in temporal_data[layer].items():
+                    self.assertEqual(list(series), list(shm_log.temporal_data[layer][name]))
+            self.assertEqual(list(temporal_data['layer 2']['Bits']), list(temporal_data['layer 1']['Bits']))
+
+            summary = item.summary_data['SUMMARY']
+            self.assertEqual(set(summary), {'layer 0', 'layer 1', 'layer 2', 'layer 1 + 2'})
+            rates = [summary['layer ' + str(layer)]['Bitrate'][0][0] for layer in range(3)]
+            self.assertAlmostEqual(summary['layer 1 + 2']['Bitrate'][0][0], sum(rates))
+            self.assertEqual(summary['layer 1 + 2']['Y-PSNR'][0][1], summary['layer 2']['Y-PSNR'][0][1])
+            self.assertEqual(summary['layer 2']['Total Time'][0][1], summary['layer 0']['Total Time'][0][1])
+            # layers without frames of a slice type have zero rate and values
+            self.assertEqual(item.summary_data['I']['layer 2']['Y-PSNR'], [(0., 0.)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,332 @@
+import re
+import shutil
+import tarfile
+import unittest
+import zipfile
+from unittest import mock
+from rdplot.SimulationDataItemClasses import EncoderLogs, DatLogs
+from rdplot.SimulationDataItem import (SimulationDataItemFactory, SimulationDataItemError, TemporalSeries,
+                                      FileContentProvider, ARCHIVE_MEMBER_SEPARATOR, DuplicateFileIndex,
+                                      DirectoryWatcher, walk_files)
+from os import path, listdir, makedirs, link, symlink
+from tempfile import TemporaryDirectory
+
+# path to test module (this file)
+TEST_DIR = path.dirname(path.abspath(__file__))
+
+# Path to the folder containing simulation data sub classes. The classes
+# are loaded by the simulation data item factory and used for parsing files
+SIMULATION_DATA_ITEM_CLASSES_PATH = path.normpath(path.join(TEST_DIR, '../SimulationDataItemClasses'))
+
+
+class TestSimulationDataItem(unittest.TestCase):
+    def setUp(self):
+        self._factory = SimulationDataItemFactory.from_path(
+            SIMULATION_DATA_ITEM_CLASSES_PATH
+        )
+        test_log_path = path.join(TEST_DIR, 'test_logs/examplesForDifferentVersions')
+        # list contents of directory, might include files
+        files_and_folders_here = listdir(test_log_path)
+        files_and_folders_here = [path.join(test_log_path, file_or_folder) for file_or_folder in files_and_folders_here]
+        # remove files from list, we only want the log directories
+        self.tested_log_dirs = [item for item in files_and_folders_here if path.isdir(item)]
+
+        # build list of log files
+        self.log_paths = []
+        for log_dir in self.tested_log_dirs:
+            logs = listdir(log_dir)
+            self.log_paths += [path.join(log_dir, log) for log in logs]
+
+    def test_archives(self):
+        with TemporaryDirectory() as directory:
+            tar_path = path.join(directory, 'logs.tar.gz')
+            zip_path = path.join(directory, 'logs.zip')
+            with tarfile.open(tar_path, 'w:gz') as tar_file, zipfile.ZipFile(zip_path, 'w') as zip_file:
+                for log_path in self.log_paths:
+                    member_name = path.relpath(log_path, path.dirname(path.dirname(log_path)))
+                    tar_file.add(log_path, member_name)
+                    zip_file.write(log_path, member_name)
+
+            items = {}
+            for log_dir in self.tested_log_dirs:
+                for item in self._factory.create_item_list_from_directory(log_dir):
+                    items[path.relpath(item.path, path.dirname(log_dir))] = item
+
+            for archive_path in (tar_path, zip_path):
+                with self.subTest(archive=archive_path):
+                    # the members are parsed in one pass, without extracting them,
+                    # thus, the temporal data has to be available without reading
+                    # the archive again
+                    with mock.patch('rdplot.SimulationDataItem.read_archive_member') as read_archive_member:
+                        archive_items = self._factory.create_item_list_from_path(archive_path)
+                        for archive_item in archive_items:
+                            getattr(archive_item, 'temporal_data', None)
+                        read_archive_member.assert_not_called()
+
+                    self.assertEqual(len(archive_items), len(items))
+                    for archive_item in archive_items:
+                        (item_archive_path, member_name) = archive_item.path.split(ARCHIVE_MEMBER_SEPARATOR)
+                        self.assertEqual(item_archive_path, archive_path)
+                        item = items[member_name]
+                        self.assertIs(type(archive_item), type(item))
+                        self.assertEqual(archive_item.config, path.dirname(archive_item.path))
+                        self.assertEqual(archive_item.sequence, item.sequence)
+                        self.assertEqual(repr(archive_item.summary_data), repr(item.summary_data))
+                        self.assertEqual(getattr(archive_item, 'temporal_data', None),
+                                         getattr(item, 'temporal_data', None))
+
+    def test_duplicate_files(self):
+        log_dir = path.join(TEST_DIR, 'test_logs', 'examplesForDifferentVersions', 'HM')
+        log_names = sorted(listdir(log_dir))
+        with TemporaryDirectory() as directory:
+            for sub_dir in ['copies', 'hard_links', 'links', 'original']:
+                makedirs(path.join(directory, sub_dir))
+            for log_name in log_names:
+                original_path = path.join(directory, 'original', log_name)
+                shutil.copy(path.join(log_dir, log_name), original_path)
+                shutil.copy(original_path, path.join(directory, 'copies', log_name))
+                shutil.copy(original_path, path.join(directory, 'original', 'copy_' + log_name))
+                symlink(original_path, path.join(directory, 'links', log_name))
+                link(original_path, path.join(directory, 'hard_links', log_name))
+
+            # the original logs are parsed once, their copies and links share the data,
+            # but duplicates in the same directory would be ambiguous, and are skipped
+            with mock.patch.object(self._factory, 'create_item_from_file',
+                                   side_effect=self._factory.create_item_from_file) as create_item_from_file:
+                items = list(self._factory.iter_item_lists_from_path(directory, interval=float('inf')))[0]
+            self.assertEqual(create_item_from_file.call_count, len(log_names))
+
+            items_by_path = {path.relpath(item.path, directory): item for item in items}
+            expected_paths = [path.join(sub_dir, name) for sub_dir in ['copies', 'hard_links', 'links', 'original']
+                              for name in log_names]
+            self.assertEqual(sorted(items_by_path), expected_paths)
+            for expected_path in expected_paths:
+                item = items_by_path[expected_path]
+                original_item = items_by_path[path.join('original', path.basename(expected_path))]
+                self.assertEqual(item.config, path.dirname(item.path))
+                self.assertIs(item.summary_data, original_item.summary_data)
+                self.assertEqual(item.temporal_data, original_item.temporal_data)
+
+            parallel_items = self._factory.create_item_list_from_directory(path.join(directory, 'links'),
+                                                                           parallel=True, max_workers=2)
+            self.assertEqual(len(parallel_items), len(log_names))
+
+            # files differing only between the blocks of the fingerprint are no duplicates
+            duplicates = DuplicateFileIndex(block_size=4)
+            for (name, contents) in [('a', b'head middle tail'), ('b', b'head MIDDLE tail'), ('c', b'head middle tail')]:
+                with open(path.join(directory, name), 'wb') as file:
+                    file.write(contents)
+            self.assertIsNone(duplicates.get_original_path(path.join(directory, 'a')))
+            self.assertIsNone(duplicates.get_original_path(path.join(directory, 'b')))
+            self.assertEqual(duplicates.get_original_path(path.join(directory, 'c')), path.join(directory, 'a'))
+
+    def test_watching_of_directories(self):
+        hm_log_dir = path.join(TEST_DIR, 'test_logs', 'examplesForDifferentVersions', 'HM')
+        (first_log_name, second_log_name) = sorted(listdir(hm_log_dir))[:2]
+        with open(path.join(hm_log_dir, second_log_name), 'rb') as log_file:
+            log_data = log_file.read()
+
+        with TemporaryDirectory() as log_dir:
+            shutil.copy(path.join(hm_log_dir, first_log_name), log_dir)
+            watcher = DirectoryWatcher(self._factory)
+            watcher.add_directory(log_dir)
+            (first_item,) = self._factory.create_item_list_from_directory(log_dir)
+            watcher.add_items([first_item])
+            self.assertEqual(watcher.directories, [log_dir])
+            self.assertEqual(watcher.poll(), ([], []))
+
+            # a job starts in a new sub directory, and writes its log
+            running_log_path = path.join(log_dir, 'job', second_log_name)
+            makedirs(path.dirname(running_log_path))
+            offset = log_data.index(b'\n', log_data.index(b'\nPOC') + 1) + 1
+            with open(running_log_path, 'wb') as log_file:
+                log_file.write(log_data[:offset])
+            (removed_items, (running_item,)) = watcher.poll()
+            self.assertEqual(removed_items, [])
+            self.assertTrue(running_item.is_running)
+            with open(running_log_path, 'ab') as log_file:
+                log_file.write(log_data[offset:])
+            self.assertEqual(watcher.poll(), ([], [running_item]))
+            self.assertFalse(running_item.is_running)
+
+            # changed files are parsed again, removed files are dropped
+            with open(first_item.path, 'ab') as log_file:
+                log_file.write(b'\n')
+            (removed_items, (changed_item,)) = watcher.poll()
+            self.assertEqual(removed_items, [first_item])
+            self.assertEqual(changed_item.path, first_item.path)
+            shutil.rmtree(path.dirname(running_log_path))
+            self.assertEqual(watcher.poll(), ([running_item], []))
+
+            watcher.remove_directory(log_dir)
+            self.assertEqual(watcher.directories, [])
+
+    def test_parallel_parsing_of_directory(self):
+        for log_dir in self.tested_log_dirs:
+            with self.subTest(log_dir=log_dir):
+                sequential_items = self._factory.create_item_list_from_directory(log_dir)
+                parallel_items = self._factory.create_item_list_from_directory(log_dir, parallel=True,
+                                                                               max_workers=2)
+
+                # the items are returned in the same order with the same parsed data
+                self.assertEqual([item.path for item in sequential_items], [item.path for item in parallel_items])
+                for sequential_item, parallel_item in zip(sequential_items, parallel_items):
+                    self.assertIs(type(sequential_item), type(parallel_item))
+                    self.assertEqual(sequential_item.sequence, parallel_item.sequence)
+                    self.assertEqual(sequential_item.config, parallel_item.config)
+                    self.assertEqual(sequential_item.temporal_data, parallel_item.temporal_data)
+
+    def test_file_is_read_once_per_parse(self):
+        for log_path in self.log_paths:
+            with self.subTest(log_path=log_path):
+                with mock.patch('builtins.open', side_effect=open) as mocked_open:
+                    self._factory.create_item_from_file(log_path)
+                # the whole text is read at most once, besides the windows read for sniffing the
+                # file. Encoder logs are parsed summary only, and do not read the whole text at all
+                opened_paths = [path.abspath(call[0][0]) for call in mocked_open.call_args_list if call[0][1] == 'r']
+                self.assertLessEqual(opened_paths.count(path.abspath(log_path)), 1)
+
+    def test_sniffing_reads_only_windows_of_file(self):
+        for log_path in self.log_paths:
+            with self.subTest(log_path=log_path):
+                cls_list = []
+                with mock.patch('rdplot.SimulationDataItem.FileContentProvider.read_text') as mocked_read_text:
+                    for cls in self._factory._classes:
+                        if issubclass(cls, EncoderLogs.AbstractEncLog) and cls.can_parse_file(log_path):
+                            cls_list.append(cls)
+                mocked_read_text.assert_not_called()
+                if log_path.endswith('enc.log'):
+                    self.assertTrue(cls_list)
+
+    def test_temporal_series(self):
+        series = TemporalSeries([2, 0, 1], ['3.5', '1', '2.25'])
+        self.assertEqual(series, [(2, 3.5), (0, 1.0), (1, 2.25)])
+        (xs, ys) = series.get_sorted_arrays()
+        self.assertEqual(list(xs), [0.0, 1.0, 2.0])
+        self.assertEqual(list(ys), [1.0, 2.25, 3.5])
+
+        # series of items with equal identifiers are joined
+        series.extend([(3, '4')])
+        self.assertEqual(series[-1], (3, 4.0))
+        self.assertEqual(len(series), 4)
+        with self.assertRaises(ValueError):
+            TemporalSeries([0, 1], [1.0])
+
+    def test_scan_file(self):
+        pattern = re.compile(rb'^POC[^\n]*', re.M)
+        for log_path in self.log_paths:
+            if not log_path.endswith('enc.log'):
+                continue
+            with self.subTest(log=log_path):
+                with open(log_path) as log_file:
+                    poc_lines = [line for line in log_file.read().splitlines() if line.startswith('POC')]
+
+                # the scan of the memory mapped file finds the same lines,
+                # also if the scanned pages are released during the scan
+                self.assertEqual(list(FileContentProvider().scan(log_path, pattern)), poc_lines)
+                with mock.patch('rdplot.SimulationDataItem.SCAN_RELEASE_SIZE', 1):
+                    self.assertEqual(list(FileContentProvider().scan(log_path, pattern)), poc_lines)
+
+                # groups are decoded, ranges are respected
+                poc_pattern = re.compile(rb'^POC\s+(\d+)', re.M)
+                self.assertEqual(list(FileContentProvider().scan(log_path, poc_pattern)),
+                                 [(line.split()[1],) for line in poc_lines])
+                self.assertEqual(list(FileContentProvider().scan(log_path, poc_pattern, 0, 0)), [])
+
+        with TemporaryDirectory() as directory:
+            empty_path = path.join(directory, 'empty_enc.log')
+            open(empty_path, 'w').close()
+            self.assertEqual(list(FileContentProvider().scan(empty_path, pattern)), [])
+
+    def test_dispatch_of_files_to_classes(self):
+        for log_dir in self.tested_log_dirs:
+            with self.subTest(log_dir=log_dir):
+                # encoder logs are only dispatched to classes declaring their suffix,
+                # thus, the xml of dat logs is not parsed for them
+                with mock.patch('rdplot.SimulationDataItemClasses.DatLogs.parse_dat_log',
+                                side_effect=DatLogs.parse_dat_log) as mocked_parse:
+                    items = self._factory.create_item_list_from_directory(log_dir)
+                for item in items:
+                    self.assertEqual(type(item), self._classify_by_parse_order(item.path))
+                if not any(log_path.endswith('.xml') for log_path in listdir(log_dir)):
+                    mocked_parse.assert_not_called()
+
+        # the class of the sibling files is tried first, but not before classes with
+        # a higher parse order
+        factory = SimulationDataItemFactory(self._factory._classes)
+        for log_path in self.log_paths:
+            factory._directory_classes[path.dirname(log_path)] = EncoderLogs.EncLogHM
+            with self.subTest(log_path=log_path):
+                self.assertEqual([type(item) for item in factory.create_item_from_file(log_path)],
+                                 [self._classify_by_parse_order(log_path)])
+
+    def _classify_by_parse_order(self, log_path):
+        for cls in reversed(sorted(self._factory._classes, key=lambda parser_class: parser_class.parse_order)):
+            if cls.can_parse_file(log_path):
+                return cls
+
+    def test_parser_registry(self):
+        # the registry holds the classes of the modules imported by other code, and
+        # the modules are not imported again by further factories
+        registry_factory = SimulationDataItemFactory.from_registry()
+        self.assertEqual(registry_factory._classes, self._factory._classes)
+        self.assertIn(EncoderLogs.EncLogHM, registry_factory._classes)
+        with mock.patch('importlib.import_module') as import_module:
+            SimulationDataItemFactory.from_registry()
+            SimulationDataItemFactory.from_path(SIMULATION_DATA_ITEM_CLASSES_PATH)
+            import_module.assert_not_called()
+
+        # classes provided by other packages by entry points
+        class EncLogPlugin(EncoderLogs.EncLogHM):
+            pass
+        entry_point = mock.Mock(load=mock.Mock(return_value=EncLogPlugin))
+        broken_entry_point = mock.Mock(load=mock.Mock(side_effect=ImportError))
+        entry_points = mock.Mock(select=mock.Mock(return_value=[entry_point, broken_entry_point]))
+        with mock.patch('rdplot.SimulationDataItem._registered_classes', None), \
+                mock.patch('importlib.metadata.entry_points', return_value=entry_points):
+            plugin_factory = SimulationDataItemFactory.from_registry()
+        self.assertEqual(plugin_factory._classes, self._factory._classes | {EncLogPlugin})
+        self.assertNotIn(EncLogPlugin, SimulationDataItemFactory.from_registry()._classes)
+
+    def test_walk_files(self):
+        with TemporaryDirectory() as directory:
+            for name in ['a_enc.log', 'b.txt', 'x/a_enc.log', 'x/y/a_enc.log', 'skip/a_enc.log']:
+                file_path = path.join(directory, *name.split('/'))
+                makedirs(path.dirname(file_path), exist_ok=True)
+                open(file_path, 'w').close()
+
+            def walk(**kwargs):
+                return [path.relpath(file_path, directory).replace(path.sep, '/')
+                        for file_path in walk_files(directory, **kwargs)]
+
+            self.assertEqual(walk(), ['a_enc.log', 'b.txt', 'skip/a_enc.log', 'x/a_enc.log', 'x/y/a_enc.log'])
+            self.assertEqual(walk(include=['*.log'], exclude=['skip']), ['a_enc.log', 'x/a_enc.log', 'x/y/a_enc.log'])
+            self.assertEqual(walk(max_depth=0), ['a_enc.log', 'b.txt'])
+            self.assertEqual(walk(max_depth=1, exclude=['*.txt']), ['a_enc.log', 'skip/a_enc.log', 'x/a_enc.log'])
+
+    def test_parsing_of_directory_tree(self):
+        log_root = path.join(TEST_DIR, 'test_logs')
+        # the logs are located two levels below the root
+        directory_items = []
+        for log_dir in sorted(listdir(log_root)):
+            for sub_dir in sorted(listdir(path.join(log_root, log_dir))):
+                if path.isdir(path.join(log_root, log_dir, sub_dir)):
+                    directory_items += self._factory.create_item_list_from_directory(
+                        path.join(log_root, log_dir, sub_dir))
+
+        # the items of the tree are yielded in several lists while the files are parsed
+        item_lists = list(self._factory.iter_item_lists_from_path(log_root, include=['*.log', '*.xml'], interval=0))
+        self.assertGreater(len(item_lists), 1)
+        self.assertEqual([item.path for item_list in item_lists for item in item_list],
+                         [item.path for item in directory_items])
+
+        item_lists = list(self._factory.iter_item_lists_from_path(log_root, exclude=['*.xml', 'exampleSimLogDirs']))
+        self.assertEqual(len(item_lists), 1)
+        self.assertTrue(all(isinstance(item, EncoderLogs.AbstractEncLog) for item in item_lists[0]))
+
+        with self.assertRaises(SimulationDataItemError):
+            list(self._factory.iter_item_lists_from_path(log_root, max_depth=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
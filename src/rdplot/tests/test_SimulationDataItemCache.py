@@ -0,0 +1,129 @@
+import shutil
+import unittest
+from unittest import mock
+from rdplot.SimulationDataItemClasses import EncoderLogs
+from rdplot.SimulationDataItem import SimulationDataItemFactory
+from rdplot.SimulationDataItemCache import SimulationDataItemCache
+from os import path, listdir
+from tempfile import TemporaryDirectory
+
+# path to test module (this file)
+TEST_DIR = path.dirname(path.abspath(__file__))
+
+# Path to the folder containing simulation data sub classes. The classes
+# are loaded by the simulation data item factory and used for parsing files
+SIMULATION_DATA_ITEM_CLASSES_PATH = path.normpath(path.join(TEST_DIR, '../SimulationDataItemClasses'))
+
+
+class TestSimulationDataItemCache(unittest.TestCase):
+    def setUp(self):
+        self._factory = SimulationDataItemFactory.from_path(
+            SIMULATION_DATA_ITEM_CLASSES_PATH
+        )
+        test_log_path = path.join(TEST_DIR, 'test_logs/examplesForDifferentVersions')
+        # list contents of directory, might include files
+        files_and_folders_here = listdir(test_log_path)
+        files_and_folders_here = [path.join(test_log_path, file_or_folder) for file_or_folder in files_and_folders_here]
+        # remove files from list, we only want the log directories
+        self.tested_log_dirs = [item for item in files_and_folders_here if path.isdir(item)]
+
+    def test_parse_cache(self):
+        with TemporaryDirectory() as cache_dir:
+            cache = SimulationDataItemCache(cache_dir)
+            factory = SimulationDataItemFactory(self._factory._classes, cache)
+            for log_dir in self.tested_log_dirs:
+                with self.subTest(log_dir=log_dir):
+                    parsed_items = factory.create_item_list_from_directory(log_dir)
+
+                    # the second parse is served from the cache, without reading the logs
+                    with mock.patch('rdplot.SimulationDataItem.FileContentProvider.read_text') as read_text:
+                        cached_items = factory.create_item_list_from_directory(log_dir)
+                        read_text.assert_not_called()
+
+                    self.assertEqual([item.path for item in parsed_items], [item.path for item in cached_items])
+                    for parsed_item, cached_item in zip(parsed_items, cached_items):
+                        self.assertIs(type(parsed_item), type(cached_item))
+                        self.assertEqual(parsed_item.config, cached_item.config)
+                        self.assertEqual(parsed_item.temporal_data, cached_item.temporal_data)
+
+            # entries of an outdated parser version are ignored
+            log_path = parsed_items[0].path
+            parser_class = type(parsed_items[0])
+            with mock.patch.object(parser_class, 'parser_version', parser_class.parser_version + 1):
+                self.assertIsNone(cache.get(log_path))
+
+    def test_parse_cache_eviction(self):
+        with TemporaryDirectory() as cache_dir:
+            factory = SimulationDataItemFactory(self._factory._classes, SimulationDataItemCache(cache_dir))
+            items = factory.create_item_list_from_directory(self.tested_log_dirs[0])
+
+            # a cache, which can only hold one entry, keeps the most recently used one
+            cache = SimulationDataItemCache(cache_dir, max_size=1)
+            cache.put(items[0].path, items[:1])
+            self.assertIsNotNone(cache.get(items[0].path))
+            self.assertEqual(len(listdir(cache.directory)), 1)
+
+    def test_parse_cache_size_of_replaced_entries(self):
+        with TemporaryDirectory() as cache_dir:
+            factory = SimulationDataItemFactory(self._factory._classes)
+            items = factory.create_item_list_from_directory(self.tested_log_dirs[0])
+
+            # writing the items of a file again replaces its entry, and does
+            # not add its size twice to the size of the cache
+            cache = SimulationDataItemCache(cache_dir)
+            cache.put(items[0].path, items)
+            cache.put(items[0].path, items)
+            cache.put(items[0].path, items[:1])
+            entry_sizes = [path.getsize(path.join(cache.directory, name)) for name in listdir(cache.directory)]
+            self.assertEqual(len(entry_sizes), 1)
+            self.assertEqual(cache._size, sum(entry_sizes))
+
+            # the size of a full cache does not drift, so nothing is evicted
+            cache = SimulationDataItemCache(cache_dir, max_size=sum(entry_sizes))
+            for _ in range(3):
+                cache.put(items[0].path, items[:1])
+            self.assertEqual(cache._size, sum(entry_sizes))
+
+    def test_rejected_files(self):
+        log_path = path.join(TEST_DIR, 'test_logs', 'examplesForDifferentVersions', 'HM',
+                             sorted(listdir(path.join(TEST_DIR, 'test_logs', 'examplesForDifferentVersions', 'HM')))[0])
+        with open(log_path, 'rb') as log_file:
+            log_data = log_file.read()
+
+        with TemporaryDirectory() as cache_dir, TemporaryDirectory() as log_dir:
+            shutil.copy(log_path, log_dir)
+            partial_log_path = path.join(log_dir, 'partial_enc.log')
+            with open(partial_log_path, 'wb') as log_file:
+                log_file.write(log_data[:len(log_data) // 2])
+            with open(path.join(log_dir, 'sequence.yuv'), 'wb') as yuv_file:
+                yuv_file.write(bytes(range(256)) * 64)
+
+            cache = SimulationDataItemCache(cache_dir)
+            factory = SimulationDataItemFactory(self._factory._classes, cache)
+            self.assertEqual(len(factory.create_item_list_from_directory(log_dir)), 1)
+
+            rejections = cache.get_rejections()
+            self.assertEqual([rejection.path for rejection in rejections],
+                             [partial_log_path, path.join(log_dir, 'sequence.yuv')])
+            self.assertTrue(rejections[0].reason.startswith('Not accepted by'))
+            self.assertGreaterEqual(rejections[0].duration, 0)
+
+            # rejected files are skipped by later parses, like files served from the cache
+            with mock.patch.object(factory, '_get_candidate_classes') as get_candidate_classes:
+                self.assertEqual(len(factory.create_item_list_from_directory(log_dir)), 1)
+                get_candidate_classes.assert_not_called()
+
+            # files are tried again, if they or the parsers change
+            with open(partial_log_path, 'wb') as log_file:
+                log_file.write(log_data + b'\n')
+            self.assertEqual(len(factory.create_item_list_from_directory(log_dir)), 2)
+            other_factory = SimulationDataItemFactory(self._factory._classes - {EncoderLogs.EncLogSHM}, cache)
+            self.assertIsNone(cache.get_rejection(path.join(log_dir, 'sequence.yuv'),
+                                                  other_factory._get_parser_versions()))
+
+            cache.clear_rejections()
+            self.assertEqual(cache.get_rejections(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import json
+import shutil
+import unittest
+from rdplot.SimulationDataItem import SimulationDataItemFactory
+from rdplot.SimulationDataItemStatistics import ParseStatistics, ParseRecord, DurationHistogram
+from os import path, listdir, makedirs
+from tempfile import TemporaryDirectory
+
+# path to test module (this file)
+TEST_DIR = path.dirname(path.abspath(__file__))
+
+# Path to the folder containing simulation data sub classes. The classes
+# are loaded by the simulation data item factory and used for parsing files
+SIMULATION_DATA_ITEM_CLASSES_PATH = path.normpath(path.join(TEST_DIR, '../SimulationDataItemClasses'))
+
+
+class TestSimulationDataItemStatistics(unittest.TestCase):
+    def setUp(self):
+        self._factory = SimulationDataItemFactory.from_path(
+            SIMULATION_DATA_ITEM_CLASSES_PATH
+        )
+
+    def test_parse_statistics(self):
+        hm_log_dir = path.join(TEST_DIR, 'test_logs', 'examplesForDifferentVersions', 'HM')
+        log_file_names = sorted(listdir(hm_log_dir))
+        with TemporaryDirectory() as log_dir:
+            for file_name in log_file_names:
+                shutil.copy(path.join(hm_log_dir, file_name), log_dir)
+            with open(path.join(log_dir, 'sequence.yuv'), 'wb') as yuv_file:
+                yuv_file.write(bytes(range(256)) * 64)
+            makedirs(path.join(log_dir, 'copies'))
+            shutil.copy(path.join(hm_log_dir, log_file_names[0]), path.join(log_dir, 'copies'))
+
+            factory = SimulationDataItemFactory(self._factory._classes)
+            items = [item for item_list in factory.iter_item_lists_from_directory(log_dir) for item in item_list]
+            self.assertEqual(len(items), 3)
+
+            records = {path.relpath(record.path, log_dir): record for record in factory.statistics.records}
+            self.assertEqual(len(records), 4)
+            record = records[log_file_names[0]]
+            self.assertEqual(record.parser, 'EncLogHM')
+            self.assertIsNone(record.reason)
+            self.assertGreater(record.bytes_read, 0)
+            self.assertIn('_parse_path', record.phases)
+            self.assertIn('_parse_log', record.phases)
+            # phases are timed exclusively, and do not add up to more than the parse
+            self.assertLessEqual(sum(record.phases.values()) + record.sniff_duration, record.duration)
+            self.assertIsNone(records['sequence.yuv'].parser)
+            self.assertIsNotNone(records['sequence.yuv'].reason)
+            # duplicates are recorded, but not parsed
+            self.assertEqual(records[path.join('copies', log_file_names[0])].duplicate_of, record.path)
+
+            summary = factory.statistics.get_summary()
+            self.assertEqual((summary['files'], summary['parsed'], summary['duplicates'], summary['rejected'],
+                              summary['failed']), (4, 2, 1, 1, 0))
+            self.assertEqual(summary['parsers']['EncLogHM']['files'], 2)
+            self.assertLessEqual(summary['parsers']['EncLogHM']['p50'], summary['parsers']['EncLogHM']['p95'])
+            self.assertGreater(summary['megabytes_per_second'], 0)
+
+            statistics_path = path.join(log_dir, 'statistics.json')
+            factory.statistics.dump(statistics_path)
+            with open(statistics_path) as statistics_file:
+                statistics = json.load(statistics_file)
+            self.assertEqual(len(statistics['files']), 4)
+            self.assertEqual(statistics['summary']['parsed'], 2)
+
+    def test_parse_statistics_of_long_sessions(self):
+        # the summary covers all records, of which only the last ones are kept
+        statistics = ParseStatistics(max_records=100)
+        durations = [0.001 * (index % 997 + 1) for index in range(20000)]
+        for (index, duration) in enumerate(durations):
+            record = ParseRecord('{}_enc.log'.format(index))
+            record.parser = 'EncLogHM' if index % 4 else None
+            record.bytes_read = 10
+            record.finish()
+            record.duration = duration
+            statistics.add(record)
+        statistics.add_model_update(3, 0.5)
+
+        self.assertEqual([record.path for record in statistics.records],
+                         ['{}_enc.log'.format(index) for index in range(19900, 20000)])
+        summary = statistics.get_summary()
+        self.assertEqual((summary['files'], summary['parsed'], summary['rejected']), (20000, 15000, 5000))
+        self.assertEqual(summary['bytes_read'], 200000)
+        self.assertAlmostEqual(summary['duration'], sum(durations))
+        self.assertEqual(summary['model_updates'], {'count': 1, 'items': 3, 'duration': 0.5})
+        self.assertEqual(len(statistics.to_dict()['files']), 100)
+
+        statistics.clear()
+        self.assertEqual(statistics.get_summary()['files'], 0)
+        self.assertEqual(statistics.get_summary()['parsers'], {})
+
+    def test_percentiles_of_durations(self):
+        histogram = DurationHistogram()
+        self.assertIsNone(histogram.get_percentile(50))
+        histogram.add(0.25)
+        self.assertEqual(histogram.get_percentile(95), 0.25)
+
+        # the estimates are at most one bucket above the exact percentiles
+        histogram = DurationHistogram()
+        durations = [0.0001 * index ** 2 for index in range(1, 1001)]
+        for duration in reversed(durations):
+            histogram.add(duration)
+        for percentile in [1, 50, 95, 100]:
+            exact = durations[int(len(durations) * percentile / 100) - 1]
+            estimate = histogram.get_percentile(percentile)
+            self.assertGreaterEqual(estimate, exact)
+            self.assertLessEqual(estimate, exact * 2 ** (1 / DurationHistogram.BUCKETS_PER_OCTAVE))
+        self.assertEqual(histogram.get_percentile(100), durations[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
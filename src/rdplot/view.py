@@ -26,6 +26,8 @@ from PyQt5.QtCore import QObject,QItemSelectionModel, QItemSelection, QModelInde
 from PyQt5.QtWidgets import QMessageBox, QMenu
 
 
+import time
+
 from collections import deque
 from os import path
 from os.path import join
@@ -33,50 +35,122 @@ from os.path import isdir
 import jsonpickle
 import json
 
-from rdplot.SimulationDataItem import SimulationDataItemFactory, SimulationDataItemError
+from rdplot.SimulationDataItem import (SimulationDataItemFactory, SimulationDataItemError, DirectoryWatcher,
+                                      strip_compression_suffix, is_archive, WATCH_INTERVAL)
+from rdplot.SimulationDataItemCache import SimulationDataItemCache
 from rdplot.model import AmbiguousSimDataItems
 
 
-# Path to the folder containing simulation data sub classes. The classes
-# are loaded by the simulation data item factory and used for parsing files
-here = path.abspath(path.dirname(__file__))
-SIMULATION_DATA_ITEM_CLASSES_PATH = here + path.sep + "SimulationDataItemClasses"
-
-
 class ParserWorkThread(QThread):
     newParsedData = pyqtSignal([list])
+    removedData   = pyqtSignal([list])
     allParsed     = pyqtSignal()
+    # Items of a path, which are emitted while the path is parsed, see
+    # :func: `SimDataItemTreeModel.stream`
+    streamedData  = pyqtSignal([list])
+    streamFinished = pyqtSignal()
 
     def __init__(self, pathlist=None):
         QThread.__init__(self)
 
-        self._factory = SimulationDataItemFactory.from_path(
-            SIMULATION_DATA_ITEM_CLASSES_PATH
-        )
+        # The registered parser classes are shared by all threads
+        self._factory = SimulationDataItemFactory.from_registry(cache=SimulationDataItemCache())
+        # Timings of the parsed files, see :class: `ParseStatistics`
+        self.statistics = self._factory.statistics
 
         if pathlist is None:
             pathlist = []
         self.pathlist = pathlist
 
+        # Directories, which are polled for new, changed and removed files
+        # after they have been parsed, see :func: `watchPath`
+        self.watcher = DirectoryWatcher(self._factory)
+        self._paths_to_watch = set()
+        self._is_stop_watching_requested = False
+
     def __del__(self):
+        self.requestInterruption()
         self.wait()
 
     def addPath(self,path):
         self.pathlist.append(path)
 
+    def watchPath(self, path):
+        """Parse the directory at *path*, and watch it afterwards. Items of
+        new and changed files are emitted by *newParsedData*, items of
+        removed and changed files by *removedData*."""
+        self._paths_to_watch.add(path)
+        self.pathlist.append(path)
+
+    def stopWatching(self):
+        if self.isRunning():
+            self._is_stop_watching_requested = True
+            return
+        for path in self.watcher.directories:
+            self.watcher.remove_directory(path)
+
     def run(self):
+        if not self._parse_paths():
+            return
+
+        # Poll the watched directories, until watching is stopped
+        while self.watcher.directories and not self.isInterruptionRequested():
+            self._wait_for_next_poll()
+            if self._is_stop_watching_requested:
+                for path in self.watcher.directories:
+                    self.watcher.remove_directory(path)
+                break
+            if self.pathlist:
+                self._parse_paths()
+                continue
+
+            (removed_items, new_items) = self.watcher.poll()
+            if removed_items:
+                self.removedData.emit(removed_items)
+            if new_items:
+                self.newParsedData.emit(new_items)
+        self._is_stop_watching_requested = False
+
+    def _parse_paths(self):
         for path in self.pathlist:
             try:
-                sim_data_items = self._factory.create_item_list_from_path(path)
+                # Directories are watched before they are parsed, so that
+                # files changing during the parse are parsed again
+                if path in self._paths_to_watch:
+                    self._paths_to_watch.discard(path)
+                    self.watcher.add_directory(path)
+                # Directories are parsed recursively, and their items are
+                # emitted while the files are parsed. The parameters of the
+                # items are chosen, after all files of the path are parsed
+                for sim_data_items in self._factory.iter_item_lists_from_path(path):
+                    self.watcher.add_items(sim_data_items)
+                    self.streamedData.emit(sim_data_items)
                 print(("Parsed '{}' ").format(path))
             except SimulationDataItemError:
+                # Watched directories may not contain finished simulations yet
+                if path in self.watcher.directories:
+                    continue
                 self.newParsedData.emit([])
                 self.pathlist.clear()
-                return
+                return False
+            except OSError:
+                self.newParsedData.emit([])
+                self.pathlist.clear()
+                return False
+            finally:
+                self.streamFinished.emit()
 
-            self.newParsedData.emit(sim_data_items)
         self.pathlist.clear()
         self.allParsed.emit()
+        return True
+
+    def _wait_for_next_poll(self):
+        # Sleep in short steps, to react to new paths and to the end of the
+        # application
+        end_time = time.monotonic() + WATCH_INTERVAL
+        while (time.monotonic() < end_time and not self.pathlist and not self._is_stop_watching_requested
+               and not self.isInterruptionRequested()):
+            self.msleep(100)
 
 
 class ParserWorkNoThread(QObject):
@@ -86,14 +160,20 @@ class ParserWorkNoThread(QObject):
     """
 
     newParsedData = pyqtSignal([list])
+    removedData   = pyqtSignal([list])
     allParsed     = pyqtSignal()
+    # Items of a path, which are emitted while the path is parsed, see
+    # :func: `SimDataItemTreeModel.stream`
+    streamedData  = pyqtSignal([list])
+    streamFinished = pyqtSignal()
 
     def __init__(self, pathlist=None):
         QObject.__init__(self)
 
-        self._factory = SimulationDataItemFactory.from_path(
-            SIMULATION_DATA_ITEM_CLASSES_PATH
-        )
+        # The registered parser classes are shared by all threads
+        self._factory = SimulationDataItemFactory.from_registry(cache=SimulationDataItemCache())
+        # Timings of the parsed files, see :class: `ParseStatistics`
+        self.statistics = self._factory.statistics
 
         if pathlist is None:
             pathlist = []
@@ -102,16 +182,25 @@ class ParserWorkNoThread(QObject):
     def addPath(self,path):
         self.pathlist.append(path)
 
+    def watchPath(self, path):
+        # Directories are not polled without a thread, thus, they are only parsed
+        self.pathlist.append(path)
+
+    def stopWatching(self):
+        pass
+
     def run(self):
         for path in self.pathlist:
             try:
-                sim_data_items = self._factory.create_item_list_from_path(path)
+                for sim_data_items in self._factory.iter_item_lists_from_path(path):
+                    self.streamedData.emit(sim_data_items)
             except SimulationDataItemError:
                 self.newParsedData.emit([])
                 self.pathlist.clear()
                 return
+            finally:
+                self.streamFinished.emit()
 
-            self.newParsedData.emit(sim_data_items)
         self.pathlist.clear()
         self.allParsed.emit()
 
@@ -126,6 +215,8 @@ class SimDataItemTreeView(QtWidgets.QTreeView):
         # helpful for debugging, when breakpoints don't work because of threading
         #self.parserThread = ParserWorkNoThread()
         self.parserThread.newParsedData.connect(self._update_model)
+        self.parserThread.streamedData.connect(self._stream_model)
+        self.parserThread.streamFinished.connect(self._finish_model_stream)
         self.parserThread.allParsed.connect(self._hide_parse_message)
         self.msg = QMessageBox(self) # use self as parent here
         self.msg.setIcon(QMessageBox.Information)
@@ -152,9 +243,14 @@ class SimDataItemTreeView(QtWidgets.QTreeView):
             if url.isLocalFile() and path.isfile(url.path()):
                 try:
                     # check what kind of file we have.
-                    # process .rd with load_rd_data, .xml and .log with the parsers
-                    file_ending = path.basename(url.path()).rsplit('.', maxsplit=1)[1]
-                    if file_ending == 'rd':
+                    # process .rd with load_rd_data, .xml, .log and archives with
+                    # the parsers, also if they are compressed
+                    file_ending = strip_compression_suffix(path.basename(url.path())).rsplit('.', maxsplit=1)[1]
+                    if is_archive(url.path()):
+                        self.msg.show()
+                        self.parserThread.addPath(url.path())
+                        self.parserThread.start()
+                    elif file_ending == 'rd':
                         self.load_rd_data(url.path())
                     elif file_ending == 'log' or file_ending == 'xml':
                         self.parserThread.addPath(url.path())
@@ -204,7 +300,10 @@ class SimDataItemTreeView(QtWidgets.QTreeView):
                 self,
                 "Open Sequence Encoder Log",
                 "/home/ient/Software/rd-plot-gui/examplLogs",
-                "All Logs (*.log *.xml *.rd);;Enocder Logs (*.log);;Dat Logs (*.xml);; RD Data (*.rd)")
+                "All Logs (*.log *.xml *.rd *.gz *.bz2 *.xz *.tar *.tgz *.tbz2 *.txz *.zip);;"
+                "Enocder Logs (*.log *.log.gz *.log.bz2 *.log.xz);;"
+                "Dat Logs (*.xml *.xml.gz *.xml.bz2 *.xml.xz);; RD Data (*.rd);;"
+                "Archives (*.tar *.tar.gz *.tgz *.tar.bz2 *.tbz2 *.tar.xz *.txz *.zip)")
 
             # magic: split returned list of files into lists of directories and file names
             directories, file_names = zip(*[file.rsplit('/', 1) for file in result[0]])
@@ -233,10 +332,13 @@ class SimDataItemTreeView(QtWidgets.QTreeView):
             return
         for directory, file_name in zip(directories, file_names):
             # check what kind of file we have.
-            # process .rd with load_rd_data, .xml and .log with the parsers
+            # process .rd with load_rd_data, .xml, .log and archives with the
+            # parsers, also if they are compressed
             path = join(directory, file_name)
-            file_ending = file_name.rsplit('.', maxsplit=1)[1]
-            if file_ending == 'rd':
+            file_ending = strip_compression_suffix(file_name).rsplit('.', maxsplit=1)[1]
+            if is_archive(path):
+                self.parserThread.addPath(path)
+            elif file_ending == 'rd':
                 self.load_rd_data(path)
             elif file_ending == 'log' or file_ending == 'xml':
                 self.parserThread.addPath(path)
@@ -249,14 +351,27 @@ class SimDataItemTreeView(QtWidgets.QTreeView):
         except TypeError:
             return
 
-        # TODO this uses the parse_directory method, thus, does not automatically
-        # parse 'log'.subfolder. Should this be the case?
-        #sim_data_items = list(SimulationDataItemFactory.parse_directory(path))
-        #self.model().update(sim_data_items)
+        # The directory is parsed recursively, see
+        # SimulationDataItemFactory.iter_item_lists_from_path
         self.msg.show()
         self.parserThread.addPath(path)
         self.parserThread.start()
 
+    # adds a directory to the treeview like add_folder, and keeps the
+    # treeview up to date with the new, changed and removed files of it
+    def watch_folder(self):
+        try:
+            path = self._get_folder()
+        except TypeError:
+            return
+
+        self.msg.show()
+        self.parserThread.watchPath(path)
+        self.parserThread.start()
+
+    def stop_watching(self):
+        self.parserThread.stopWatching()
+
     def add_folder_list(self):
         try:
             result = QtWidgets.QFileDialog.getOpenFileNames(
@@ -303,24 +418,46 @@ class SimDataItemTreeView(QtWidgets.QTreeView):
                         "you should consider writing a new parser.")
             msg.setWindowTitle("Warning")
             msg.show()
+        start_time = time.perf_counter()
         try:
             self.model().update(sim_data_items)
         except AmbiguousSimDataItems as inst:
-            msg = QMessageBox(self)  # use self as parent here
-            msg.setIcon(QMessageBox.Warning)
-            msg.setText("I have found ambigous simualtion data items in your selected directory.\n"
-                        "The reason for that is that you want to parse files from one directory "
-                        "with different names but the same QP and sequence name.\n"
-                        "From all the parsers I know at the moment I cannot decide what you want "
-                        "to achieve.\n"
-                        "Recommendation: Move the files you do not want plot to a different location.\n"
-                        "Note: The sequence tree view on the left is most probably incomplete now.\n\n"
-                        "%s" % inst)
-            msg.setWindowTitle("Warning")
-            msg.show()
+            self._show_ambiguity_warning(inst)
+        self.parserThread.statistics.add_model_update(len(sim_data_items), time.perf_counter() - start_time)
+
+        self.expandToDepth(0)
+
+    def _stream_model(self, sim_data_items):
+        # The items are added, while the path is still parsed, see
+        # :func: `SimDataItemTreeModel.stream`
+        start_time = time.perf_counter()
+        self.model().stream(sim_data_items)
+        self.parserThread.statistics.add_model_update(len(sim_data_items), time.perf_counter() - start_time)
 
         self.expandToDepth(0)
 
+    def _finish_model_stream(self):
+        try:
+            self.model().finish_stream()
+        except AmbiguousSimDataItems as inst:
+            self._show_ambiguity_warning(inst)
+
+        self.expandToDepth(0)
+
+    def _show_ambiguity_warning(self, inst):
+        msg = QMessageBox(self)  # use self as parent here
+        msg.setIcon(QMessageBox.Warning)
+        msg.setText("I have found ambigous simualtion data items in your selected directory.\n"
+                    "The reason for that is that you want to parse files from one directory "
+                    "with different names but the same QP and sequence name.\n"
+                    "From all the parsers I know at the moment I cannot decide what you want "
+                    "to achieve.\n"
+                    "Recommendation: Move the files you do not want plot to a different location.\n"
+                    "Note: The sequence tree view on the left is most probably incomplete now.\n\n"
+                    "%s" % inst)
+        msg.setWindowTitle("Warning")
+        msg.show()
+
 
 class PlottedFilesListView(QtWidgets.QListView):
     """Implements the view for plotted files"""